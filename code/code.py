@@ -1,259 +1,457 @@
+import time
+
+BOOT_NS = time.monotonic_ns()  # Start von code.py, für die Startzeit-Messung
+
+import gc
 import board
 import neopixel
-import time
-import math
-import digitalio
-import wifi
-
-# Konfiguration
-PIXEL_PIN = board.IO18    # Verwende GPIO18 für das Datensignal
-BUTTON_PIN = board.IO17   # Taster an Pin 17
-NUM_PIXELS = 6            # 6 NeoPixel LEDs
-BRIGHTNESS = 0.3          # Helligkeit (0.0 bis 1.0)
-SPEED = 0.05              # Zeit zwischen Animation-Frames (niedrigere Werte = schneller)
-SCAN_INTERVAL = 5         # Sekunden zwischen WLAN-Scans im WLAN-Modus
-
-# Farbdefinitionen (R, G, B)
-BLUE = (0, 50, 255)
-ORANGE = (255, 80, 0)
-WHITE = (255, 255, 255)
-OFF = (0, 0, 0)
-
-# Farbdefinitionen für verschiedene Signalstärken
-# Farben gehen von Rot (schwaches Signal) über Gelb zu Grün (starkes Signal)
-SIGNAL_COLORS = [
-    (255, 0, 0),      # Sehr schwach: Rot
-    (255, 60, 0),     # Schwach: Orange-Rot
-    (255, 120, 0),    # Mäßig: Orange
-    (255, 200, 0),    # Gut: Gelb-Orange
-    (150, 255, 0),    # Sehr gut: Gelb-Grün
-    (0, 255, 0)       # Ausgezeichnet: Grün
-]
+from techtie.buttons import ButtonEvents, SHORT, LONG, DOUBLE
+from techtie.colors import blend_colors, fade_value, get_color_for_position, wheel
+from techtie.config import (
+    BLE_NAME, BRIGHTNESS, BUTTON_PIN, DOUBLE_PRESS, GAMMA, LONG_PRESS, NUM_PIXELS, OFF, PIXEL_PIN,
+    RANK_MARGIN, SD_CS_PIN, SD_FLUSH_INTERVAL, SD_LOG_FILE, SD_SPI_PINS, SPEED, TRACE_FILE,
+)
+from techtie.effects import EffectGovernor, Rainbow, RunningLight, WifiSignals
+from techtie.framebank import FrameBanks
+from techtie.frameclock import FrameClock
+from techtie.power import PowerManager
+from techtie.profiler import Profiler
+from techtie.render import CrossFade, FrameEngine, GammaTable, PixelOutput
+from techtie.tasks import Scheduler
+from techtie.telemetry import Telemetry
+from techtie.ticks import ticks_ms
 
-# Signalstärke-Schwellwerte in dBm (typische WLAN-Werte)
-# -30 dBm ist ausgezeichnet, -90 dBm ist sehr schwach
-SIGNAL_THRESHOLDS = [-90, -80, -70, -60, -50, -40]
+# Konfiguration (Pins, Farben und Helligkeit stehen in lib/techtie/config.py)
+SCAN_INTERVAL = 5         # Längster Abstand zwischen WLAN-Scans in Sekunden (ruhige Umgebung)
+SCAN_INTERVAL_MIN = 1     # Kürzester Abstand, wenn sich die Signalstärken schnell ändern
+FULL_SCAN_EVERY = 6       # Jeder wievielte Scan alle Kanäle abdeckt (sonst nur belegte)
+MAX_NETWORKS = 32         # Plätze in der Netzwerk-Tabelle
+NETWORK_MAX_AGE = 20      # Sekunden, bis ein nicht mehr gesehenes Netzwerk verschwindet
+STATS_INTERVAL = 10       # Sekunden zwischen Frame-Statistiken auf der Konsole (0 = aus)
+LOG_LEVEL = 2             # Konsolenausgaben: 0 = nur Fehler, 1 = Warnungen, 2 = Infos, 3 = alles
+SERIAL_COMPACT = False    # True = Scan-Ergebnisse als maschinenlesbare @-Zeilen
+SCAN_LOG_INTERVAL = 2     # Höchstens alle so viele Sekunden Scan-Ergebnisse ausgeben
+ERROR_REPEAT = 60         # Dieselbe Fehlermeldung höchstens alle so viele Sekunden ausgeben
+FRAME_BANK_BUDGET = 32768 # Bytes RAM für vorberechnete Animationen (0 = immer live rechnen)
+FRAME_BANK_DIR = None     # Ordner auf dem Flash für größere Animationen, z.B. "/banks" (nur wenn beschreibbar)
+BRIGHTNESS_STEP = 0.1     # Helligkeitsschritt der Konsolenbefehle + und -
+FADE_FRAMES = 10          # Frames für die Überblendung beim Moduswechsel (0 = harter Schnitt)
+DITHER = False            # Zeitliches Dithering: feinere Stufen bei geringer Helligkeit (flackert bei langsamem SPEED)
+RENDER_BUDGET = 0.5       # Anteil der Frame-Zeit, den ein Effekt zum Rechnen verbrauchen darf
+POWER_SAVE = True         # Zwischen den Tasks in den Light Sleep (alarm), sonst time.sleep()
+IDLE_FRAME = 1.0          # Stehendes Bild (WLAN-Modus) spätestens nach so vielen Sekunden neu zeichnen
+IDLE_POLL = 0.5           # Abstand der Konsolen-Abfrage und -Ausgabe, solange das Bild steht
 
-# NeoPixel-Objekt initialisieren
+# NeoPixel-Objekt initialisieren; Helligkeit und Gamma stecken in der
+# GammaTable von output, der Treiber selbst rechnet nichts mehr um
 pixels = neopixel.NeoPixel(
-    PIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False
+    PIXEL_PIN, NUM_PIXELS, brightness=1.0, auto_write=False
 )
 
-# Taster initialisieren mit Pull-up (Taster gegen GND schalten)
-button = digitalio.DigitalInOut(BUTTON_PIN)
-button.direction = digitalio.Direction.INPUT
-button.pull = digitalio.Pull.UP  # Pull-up aktivieren, Taster verbindet mit GND
-
-# LED für Statusanzeige
-led = digitalio.DigitalInOut(board.LED)
-led.direction = digitalio.Direction.OUTPUT
-
-def wheel(pos):
-    """Erzeugt Regenbogenfarben über Position 0-255"""
-    if pos < 0 or pos > 255:
-        return (0, 0, 0)
-    if pos < 85:
-        return (255 - pos * 3, pos * 3, 0)
-    elif pos < 170:
-        pos -= 85
-        return (0, 255 - pos * 3, pos * 3)
+# Taster mit Pull-up (Taster gegen GND schalten); Flanken werden im
+# Hintergrund mit Zeitstempel erfasst und zu Gesten ausgewertet
+button = ButtonEvents(BUTTON_PIN, LONG_PRESS, DOUBLE_PRESS)
+
+def free_memory():
+    """Freier Heap in Bytes (None, wo gc.mem_free fehlt, z.B. am PC)"""
+    gc.collect()
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
+
+def report_boot():
+    """Meldet beim ersten Frame die Startzeit und den freien Heap"""
+    since_start = (time.monotonic_ns() - BOOT_NS) / 1_000_000
+    free = free_memory()
+    message = (f"Erster Frame nach {since_start:.0f} ms ab code.py, "
+               f"{time.monotonic() * 1000:.0f} ms ab Reset")
+    if free is not None:
+        message += f", freier Heap {free} Bytes"
+    telemetry.info(message)
+
+# Konsolenausgaben laufen gepuffert über die Telemetrie
+telemetry = Telemetry(LOG_LEVEL, SERIAL_COMPACT, idle=IDLE_POLL)
+
+def rare_error(key):
+    """log-Funktion für Fehler, die sich bei jedem Versuch wiederholen:
+    meldet sie höchstens alle ERROR_REPEAT Sekunden"""
+    def log(message):
+        if telemetry.every(key, ERROR_REPEAT, time.monotonic()):
+            telemetry.error(message)
+    return log
+
+# Rechenzeit und Heap-Verbrauch pro Abschnitt, eingeschaltet mit "p"
+INPUT, RENDER, SHOW, SCAN = range(4)
+profiler = Profiler(("input", "render", "show", "scan"))
+
+# Der WLAN-Teil wird erst beim ersten Wechsel in den WLAN-Modus geladen
+# (start_wifi), die meisten Sitzungen brauchen ihn gar nicht
+signals = None   # SignalClassifier: Signalstärke -> Farbe
+networks = None  # NetworkTable mit den gefundenen Netzwerken
+scanner = None   # WifiScanner-Task
+scan_task = None # scanner, wie er beim Scheduler angemeldet ist (mit Profiler)
+scan_log = None  # Scan-Verlauf auf der SD-Karte (nur mit SD_CS_PIN)
+trace = None     # Aufzeichnung für host/replay.py (nur mit TRACE_FILE)
+remote = None    # Fernsteuerung per Bluetooth (nur mit BLE_NAME und Bluetooth)
+sd_mounted = False
+
+# Helligkeit und Gamma als Tabelle: ohne DITHER steckt sie schon in den
+# Tabellen der FrameEngine, den Frame-Banks und den Signalfarben (baked),
+# die Frames kommen also fertig korrigiert heraus. Mit DITHER korrigiert
+# output jedes Frame selbst, auf 16 Bit genau (der Rest wandert ins nächste
+# Frame). Gesendet wird nur, was sich vom letzten Frame unterscheidet.
+gamma = GammaTable(BRIGHTNESS, GAMMA)
+baked = None if DITHER else gamma
+output = PixelOutput(pixels, NUM_PIXELS, gamma if DITHER else None, DITHER)
+
+# Überblendung beim Moduswechsel, beide Modi laufen dabei weiter
+fade = CrossFade(NUM_PIXELS, FADE_FRAMES)
+
+# Fade-Kurve, Farbmischung und Farbrad einmal vorberechnen
+engine = FrameEngine(NUM_PIXELS, fade_value, blend_colors, wheel)
+engine.set_gamma(baked)
+
+# Farbpaletten der Lauflicht-Modi: PALETTES[color_mode][pattern_state]
+PALETTES = [
+    [
+        engine.palette([get_color_for_position(i, state, mode) for i in range(NUM_PIXELS)])
+        for state in (0, 1)
+    ]
+    for mode in (0, 1)
+]
+
+def fade_renderer(palette):
+    """render(step) für eine Frame-Bank des Lauflichts mit dieser Palette"""
+    def render(step):
+        engine.step = step
+        engine.render_fade(palette)
+        return engine.buf
+    return render
+
+def rainbow_renderer(offset):
+    """Regenbogen-Frame für eine Frame-Bank (Index = Farbrad-Offset)"""
+    engine.render_rainbow(offset)
+    return engine.buf
+
+# Alle Modi sind periodisch: eine Runde des Lauflichts bzw. 256 Regenbogen-
+# Positionen einmal vorberechnen und danach nur noch abspielen. Was nicht
+# ins Budget passt, bleibt None und wird live gerendert.
+banks = FrameBanks(FRAME_BANK_BUDGET, FRAME_BANK_DIR)
+FADE_BANKS = [
+    [
+        banks.compile(f"fade{mode}{state}", fade_renderer(PALETTES[mode][state]),
+                      engine.period, NUM_PIXELS * 3)
+        for state in (0, 1)
+    ]
+    for mode in (0, 1)
+]
+RAINBOW_BANK = banks.compile("rainbow", rainbow_renderer, 256, NUM_PIXELS * 3)
+engine.step = 0
+
+# Animations-Zustand
+color_mode = 0     # 0 = Orange, 1 = Weiß, 2 = Regenbogen, 3 = WLAN-Signalstärke
+ticks = 0          # Frame-Zähler der Animation (inklusive übersprungener Frames)
+pattern_switch_time = 2  # Zeit in Sekunden bis zum Wechsel des Farbmusters
+
+def mount_card():
+    """Hängt die SD-Karte beim ersten Aufruf ein; True, wenn sie bereitsteht"""
+    global sd_mounted
+    if not sd_mounted and SD_CS_PIN is not None:
+        import busio
+        from techtie.scanlog import mount_sd
+        sd_mounted = mount_sd(busio.SPI(*SD_SPI_PINS), SD_CS_PIN)
+    return sd_mounted
+
+def start_wifi():
+    """Lädt den WLAN-Teil und meldet den Scan-Task beim Scheduler an
+
+    Gibt (NetworkTable, SignalClassifier) für den WLAN-Effekt zurück."""
+    global signals, networks, scanner, scan_task, scan_log
+    start = time.monotonic_ns()
+    before = free_memory()
+
+    import digitalio
+    import wifi
+    from techtie.colors import signal_classifier
+    from techtie.networks import NetworkTable
+    from techtie.wlan import ScanPlanner, WifiScanner
+
+    # LED für Statusanzeige, leuchtet während eines Scans
+    led = digitalio.DigitalInOut(board.LED)
+    led.direction = digitalio.Direction.OUTPUT
+
+    # WLAN-Scan läuft als eigener Task neben Animation und Taster und
+    # aktualisiert die Netzwerk-Tabelle an Ort und Stelle
+    signals = signal_classifier()
+    signals.set_gamma(baked)
+    networks = NetworkTable(MAX_NETWORKS, max_age=NETWORK_MAX_AGE)
+    planner = ScanPlanner(SCAN_INTERVAL_MIN, SCAN_INTERVAL, FULL_SCAN_EVERY)
+    radio = wifi.radio if trace is None else trace.radio(wifi.radio)
+    scanner = WifiScanner(radio, networks, planner, led, clock=clock,
+                          log=rare_error("scan"))
+    scan_task = profiler.wrap(SCAN, scan_step)
+    scheduler.add(scan_task)
+
+    # Scan-Verlauf auf der SD-Karte: gesammelt im RAM, geschrieben nur selten
+    # und nur zwischen zwei Frames
+    if mount_card():
+        from techtie.scanlog import ScanLog
+        scan_log = ScanLog(SD_LOG_FILE, flush_every=SD_FLUSH_INTERVAL, clock=clock,
+                           log=telemetry.error)
+        scanner.on_scan = scan_log.record
+        scheduler.add(scan_log, 1)
+    if remote is not None:
+        remote.table = networks
+
+    elapsed = (time.monotonic_ns() - start) / 1_000_000
+    after = free_memory()
+    if before is not None:
+        telemetry.info(f"WLAN geladen in {elapsed:.0f} ms, belegt {before - after} Bytes")
     else:
-        pos -= 170
-        return (pos * 3, 0, 255 - pos * 3)
-
-def blend_colors(color1, color2, blend_amount):
-    """Mischt zwei Farben basierend auf dem blend_amount (0.0 bis 1.0)"""
-    r = int(color1[0] * (1 - blend_amount) + color2[0] * blend_amount)
-    g = int(color1[1] * (1 - blend_amount) + color2[1] * blend_amount)
-    b = int(color1[2] * (1 - blend_amount) + color2[2] * blend_amount)
-    return (r, g, b)
-
-def fade_value(position, pixel_position, width=2.0):
-    """Erzeugt einen Fade-Wert basierend auf der Position"""
-    distance = abs(position - pixel_position)
-    # Kreisförmige Distanz berücksichtigen (für Übergang am Ende zurück zum Anfang)
-    if distance > NUM_PIXELS / 2:
-        distance = NUM_PIXELS - distance
-    
-    # Gaussche Glockenkurve für sanften Fade
-    value = math.exp(-(distance * distance) / width)
-    return max(0, min(1, value))  # Auf Bereich 0-1 begrenzen
-
-def get_color_for_position(index, pattern_state, color_mode, rainbow_offset=0):
-    """Gibt die Farbe für einen bestimmten Index abhängig vom Muster-Status zurück"""
-    # Regenbogen-Modus
-    if color_mode == 2:
-        # Position im Regenbogen basierend auf LED-Index und Offset
-        rainbow_pos = (index * 256 // NUM_PIXELS + rainbow_offset) % 256
-        return wheel(rainbow_pos)
-    
-    # Normale Farbmodi
-    second_color = WHITE if color_mode == 1 else ORANGE
-    
-    if pattern_state == 0:  # Muster 1: Blau, Zweite Farbe, Blau, ...
-        return BLUE if index % 2 == 0 else second_color
-    else:  # Muster 2: Zweite Farbe, Blau, Zweite Farbe, ...
-        return second_color if index % 2 == 0 else BLUE
-
-def map_signal_to_color(signal_strength):
-    """Wandelt Signalstärke (dBm) in eine Farbe um"""
-    for i, threshold in enumerate(SIGNAL_THRESHOLDS):
-        if signal_strength <= threshold:
-            return SIGNAL_COLORS[i]
-    return SIGNAL_COLORS[-1]  # Bestes Signal
-
-def scan_wifi():
-    """Scannt nach WLAN-Netzwerken und gibt sie sortiert nach Signalstärke zurück"""
-    print("Scanne nach WLAN-Netzwerken...")
-    networks = []
-    
-    try:
-        # LED einschalten während des Scans
-        led.value = True
-        
-        # Starte den Scan
-        for network in wifi.radio.start_scanning_networks():
-            # Sammle Netzwerkinformationen
-            networks.append({
-                'ssid': network.ssid,
-                'rssi': network.rssi,
-                'channel': network.channel
-            })
-        
-        # Stoppe den Scan
-        wifi.radio.stop_scanning_networks()
-        
-        # Sortiere nach Signalstärke (stärkstes Signal zuerst)
-        networks.sort(key=lambda x: x['rssi'], reverse=True)
-        
-        return networks
-    
-    except Exception as e:
-        print(f"Fehler beim Scannen: {e}")
-        return []
-    
-    finally:
-        # LED ausschalten
-        led.value = False
-
-def display_wifi_signals(networks):
-    """Zeigt die Signalstärke der ersten 6 Netzwerke an"""
-    # Alle LEDs löschen
-    pixels.fill((0, 0, 0))
-    
-    # Zeige maximal NUM_PIXELS Netzwerke an
-    for i in range(min(len(networks), NUM_PIXELS)):
-        signal_strength = networks[i]['rssi']
-        color = map_signal_to_color(signal_strength)
-        pixels[i] = color
-    
-    pixels.show()
-    
-    # Netzwerkinformationen ausgeben
-    print("\nGefundene WLAN-Netzwerke:")
-    for i, network in enumerate(networks[:NUM_PIXELS]):
-        print(f"{i+1}. {network['ssid']}: {network['rssi']} dBm (Kanal {network['channel']})")
+        telemetry.info(f"WLAN geladen in {elapsed:.0f} ms")
+    return networks, signals
 
-print("NeoPixel-Steuerung mit mehreren Modi gestartet")
-print("Drücke den Taster an Pin 17, um zwischen den Modi zu wechseln")
+def scan_step(current_time):
+    """Scan-Task: weckt danach die stehende Animation, damit sie die neuen
+    Werte zeigt
 
-try:
-    position = 0.0
-    pattern_state = 0  # 0 = Blau/Zweite Farbe, 1 = Zweite Farbe/Blau
-    color_mode = 0     # 0 = Orange, 1 = Weiß, 2 = Regenbogen, 3 = WLAN-Signalstärke
-    rainbow_offset = 0 # Offset für Regenbogenfarben
-    last_wifi_scan = 0 # Zeit des letzten WLAN-Scans
-    networks = []      # Gefundene WLAN-Netzwerke
+    Während einer Überblendung wird kein Kanal gescannt, sonst ruckelt sie."""
+    if fade.active:
+        return clock.remaining()
+    delay = scanner(current_time)
+    if clock.idle:
+        scheduler.wake(clock)
+    return delay
+
+def wake_frame():
+    """Nach dem Wecken durch den Taster sofort ein Frame (und damit die Geste)"""
+    scheduler.wake(clock)
+
+# Alle Modi als Effekte, der Index ist color_mode; der Governor misst ihre
+# Renderzeit und senkt bei Bedarf die Update-Rate
+EFFECTS = [
+    RunningLight("Blau/Orange", engine, PALETTES[0], FADE_BANKS[0],
+                 round(pattern_switch_time / SPEED)),
+    RunningLight("Blau/Weiß", engine, PALETTES[1], FADE_BANKS[1],
+                 round(pattern_switch_time / SPEED)),
+    Rainbow("Regenbogen", engine, RAINBOW_BANK),
+    WifiSignals(NUM_PIXELS, start_wifi, RANK_MARGIN),
+]
+governor = EffectGovernor(EFFECTS, NUM_PIXELS * 3, SPEED * RENDER_BUDGET)
+
+def set_mode(mode):
+    """Wechselt den Farbmodus und schaltet den WLAN-Scan passend an oder aus"""
+    global color_mode
+    if mode != color_mode:
+        fade.start(color_mode)
+        # Überträge des alten Modus nicht in den neuen mitnehmen
+        if output.dither is not None:
+            output.dither.reset()
+    color_mode = mode
+    power.select(color_mode)
+    # Beim ersten Wechsel in den WLAN-Modus wird hier der WLAN-Teil geladen
+    governor.select(color_mode)
+    if scanner is not None:
+        scanner.enabled = color_mode == 3
+    if color_mode == 3:
+        # Bei Wechsel zum WLAN-Modus sofort einen Scan starten,
+        # der Scan-Task arbeitet ihn im Hintergrund ab
+        scanner.request_scan()
+        scheduler.wake(scan_task)
+    telemetry.info(f"Modus gewechselt: {EFFECTS[color_mode].name}")
+
+def handle_input():
+    """Arbeitet die Taster-Gesten seit dem letzten Frame ab
+
+    Kurz: nächster Modus, lang: zurück zu Blau/Orange, doppelt: WLAN-Modus"""
+    button.update()
+    gesture = button.get()
+    while gesture is not None:
+        if gesture == SHORT:
+            # Wechsle zum nächsten Farbmodus (0->1->2->3->0)
+            set_mode((color_mode + 1) % 4)
+        elif gesture == LONG:
+            set_mode(0)
+        elif gesture == DOUBLE:
+            set_mode(3)
+        gesture = button.get()
+
+def render_task(current_time, frames):
+    """Berechnet und zeigt das nächste Animations-Frame
+
+    frames ist die Anzahl der seit dem letzten Frame vergangenen Perioden
+    (mehr als 1, wenn Frames übersprungen wurden). Gibt True zurück, wenn
+    das Bild bis zu neuen Daten stillsteht (dann pausiert die FrameClock)."""
+    global ticks
+
+    frame_start = ticks_ms() if trace is not None else 0
+    if not clock.frames:
+        report_boot()
+
+    # Taster-Gesten zuerst, damit ein Moduswechsel sofort sichtbar wird
+    start = profiler.start()
+    handle_input()
+    profiler.stop(INPUT, start)
     
-    # Entprellen-Variablen
-    button_state = False  # Aktueller Zustand
-    last_button_state = False  # Vorheriger Zustand
-    last_debounce_time = 0  # Zeit des letzten Zustandswechsels
-    debounce_delay = 0.05  # Entprellverzögerung in Sekunden
+    # Frame des aktuellen Modus; während einer Überblendung laufen alter
+    # und neuer Modus weiter
+    start = profiler.start()
+    if fade.active:
+        fade.old[:] = governor.render(fade.source, ticks)
+        frame = fade.blend(governor.render(color_mode, ticks), frames)
+    else:
+        frame = governor.render(color_mode, ticks)
+    profiler.stop(RENDER, start)
     
-    # Zeitpunkt des letzten Muster-Wechsels
-    last_pattern_switch = time.monotonic()
-    pattern_switch_time = 2  # Zeit in Sekunden bis zum Wechsel des Farbmusters
+    # Anzeigen (nur wenn sich das Frame geändert hat)
+    start = profiler.start()
+    output.show(frame)
+    profiler.stop(SHOW, start)
+    ticks += frames
     
-    while True:
-        # Taster-Entprellung
-        current_time = time.monotonic()
-        reading = not button.value  # Invertieren, da Pull-up (False wenn gedrückt)
-        
-        # Wenn sich der Zustand geändert hat, Zeit zurücksetzen
-        if reading != last_button_state:
-            last_debounce_time = current_time
-        
-        # Wenn genug Zeit vergangen ist, um Prellen zu vermeiden
-        if current_time - last_debounce_time > debounce_delay:
-            # Wenn sich der Zustand seit dem letzten Mal geändert hat
-            if reading != button_state:
-                button_state = reading
-                
-                # Wenn der Taster gedrückt wird (LOW wegen Pull-up)
-                if button_state:
-                    # Wechsle zum nächsten Farbmodus (0->1->2->3->0)
-                    color_mode = (color_mode + 1) % 4
-                    if color_mode == 0:
-                        mode_name = "Blau/Orange"
-                    elif color_mode == 1:
-                        mode_name = "Blau/Weiß"
-                    elif color_mode == 2:
-                        mode_name = "Regenbogen"
-                    else:  # color_mode == 3
-                        mode_name = "WLAN-Signalstärke"
-                        # Bei Wechsel zum WLAN-Modus sofort einen Scan starten
-                        networks = scan_wifi()
-                        last_wifi_scan = current_time
-                    print(f"Modus gewechselt: {mode_name}")
-        
-        # Aktualisiere den vorherigen Zustand
-        last_button_state = reading
-        
-        # WLAN-Modus
-        if color_mode == 3:
-            # Prüfe, ob ein neuer WLAN-Scan durchgeführt werden soll
-            if current_time - last_wifi_scan > SCAN_INTERVAL:
-                networks = scan_wifi()
-                last_wifi_scan = current_time
-            
-            # Zeige die WLAN-Signalstärken an
-            display_wifi_signals(networks)
-        
-        # Lauflicht-Modi (0, 1, 2)
+    if trace is not None:
+        trace.frame(frame_start, frames, output.sent)
+    return EFFECTS[color_mode].static and not fade.active and not button.busy
+
+def scan_report_task(current_time):
+    """Gibt im WLAN-Modus die Scan-Ergebnisse aus (nur bei Änderungen)
+
+    Läuft neben der Animation, damit render_task keine Texte bauen muss."""
+    if color_mode == 3:
+        telemetry.scan(networks, NUM_PIXELS, current_time)
+
+def stats_task(current_time):
+    """Gibt regelmäßig die Frame-Statistik auf der Konsole aus"""
+    clock.report(telemetry.info)
+    output.report(telemetry.info)
+    banks.report(telemetry.info)
+    governor.report(telemetry.info)
+    if scanner is not None and scanner.enabled:
+        scanner.report(telemetry.info)
+    if scan_log is not None:
+        scan_log.report(telemetry.info)
+    if trace is not None:
+        trace.report(telemetry.info)
+    if remote is not None:
+        remote.report(telemetry.info)
+    power.report([effect.name for effect in EFFECTS], telemetry.info)
+
+def set_brightness(brightness):
+    """Neue Helligkeit (0.0 bis 1.0); ist die Tabelle eingebacken, werden
+    dafür die Frame-Banks neu berechnet (das Bild steht so lange)"""
+    if baked is None:
+        output.set_brightness(brightness)
+    else:
+        gamma.set_brightness(brightness)
+        engine.set_gamma(baked)
+        if signals is not None:
+            signals.set_gamma(baked)
+        banks.recompile()
+    scheduler.wake(clock)
+    telemetry.info(f"Helligkeit: {gamma.brightness:.1f}")
+
+def remote_command(command, value):
+    """Befehl der Bluetooth-Fernsteuerung; gibt True zurück, wenn er gültig war
+
+    M = Modus (0-3), B = Helligkeit in Prozent, T = Ziel-SSID (None = alle)"""
+    if command == "M":
+        if not 0 <= value < len(EFFECTS):
+            return False
+        set_mode(value)
+    elif command == "B":
+        if not 0 <= value <= 100:
+            return False
+        set_brightness(value / 100)
+    elif command == "T":
+        EFFECTS[3].target = value
+        remote.target = value
+        telemetry.info(f"Ziel-SSID: {value if value is not None else 'alle'}")
+    else:
+        return False
+    return True
+
+def command_task(current_time):
+    """Befehle von der seriellen Konsole (ein Zeichen):
+    s = alle Netzwerke ausgeben, f = Statistik, c = Kompaktformat an/aus,
+    o = nächster Ort im Scan-Verlauf, + / - = Helligkeit,
+    p = Profiler an bzw. Bericht und aus, 0-3 = Log-Level
+
+    Steht das Bild still, wird seltener nachgesehen, damit das Board länger
+    schlafen kann."""
+    command = telemetry.read_command()
+    if not command:
+        return IDLE_POLL if clock.idle else None
+    if command == "s" and networks is not None:
+        telemetry.scan(networks, networks.count, current_time, force=True)
+    elif command == "f":
+        stats_task(current_time)
+    elif command == "c":
+        telemetry.compact = not telemetry.compact
+    elif command == "o" and scan_log is not None:
+        telemetry.info(f"Scan-Verlauf: Ort {scan_log.next_place()}")
+    elif command == "p":
+        if profiler.enabled:
+            profiler.report(telemetry.info)
+            profiler.enabled = False
         else:
-            # Wechsle das Muster periodisch (nur für Nicht-Regenbogen-Modi)
-            if color_mode < 2 and current_time - last_pattern_switch > pattern_switch_time:
-                pattern_state = 1 - pattern_state  # Wechsle zwischen 0 und 1
-                last_pattern_switch = current_time
-            
-            # Aktualisiere Rainbow-Offset für Animation
-            if color_mode == 2:
-                rainbow_offset = (rainbow_offset + 5) % 256
-            
-            # Alle Pixel aktualisieren
-            for i in range(NUM_PIXELS):
-                if color_mode == 2:
-                    # Im Regenbogen-Modus: Direkte Farbzuweisung ohne Fade
-                    pixels[i] = get_color_for_position(i, pattern_state, color_mode, rainbow_offset)
-                else:
-                    # In den anderen Modi: Fade-Effekt anwenden
-                    intensity = fade_value(position, i)
-                    base_color = get_color_for_position(i, pattern_state, color_mode)
-                    pixels[i] = blend_colors(OFF, base_color, intensity)
-            
-            # Anzeigen
-            pixels.show()
-            
-            # Position weiterbewegen (mit Wrap-Around) - nur für Nicht-Regenbogen-Modi
-            if color_mode < 2:
-                position = (position + 0.1) % NUM_PIXELS
-        
-        # Kurze Pause
-        time.sleep(SPEED)
+            profiler.reset()
+            profiler.enabled = True
+            telemetry.info("Profiler an, Bericht mit p")
+    elif command in "+-":
+        step = BRIGHTNESS_STEP if command == "+" else -BRIGHTNESS_STEP
+        set_brightness(gamma.brightness + step)
+    elif command in "0123":
+        telemetry.level = int(command)
+
+# Animation und WLAN-Scan laufen kooperativ nebeneinander
+# Die Animation läuft auf festen Frame-Deadlines im Abstand von SPEED und
+# holt dabei jedes Mal die Taster-Gesten ab
+clock = FrameClock(render_task, SPEED, IDLE_FRAME)
+scheduler = Scheduler()
+
+# Zwischen den Tasks schlafen: Light Sleep bis zum nächsten Termin, bei
+# längeren Pausen weckt auch der Taster
+power = PowerManager(button, BUTTON_PIN, len(EFFECTS))
+power.enabled = power.enabled and POWER_SAVE
+power.on_wake = wake_frame
+scheduler.sleep = power.sleep
+scheduler.add(clock)
+scheduler.add(telemetry, 0.02)
+scheduler.add(command_task, 0.1)
+scheduler.add(scan_report_task, SCAN_LOG_INTERVAL)
+
+# Aufzeichnung: Taster-Flanken, Kanal-Scans und jedes Frame, nachzuspielen
+# mit host/replay.py
+if TRACE_FILE is not None and (not TRACE_FILE.startswith("/sd/") or mount_card()):
+    from techtie.trace import TraceRecorder
+    trace = TraceRecorder(TRACE_FILE, clock=clock, log=telemetry.error)
+    button.on_edge = trace.edge
+    scheduler.add(trace, 1)
+# Fernsteuerung per Bluetooth: Befehle und Scan-Ergebnisse laufen als
+# eigener Task, gesendet wird nur zwischen zwei Frames
+if BLE_NAME is not None:
+    from techtie.remote import start_ble
+    remote = start_ble(BLE_NAME)
+    if remote is not None:
+        remote.clock = clock
+        remote.on_command = remote_command
+        scheduler.add(remote, 0.05)
+if STATS_INTERVAL:
+    scheduler.add(stats_task, STATS_INTERVAL, STATS_INTERVAL)
+
+telemetry.info("NeoPixel-Steuerung mit mehreren Modi gestartet")
+telemetry.info("Drücke den Taster an Pin 17, um zwischen den Modi zu wechseln")
+
+try:
+    scheduler.run()
             
 except KeyboardInterrupt:
     # Bei Tastatur-Unterbrechung alle LEDs ausschalten
+    if scanner is not None:
+        scanner.stop()
+    if scan_log is not None:
+        scan_log.flush()
+    if trace is not None:
+        trace.flush()
     pixels.fill(OFF)
     pixels.show()
+    telemetry.drain()
     print("Programm beendet")
@@ -1,157 +1,87 @@
-import board
 import neopixel
 import time
-import math
-import digitalio
-
-# Konfiguration
-PIXEL_PIN = board.IO18    # Verwende GPIO18 für das Datensignal
-BUTTON_PIN = board.IO17   # Taster an Pin 17
-NUM_PIXELS = 6            # 6 NeoPixel LEDs
-BRIGHTNESS = 0.3          # Helligkeit (0.0 bis 1.0)
-SPEED = 0.05              # Zeit zwischen Animation-Frames (niedrigere Werte = schneller)
+from techtie.buttons import ButtonEvents, SHORT
+from techtie.colors import blend_colors, fade_value, get_color_for_position, wheel
+from techtie.config import (
+    BRIGHTNESS, BUTTON_PIN, GAMMA, LONG_PRESS, NUM_PIXELS, OFF, PIXEL_PIN, SPEED,
+)
+from techtie.effects import EffectGovernor, Rainbow, RunningLight
+from techtie.render import FrameEngine, GammaTable, PixelOutput
+from techtie.ticks import ticks_add, ticks_diff, ticks_ms
 
-# Farbdefinitionen (R, G, B)
-BLUE = (0, 50, 255)
-ORANGE = (255, 80, 0)
-WHITE = (255, 255, 255)
-OFF = (0, 0, 0)
+# Konfiguration: Pins, Farben und Helligkeit stehen in lib/techtie/config.py
 
-# NeoPixel-Objekt initialisieren
+# NeoPixel-Objekt initialisieren; Helligkeit und Gamma stecken als Tabelle
+# schon in den Farbtabellen der FrameEngine, der Treiber rechnet nichts um
 pixels = neopixel.NeoPixel(
-    PIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False
+    PIXEL_PIN, NUM_PIXELS, brightness=1.0, auto_write=False
 )
+output = PixelOutput(pixels, NUM_PIXELS)
 
-# Taster initialisieren mit Pull-up (Taster gegen GND schalten)
-button = digitalio.DigitalInOut(BUTTON_PIN)
-button.direction = digitalio.Direction.INPUT
-button.pull = digitalio.Pull.UP  # Pull-up aktivieren, Taster verbindet mit GND
+# Taster mit Pull-up (Taster gegen GND schalten); Flanken werden im
+# Hintergrund erfasst, ein kurzer Druck zählt sofort beim Loslassen
+button = ButtonEvents(BUTTON_PIN, LONG_PRESS, double_press=0)
 
-def wheel(pos):
-    """Erzeugt Regenbogenfarben über Position 0-255"""
-    if pos < 0 or pos > 255:
-        return (0, 0, 0)
-    if pos < 85:
-        return (255 - pos * 3, pos * 3, 0)
-    elif pos < 170:
-        pos -= 85
-        return (0, 255 - pos * 3, pos * 3)
-    else:
-        pos -= 170
-        return (pos * 3, 0, 255 - pos * 3)
+print("NeoPixel Lauflicht mit Taster für Farbwechsel gestartet")
+print("Drücke den Taster an Pin 17, um zwischen Blau/Orange, Blau/Weiß und Regenbogen zu wechseln")
 
-def blend_colors(color1, color2, blend_amount):
-    """Mischt zwei Farben basierend auf dem blend_amount (0.0 bis 1.0)"""
-    r = int(color1[0] * (1 - blend_amount) + color2[0] * blend_amount)
-    g = int(color1[1] * (1 - blend_amount) + color2[1] * blend_amount)
-    b = int(color1[2] * (1 - blend_amount) + color2[2] * blend_amount)
-    return (r, g, b)
+# Fade-Kurve, Farbmischung und Farbrad einmal vorberechnen
+engine = FrameEngine(NUM_PIXELS, fade_value, blend_colors, wheel)
+engine.set_gamma(GammaTable(BRIGHTNESS, GAMMA))
 
-def fade_value(position, pixel_position, width=2.0):
-    """Erzeugt einen Fade-Wert basierend auf der Position"""
-    distance = abs(position - pixel_position)
-    # Kreisförmige Distanz berücksichtigen (für Übergang am Ende zurück zum Anfang)
-    if distance > NUM_PIXELS / 2:
-        distance = NUM_PIXELS - distance
-    
-    # Gaussche Glockenkurve für sanften Fade
-    value = math.exp(-(distance * distance) / width)
-    return max(0, min(1, value))  # Auf Bereich 0-1 begrenzen
+# Farbpaletten der Lauflicht-Modi: PALETTES[color_mode][pattern_state]
+PALETTES = [
+    [
+        engine.palette([get_color_for_position(i, state, mode) for i in range(NUM_PIXELS)])
+        for state in (0, 1)
+    ]
+    for mode in (0, 1)
+]
 
-def get_color_for_position(index, pattern_state, color_mode, rainbow_offset=0):
-    """Gibt die Farbe für einen bestimmten Index abhängig vom Muster-Status zurück"""
-    # Regenbogen-Modus
-    if color_mode == 2:
-        # Position im Regenbogen basierend auf LED-Index und Offset
-        rainbow_pos = (index * 256 // NUM_PIXELS + rainbow_offset) % 256
-        return wheel(rainbow_pos)
-    
-    # Normale Farbmodi
-    second_color = WHITE if color_mode == 1 else ORANGE
-    
-    if pattern_state == 0:  # Muster 1: Blau, Zweite Farbe, Blau, ...
-        return BLUE if index % 2 == 0 else second_color
-    else:  # Muster 2: Zweite Farbe, Blau, Zweite Farbe, ...
-        return second_color if index % 2 == 0 else BLUE
-
-print("NeoPixel Lauflicht mit Taster für Farbwechsel gestartet")
-print("Drücke den Taster an Pin 17, um zwischen Blau/Orange, Blau/Weiß und Regenbogen zu wechseln")
+# Die Modi als Effekte, der Index ist color_mode; das Muster wechselt alle 2 s
+pattern_switch_frames = round(2 / SPEED)
+EFFECTS = [
+    RunningLight("Blau/Orange", engine, PALETTES[0], switch=pattern_switch_frames),
+    RunningLight("Blau/Weiß", engine, PALETTES[1], switch=pattern_switch_frames),
+    Rainbow("Regenbogen", engine),
+]
+governor = EffectGovernor(EFFECTS, NUM_PIXELS * 3, SPEED / 2)
 
 try:
-    position = 0.0
-    pattern_state = 0  # 0 = Blau/Zweite Farbe, 1 = Zweite Farbe/Blau
     color_mode = 0     # 0 = Orange, 1 = Weiß, 2 = Regenbogen
-    rainbow_offset = 0 # Offset für Regenbogenfarben
-    
-    # Entprellen-Variablen
-    button_state = False  # Aktueller Zustand
-    last_button_state = False  # Vorheriger Zustand
-    last_debounce_time = 0  # Zeit des letzten Zustandswechsels
-    debounce_delay = 0.05  # Entprellverzögerung in Sekunden
+    ticks = 0          # Frame-Zähler der Animation
     
-    # Zeitpunkt des letzten Muster-Wechsels
-    last_pattern_switch = time.monotonic()
-    pattern_switch_time = 2  # Zeit in Sekunden bis zum Wechsel des Farbmusters
+    # Feste Frame-Deadlines: die Rechenzeit eines Frames wird von der Pause abgezogen
+    # (in ms-Ticks, die anders als monotonic_ns() keinen Speicher anlegen)
+    frame_ms = round(SPEED * 1000)
+    next_frame = ticks_ms()
     
     while True:
-        # Taster-Entprellung
-        current_time = time.monotonic()
-        reading = not button.value  # Invertieren, da Pull-up (False wenn gedrückt)
-        
-        # Wenn sich der Zustand geändert hat, Zeit zurücksetzen
-        if reading != last_button_state:
-            last_debounce_time = current_time
-        
-        # Wenn genug Zeit vergangen ist, um Prellen zu vermeiden
-        if current_time - last_debounce_time > debounce_delay:
-            # Wenn sich der Zustand seit dem letzten Mal geändert hat
-            if reading != button_state:
-                button_state = reading
-                
-                # Wenn der Taster gedrückt wird (LOW wegen Pull-up)
-                if button_state:
-                    # Wechsle zum nächsten Farbmodus (0->1->2->0)
-                    color_mode = (color_mode + 1) % 3
-                    if color_mode == 0:
-                        mode_name = "Blau/Orange"
-                    elif color_mode == 1:
-                        mode_name = "Blau/Weiß"
-                    else:
-                        mode_name = "Regenbogen"
-                    print(f"Farbmodus gewechselt: {mode_name}")
-        
-        # Aktualisiere den vorherigen Zustand
-        last_button_state = reading
-        
-        # Wechsle das Muster periodisch (nur für Nicht-Regenbogen-Modi)
-        if color_mode < 2 and current_time - last_pattern_switch > pattern_switch_time:
-            pattern_state = 1 - pattern_state  # Wechsle zwischen 0 und 1
-            last_pattern_switch = current_time
-        
-        # Aktualisiere Rainbow-Offset für Animation
-        if color_mode == 2:
-            rainbow_offset = (rainbow_offset + 5) % 256
-        
-        # Alle Pixel aktualisieren
-        for i in range(NUM_PIXELS):
-            if color_mode == 2:
-                # Im Regenbogen-Modus: Direkte Farbzuweisung ohne Fade
-                pixels[i] = get_color_for_position(i, pattern_state, color_mode, rainbow_offset)
-            else:
-                # In den anderen Modi: Fade-Effekt anwenden
-                intensity = fade_value(position, i)
-                base_color = get_color_for_position(i, pattern_state, color_mode)
-                pixels[i] = blend_colors(OFF, base_color, intensity)
-        
-        # Anzeigen
-        pixels.show()
+        # Taster-Gesten seit dem letzten Frame abarbeiten:
+        # kurz = nächster Farbmodus (0->1->2->0), lang = zurück zu Blau/Orange
+        button.update()
+        gesture = button.get()
+        while gesture is not None:
+            color_mode = (color_mode + 1) % 3 if gesture == SHORT else 0
+            governor.select(color_mode)
+            print(f"Farbmodus gewechselt: {EFFECTS[color_mode].name}")
+            gesture = button.get()
         
-        # Position weiterbewegen (mit Wrap-Around) - nur für Nicht-Regenbogen-Modi
-        if color_mode < 2:
-            position = (position + 0.1) % NUM_PIXELS
+        # Frame des aktuellen Modus berechnen und anzeigen
+        output.show(governor.render(color_mode, ticks))
+        ticks += 1
         
-        # Kurze Pause
-        time.sleep(SPEED)
+        # Bis zur nächsten Frame-Deadline warten
+        next_frame = ticks_add(next_frame, frame_ms)
+        delay = ticks_diff(next_frame, ticks_ms())
+        if delay > 0:
+            time.sleep(delay / 1000)
+        elif -delay >= frame_ms:
+            # Zu spät: verpasste Frames überspringen wie FrameClock, damit
+            # die Animation unter Last nicht langsamer wird
+            missed = -delay // frame_ms
+            ticks += missed
+            next_frame = ticks_add(next_frame, missed * frame_ms)
             
 except KeyboardInterrupt:
     # Bei Tastatur-Unterbrechung alle LEDs ausschalten
@@ -0,0 +1 @@
+"""TechTie: gemeinsame Bausteine für die Firmware der LED-Fliege"""
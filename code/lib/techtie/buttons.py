@@ -0,0 +1,211 @@
+from array import array
+
+try:
+    import keypad
+except ImportError:
+    keypad = None
+
+from techtie.ticks import MASK as _TICKS_MASK  # keypad-Zeitstempel laufen nach 2**29 ms über
+from techtie.ticks import ticks_ms as _now_ms
+
+# Gesten in der Warteschlange
+SHORT = 1   # Kurz gedrückt und losgelassen
+LONG = 2    # Gehalten, bis long_press erreicht war
+DOUBLE = 3  # Zweimal kurz hintereinander
+
+
+def _since(now, then):
+    return (now - then) & _TICKS_MASK
+
+
+class ButtonEvents:
+    """Taster über Flanken mit Zeitstempel statt Abfrage in der Hauptschleife
+
+    Mit ``keypad`` tastet CircuitPython den Pin im Hintergrund ab, entprellt
+    ihn und merkt sich jede Flanke mit ihrem Zeitstempel - auch wenn die
+    Hauptschleife gerade rendert oder scannt. ``update()`` arbeitet die
+    Flanken ab und erkennt daraus kurzen, langen und doppelten Druck; die
+    Gesten landen in einer kleinen Warteschlange, die ``get()`` leert.
+
+    Ohne ``keypad`` wird der Pin bei jedem ``update()`` über ``digitalio``
+    gelesen.
+
+    Mit ``double_press=0`` wird ein kurzer Druck sofort beim Loslassen
+    gemeldet, sonst erst, wenn kein zweiter Druck mehr folgt.
+
+    ``on_edge(pressed, age_ms)`` wird für jede Flanke aufgerufen; ``age_ms``
+    sagt, wie viele ms sie beim Abarbeiten schon zurückliegt (z.B. für
+    ``TraceRecorder.edge``).
+
+    ``suspend()`` gibt den Pin vorübergehend frei, z.B. für einen
+    ``alarm.pin.PinAlarm`` im Light Sleep; ``resume()`` übernimmt ihn wieder.
+    """
+
+    def __init__(self, pin, long_press=0.8, double_press=0.25, debounce=0.02, size=8):
+        self.long_ms = int(long_press * 1000)
+        self.double_ms = int(double_press * 1000)
+        self.debounce_ms = int(debounce * 1000)
+        self.time = 0                  # Zeitstempel (ms) der zuletzt geholten Geste
+        self.dropped = 0               # Gesten, die nicht mehr in die Schlange passten
+        self.on_edge = None            # Wird für jede Flanke aufgerufen
+        self._kinds = bytearray(size)
+        self._times = array("l", [0] * size)
+        self._head = 0
+        self._used = 0
+        self._pressed = False
+        self._press_ms = 0
+        self._release_ms = 0
+        self._long_sent = False
+        self._pending = False          # Kurzer Druck, der noch ein Doppelklick werden kann
+        self._second = False           # Aktueller Druck ist der zweite eines Doppelklicks
+        self._waking = False           # Durch den Taster geweckt, Flanke steht noch aus
+        self._wake_ms = 0
+        self._pin = pin
+        self._keys = None
+        self._io = None
+        self._edge_ms = 0
+        if keypad is not None:
+            self._event = keypad.Event()
+        self._open()
+
+    def _open(self):
+        if keypad is not None:
+            self._keys = keypad.Keys((self._pin,), value_when_pressed=False, pull=True,
+                                     interval=self.debounce_ms / 1000)
+        else:
+            import digitalio
+            self._io = digitalio.DigitalInOut(self._pin)
+            self._io.direction = digitalio.Direction.INPUT
+            self._io.pull = digitalio.Pull.UP
+
+    @property
+    def pressed(self):
+        """True, solange der Taster gehalten wird"""
+        return self._pressed
+
+    @property
+    def busy(self):
+        """True, solange eine Geste noch nicht entschieden ist (Taster gehalten
+        oder ein Doppelklick noch möglich) - dann muss update() weiterlaufen"""
+        return self._pressed or self._pending or self._second or self._waking
+
+    @property
+    def pending(self):
+        """Anzahl Gesten, die noch nicht abgeholt wurden"""
+        return self._used
+
+    def update(self):
+        """Übernimmt neue Flanken und meldet fällige Gesten; einmal pro Frame aufrufen"""
+        if self._keys is not None:
+            event = self._event
+            while self._keys.events.get_into(event):
+                self._edge(event.pressed, event.timestamp)
+        elif self._io is not None:
+            level = not self._io.value  # Pull-up: gedrückt = LOW
+            if level != self._pressed:
+                now = _now_ms()
+                if _since(now, self._edge_ms) >= self.debounce_ms:
+                    self._edge_ms = now
+                    self._edge(level, now)
+
+        now = _now_ms()
+        if self._waking and (self._pressed or _since(now, self._wake_ms) > 4 * self.debounce_ms):
+            self._waking = False
+        if self._pressed:
+            if not self._long_sent and _since(now, self._press_ms) >= self.long_ms:
+                self._long_sent = True
+                if self._second:
+                    # Zweiter Druck wurde lang: der erste war ein kurzer
+                    self._second = False
+                    self._push(SHORT, self._release_ms)
+                self._push(LONG, now)
+        elif self._pending and _since(now, self._release_ms) > self.double_ms:
+            self._pending = False
+            self._push(SHORT, self._release_ms)
+
+    def _edge(self, pressed, stamp):
+        if pressed == self._pressed:
+            return
+        self._pressed = pressed
+        if self.on_edge is not None:
+            self.on_edge(pressed, _since(_now_ms(), stamp))
+        if pressed:
+            self._press_ms = stamp
+            self._long_sent = False
+            if self._pending:
+                self._pending = False
+                if _since(stamp, self._release_ms) <= self.double_ms:
+                    self._second = True
+                else:
+                    self._push(SHORT, self._release_ms)
+            return
+
+        if self._long_sent:
+            return
+        if _since(stamp, self._press_ms) >= self.long_ms:
+            # Flanken kamen verspätet an, der Zeitstempel zählt
+            if self._second:
+                self._second = False
+                self._push(SHORT, self._release_ms)
+            self._push(LONG, stamp)
+            return
+        if self._second:
+            self._second = False
+            self._push(DOUBLE, stamp)
+        elif self.double_ms:
+            self._pending = True
+            self._release_ms = stamp
+        else:
+            self._push(SHORT, stamp)
+
+    def _push(self, kind, stamp):
+        size = len(self._kinds)
+        if self._used == size:
+            self.dropped += 1
+            return
+        i = (self._head + self._used) % size
+        self._kinds[i] = kind
+        self._times[i] = stamp
+        self._used += 1
+
+    def get(self):
+        """Nächste Geste (SHORT, LONG, DOUBLE) oder None; Zeitstempel in ``time``"""
+        if not self._used:
+            return None
+        i = self._head
+        self._head = (i + 1) % len(self._kinds)
+        self._used -= 1
+        self.time = self._times[i]
+        return self._kinds[i]
+
+    def clear(self):
+        """Verwirft alle Flanken und Gesten, die noch nicht abgeholt wurden"""
+        if self._keys is not None:
+            self._keys.events.clear()
+        self._used = 0
+        self._pending = False
+        self._second = False
+
+    def suspend(self):
+        """Gibt den Pin vorübergehend frei; bis resume() kommen keine Flanken an"""
+        self.update()
+        self.deinit()
+
+    def resume(self, pressed=False):
+        """Übernimmt den Pin nach suspend() wieder
+
+        ``pressed=True`` heißt, der Taster hat das Board geweckt: bis
+        ``keypad`` die Flanke liefert, gilt er als beschäftigt (``busy``)."""
+        self._open()
+        if pressed:
+            self._waking = True
+            self._wake_ms = _now_ms()
+
+    def deinit(self):
+        """Gibt den Pin wieder frei"""
+        if self._keys is not None:
+            self._keys.deinit()
+            self._keys = None
+        elif self._io is not None:
+            self._io.deinit()
+            self._io = None
@@ -0,0 +1,74 @@
+import math
+
+from techtie.config import (
+    BLUE, NUM_PIXELS, ORANGE, SIGNAL_COLORS, SIGNAL_GRADIENT, SIGNAL_THRESHOLDS, WHITE,
+)
+
+
+def wheel(pos):
+    """Erzeugt Regenbogenfarben über Position 0-255"""
+    if pos < 0 or pos > 255:
+        return (0, 0, 0)
+    if pos < 85:
+        return (255 - pos * 3, pos * 3, 0)
+    elif pos < 170:
+        pos -= 85
+        return (0, 255 - pos * 3, pos * 3)
+    else:
+        pos -= 170
+        return (pos * 3, 0, 255 - pos * 3)
+
+
+def blend_colors(color1, color2, blend_amount):
+    """Mischt zwei Farben basierend auf dem blend_amount (0.0 bis 1.0)"""
+    r = int(color1[0] * (1 - blend_amount) + color2[0] * blend_amount)
+    g = int(color1[1] * (1 - blend_amount) + color2[1] * blend_amount)
+    b = int(color1[2] * (1 - blend_amount) + color2[2] * blend_amount)
+    return (r, g, b)
+
+
+def fade_value(position, pixel_position, width=2.0, num_pixels=NUM_PIXELS):
+    """Erzeugt einen Fade-Wert basierend auf der Position"""
+    distance = abs(position - pixel_position)
+    # Kreisförmige Distanz berücksichtigen (für Übergang am Ende zurück zum Anfang)
+    if distance > num_pixels / 2:
+        distance = num_pixels - distance
+    
+    # Gaussche Glockenkurve für sanften Fade
+    value = math.exp(-(distance * distance) / width)
+    return max(0, min(1, value))  # Auf Bereich 0-1 begrenzen
+
+
+def get_color_for_position(index, pattern_state, color_mode, rainbow_offset=0,
+                           num_pixels=NUM_PIXELS):
+    """Gibt die Farbe für einen bestimmten Index abhängig vom Muster-Status zurück"""
+    # Regenbogen-Modus
+    if color_mode == 2:
+        # Position im Regenbogen basierend auf LED-Index und Offset
+        rainbow_pos = (index * 256 // num_pixels + rainbow_offset) % 256
+        return wheel(rainbow_pos)
+    
+    # Normale Farbmodi
+    second_color = WHITE if color_mode == 1 else ORANGE
+    
+    if pattern_state == 0:  # Muster 1: Blau, Zweite Farbe, Blau, ...
+        return BLUE if index % 2 == 0 else second_color
+    else:  # Muster 2: Zweite Farbe, Blau, Zweite Farbe, ...
+        return second_color if index % 2 == 0 else BLUE
+
+
+_signals = None
+
+
+def signal_classifier():
+    """Signalstärke -> Farbe als Tabelle von -100 bis 0 dBm, beim ersten Aufruf gebaut"""
+    global _signals
+    if _signals is None:
+        from techtie.signal import SignalClassifier
+        _signals = SignalClassifier(SIGNAL_THRESHOLDS, SIGNAL_COLORS, SIGNAL_GRADIENT)
+    return _signals
+
+
+def map_signal_to_color(signal_strength):
+    """Wandelt die Signalstärke (dBm) in eine Farbe um"""
+    return signal_classifier().color(signal_strength)
@@ -0,0 +1,53 @@
+"""Gemeinsame Einstellungen für code.py, led.py und wifiscanner.py
+
+Diese Datei bleibt als .py auf dem Board, damit man sie direkt bearbeiten
+kann; die übrigen Module in ``techtie`` dürfen als .mpy kompiliert werden.
+"""
+
+import board
+
+# Hardware
+PIXEL_PIN = board.IO18    # Verwende GPIO18 für das Datensignal
+BUTTON_PIN = board.IO17   # Taster an Pin 17
+NUM_PIXELS = 6            # 6 NeoPixel LEDs
+BRIGHTNESS = 0.3          # Helligkeit (0.0 bis 1.0)
+GAMMA = 1.0               # Gammakorrektur der LEDs, z.B. 2.2 (1.0 = aus, Farben wie bisher)
+SPEED = 0.05              # Zeit zwischen Animation-Frames (niedrigere Werte = schneller)
+LONG_PRESS = 0.8          # Ab so vielen Sekunden Halten zählt ein Druck als lang
+DOUBLE_PRESS = 0.25       # Höchstens so viele Sekunden Pause für einen Doppelklick
+RANK_MARGIN = 3           # So viele dB muss ein Netzwerk stärker sein, um einem anderen seine LED abzunehmen
+
+# Scan-Verlauf auf einer SD-Karte
+SD_CS_PIN = None          # Chip-Select einer SD-Karte, z.B. board.IO12 (None = kein Scan-Verlauf)
+SD_SPI_PINS = (board.IO7, board.IO11, board.IO9)  # SCK, MOSI, MISO der SD-Karte
+SD_LOG_FILE = "/sd/scans.csv"  # Scan-Verlauf auf der SD-Karte
+SD_FLUSH_INTERVAL = 60    # Spätestens nach so vielen Sekunden auf die Karte schreiben
+
+# Fernsteuerung per Bluetooth LE (Nordic-UART-Dienst, z.B. mit Bluefruit Connect);
+# nur auf Boards mit Bluetooth wie dem ESP32-S3 - der S2 mini hat keins
+BLE_NAME = None           # Name beim Verbinden, z.B. "TechTie" (None = Bluetooth nicht benutzen)
+
+# Aufzeichnung einer Sitzung für host/replay.py (Taster, Scans, Frames)
+TRACE_FILE = None         # z.B. "/sd/trace.bin" (None = keine Aufzeichnung)
+
+# Farbdefinitionen (R, G, B)
+BLUE = (0, 50, 255)
+ORANGE = (255, 80, 0)
+WHITE = (255, 255, 255)
+OFF = (0, 0, 0)
+
+# Farbdefinitionen für verschiedene Signalstärken
+# Farben gehen von Rot (schwaches Signal) über Gelb zu Grün (starkes Signal)
+SIGNAL_COLORS = [
+    (255, 0, 0),      # Sehr schwach: Rot
+    (255, 60, 0),     # Schwach: Orange-Rot
+    (255, 120, 0),    # Mäßig: Orange
+    (255, 200, 0),    # Gut: Gelb-Orange
+    (150, 255, 0),    # Sehr gut: Gelb-Grün
+    (0, 255, 0)       # Ausgezeichnet: Grün
+]
+
+# Signalstärke-Schwellwerte in dBm (typische WLAN-Werte)
+# -30 dBm ist ausgezeichnet, -90 dBm ist sehr schwach
+SIGNAL_THRESHOLDS = [-90, -80, -70, -60, -50, -40]
+SIGNAL_GRADIENT = False   # True = Farben fließend zwischen den Schwellwerten mischen
@@ -0,0 +1,257 @@
+from array import array
+
+from techtie.ticks import ticks_diff, ticks_ms
+
+
+class Effect:
+    """Ein Anzeigemodus für den EffectGovernor
+
+    ``prepare()`` wird beim Wechsel in den Modus aufgerufen (z.B. um etwas
+    nachzuladen), ``render(buf, t)`` liefert das Frame zum Zeitpunkt ``t``
+    (Frame-Zähler der Animation, inklusive übersprungener Frames). Es darf
+    in ``buf`` schreiben oder einen eigenen Puffer zurückgeben, z.B. ein
+    Frame aus einer Frame-Bank.
+
+    ``cost`` ist die grobe Schätzung der Renderzeit auf dem Board in µs.
+    ``static`` heißt, dass sich das Bild nur ändert, wenn neue Daten kommen
+    (nicht mit ``t``) - dann darf die Animation pausieren.
+    ``levels`` Qualitätsstufen gibt es: Stufe 0 ist volle Qualität, jede
+    weitere halbiert die Update-Rate. Wer stattdessen die Auflösung
+    verringern kann, überschreibt ``set_quality()``.
+    """
+
+    name = "Effekt"
+    cost = 100   # µs pro render()
+    levels = 3   # Stufe 0, 1, 2: jedes, jedes 2., jedes 4. Frame rechnen
+    static = False
+
+    def prepare(self):
+        """Wird beim Wechsel in diesen Modus aufgerufen"""
+
+    def render(self, buf, t):
+        """Frame zum Zeitpunkt ``t``: schreibt nach ``buf`` oder gibt einen eigenen Puffer zurück"""
+        return buf
+
+    def set_quality(self, level):
+        """Stufe geändert; gibt False zurück, wenn die Stufe nur die Update-Rate
+        senken soll (Standard), True, wenn der Effekt sie selbst umsetzt"""
+        return False
+
+
+class RunningLight(Effect):
+    """Lauflicht mit zwei abwechselnden Paletten (Muster-Wechsel alle ``switch`` Frames)"""
+
+    cost = 1500  # live gerechnet; aus Frame-Banks nur ein Ausschnitt
+
+    def __init__(self, name, engine, palettes, banks=None, switch=40):
+        self.name = name
+        self.engine = engine
+        self.palettes = palettes   # [Palette Muster 0, Palette Muster 1]
+        self.banks = banks         # Frame-Banks passend zu palettes (Einträge dürfen None sein)
+        self.switch = switch
+        if banks is not None and None not in banks:
+            self.cost = 50
+
+    def render(self, buf, t):
+        engine = self.engine
+        state = t // self.switch & 1
+        step = t % engine.period
+        if self.banks is not None and self.banks[state] is not None:
+            return self.banks[state].frame(step)
+        engine.step = step
+        engine.render_fade(self.palettes[state])
+        # engine.buf teilen sich mehrere Effekte, deshalb in den eigenen Puffer
+        buf[:] = engine.buf
+        return buf
+
+
+class Rainbow(Effect):
+    """Regenbogen, der sich pro Frame um ``speed`` Farbrad-Stufen weiterdreht"""
+
+    cost = 800
+
+    def __init__(self, name, engine, bank=None, speed=5):
+        self.name = name
+        self.engine = engine
+        self.bank = bank
+        self.speed = speed
+        if bank is not None:
+            self.cost = 50
+
+    def render(self, buf, t):
+        offset = t * self.speed & 255
+        if self.bank is not None:
+            return self.bank.frame(offset)
+        self.engine.render_rainbow(offset)
+        buf[:] = self.engine.buf
+        return buf
+
+
+class WifiSignals(Effect):
+    """Signalstärke der stärksten Netzwerke, eine LED pro Netzwerk
+
+    ``load()`` wird beim ersten ``prepare()`` aufgerufen und liefert
+    ``(NetworkTable, SignalClassifier)`` - so wird der WLAN-Teil erst
+    geladen, wenn jemand den Modus wirklich benutzt. Ist ``target`` gesetzt,
+    erscheinen nur Netzwerke mit dieser SSID (z.B. alle Access Points eines
+    Netzes). Ein Netzwerk behält seine LED, bis ein anderes um mehr als
+    ``margin`` dB stärker ist (``RankHysteresis``).
+    """
+
+    name = "WLAN-Signalstärke"
+    cost = 300
+    static = True
+
+    def __init__(self, num_pixels, load, margin=0):
+        self.num_pixels = num_pixels
+        self.margin = margin
+        self.table = None
+        self.signals = None
+        self.target = None
+        self.ranking = None
+        self._keys = None     # Kandidaten für die Rangfolge: BSSID ...
+        self._values = None   # ... und geglättete Signalstärke
+        self._load = load
+        self._black = bytes(num_pixels * 3)
+
+    def prepare(self):
+        if self.table is None:
+            from techtie.ranking import RankHysteresis
+            self.table, self.signals = self._load()
+            # Doppelt so viele Kandidaten wie LEDs, damit ein knapp
+            # abgerutschtes Netzwerk seine LED behalten kann
+            candidates = self.num_pixels * 2
+            self._keys = [None] * candidates
+            self._values = array("b", [0] * candidates)
+            self.ranking = RankHysteresis(self.num_pixels, self.margin, candidates)
+
+    def render(self, buf, t):
+        # Alle LEDs löschen (am Stück, auch auf langen Streifen)
+        buf[:] = self._black
+        table = self.table
+        if table is None:
+            return buf
+        # Kandidaten: die ersten passenden Einträge der Tabelle, die schon
+        # nach geglätteter Signalstärke sortiert ist
+        keys = self._keys
+        values = self._values
+        target = self.target
+        count = 0
+        for i in range(table.count):
+            if count >= len(values):
+                break
+            slot = table.order[i]
+            if target is not None and table.ssid[slot] != target:
+                continue
+            keys[count] = table.bssid[slot]
+            values[count] = table.rssi(slot)
+            count += 1
+        # Zeige maximal num_pixels Netzwerke an, jedes auf seiner LED
+        ranking = self.ranking
+        for led in range(ranking.update(keys, values, count)):
+            self.signals.write(buf, led, values[ranking.order[led]])
+        return buf
+
+
+class EffectGovernor:
+    """Ruft die Effekte über eine Tabelle auf und hält sie im Zeitbudget
+
+    ``effects`` ist eine Liste, der Index ist die Modusnummer. Jeder Effekt
+    bekommt einen eigenen Frame-Puffer, damit z.B. eine Überblendung zwei
+    Effekte gleichzeitig rendern kann.
+
+    Die Renderzeit wird bei jedem Aufruf mit ``ticks_ms()`` gemessen (ohne
+    neue Objekte) und als gleitender Mittelwert in µs geführt - einzelne
+    Messungen sind auf 1 ms gerundet, der Mittelwert wird trotzdem genauer.
+    Kostet ein Effekt umgerechnet auf jedes Frame mehr als ``budget``
+    Sekunden, geht er eine Qualitätsstufe herunter; bleibt er danach
+    ``restore_after`` Frames lang unter der Hälfte des Budgets der
+    besseren Stufe, geht er wieder hoch. Die Startstufe richtet sich nach
+    der angegebenen ``cost``.
+    """
+
+    def __init__(self, effects, frame_size, budget, restore_after=100):
+        self.effects = effects
+        self.budget_us = int(budget * 1_000_000)
+        self.restore_after = restore_after
+        for effect in effects:
+            effect.buf = bytearray(frame_size)
+            effect.frame = effect.buf   # Zuletzt gerechnetes Frame
+            effect.level = 0
+            effect.frames = 0           # Angezeigte Frames
+            effect.renders = 0          # Davon tatsächlich gerechnet
+            effect.total_ms = 0
+            effect.max_ms = 0
+            effect.avg_us = effect.cost
+            effect.misses = 0           # Frames über dem Budget
+            effect._last = None         # t des letzten gerechneten Frames
+            effect._calm = 0            # Frames mit genug Luft in Folge
+            self._set_level(effect, self._initial_level(effect))
+
+    def _initial_level(self, effect):
+        level = 0
+        while level < effect.levels - 1 and effect.cost >> level > self.budget_us:
+            level += 1
+        return level
+
+    def _set_level(self, effect, level):
+        effect.level = level
+        effect._calm = 0
+        # Kann der Effekt die Stufe nicht selbst umsetzen, sinkt die Update-Rate
+        effect.divider = 1 if effect.set_quality(level) else 1 << level
+
+    def select(self, mode):
+        """Wechsel in den Modus ``mode``: ruft ``prepare()`` auf"""
+        effect = self.effects[mode]
+        effect.prepare()
+        effect._last = None
+        return effect
+
+    def render(self, mode, t):
+        """Frame des Modus ``mode`` zum Zeitpunkt ``t``"""
+        effect = self.effects[mode]
+        effect.frames += 1
+        last = effect._last
+        if last is not None and 0 <= t - last < effect.divider:
+            return effect.frame
+
+        start = ticks_ms()
+        effect.frame = effect.render(effect.buf, t)
+        elapsed = ticks_diff(ticks_ms(), start)
+        effect._last = t
+        effect.renders += 1
+        effect.total_ms += elapsed
+        if elapsed > effect.max_ms:
+            effect.max_ms = elapsed
+        if elapsed * 1000 > self.budget_us:
+            effect.misses += 1
+        effect.avg_us += (elapsed * 1000 - effect.avg_us) >> 3
+        self._govern(effect)
+        return effect.frame
+
+    def _govern(self, effect):
+        # Kosten pro Frame: gerechnet wird nur jedes divider-te Frame
+        per_frame = effect.avg_us // effect.divider
+        if per_frame > self.budget_us:
+            if effect.level < effect.levels - 1:
+                self._set_level(effect, effect.level + 1)
+            return
+        if effect.level and per_frame * 4 <= self.budget_us:
+            # Eine Stufe besser (doppelte Kosten) ließe noch die Hälfte frei
+            effect._calm += effect.divider
+            if effect._calm >= self.restore_after:
+                self._set_level(effect, effect.level - 1)
+        else:
+            effect._calm = 0
+
+    def report(self, log=print):
+        """Gibt pro Effekt Renderzeit und Qualitätsstufe aus (standardmäßig per print)"""
+        for effect in self.effects:
+            if not effect.frames:
+                continue
+            average = effect.total_ms / effect.renders if effect.renders else 0
+            log(
+                f"Effekt {effect.name}: {effect.frames} Frames, {effect.renders} gerechnet, "
+                f"mittel {average:.2f} ms, max {effect.max_ms} ms, "
+                f"{effect.misses} über Budget, Stufe {effect.level}"
+            )
@@ -0,0 +1,130 @@
+import time
+
+from techtie.wlan import FIRST_CHANNEL, LAST_CHANNEL
+
+SHIFT = 4  # RSSI-Werte werden mit 16 multipliziert gespeichert
+
+
+class FoxHunt:
+    """Fuchsjagd: verfolgt ein einzelnes Netzwerk so schnell wie möglich
+
+    Ist das Ziel (BSSID oder SSID) einmal gefunden, wird nur noch sein Kanal
+    gescannt - das dauert nur einen Bruchteil eines vollen Scans. Die
+    Messwerte werden zweimal geglättet: ``rssi`` folgt schnell, ein langsamer
+    Mittelwert dient als Vergleich. Die Differenz ist der Trend: positiv heißt
+    "wärmer" (Signal wird stärker), negativ "kälter".
+
+    Als Task für den Scheduler gedacht; jeder Aufruf scannt genau einen Kanal.
+    """
+
+    def __init__(self, radio, fast=1, slow=4, lost_after=5):
+        self.radio = radio
+        self.fast = fast              # Glättung des angezeigten Werts (1/2**fast)
+        self.slow = slow              # Glättung des Vergleichswerts für den Trend
+        self.lost_after = lost_after  # Fehlversuche, bis wieder alle Kanäle gesucht werden
+        self.ssid = None
+        self.bssid = None
+        self.channel = 0              # Kanal des Ziels, 0 = noch unbekannt
+        self.updates = 0              # Anzahl Messungen des Ziels
+        self._fast = 0
+        self._slow = 0
+        self._misses = 0
+        self._search = FIRST_CHANNEL  # Nächster Kanal bei der Suche
+        self._rate_updates = 0
+        self._rate_ns = time.monotonic_ns()
+
+    @property
+    def locked(self):
+        """True, sobald das Ziel gefunden wurde und sein Kanal bekannt ist"""
+        return self.channel != 0
+
+    @property
+    def rssi(self):
+        """Geglättete Signalstärke des Ziels in dBm"""
+        return (self._fast + (1 << (SHIFT - 1))) >> SHIFT
+
+    @property
+    def trend(self):
+        """Trend in dB: > 0 wärmer, < 0 kälter"""
+        return (self._fast - self._slow) / (1 << SHIFT)
+
+    def lock(self, ssid=None, bssid=None, channel=0):
+        """Legt das Ziel fest; ohne Kanal wird es erst auf allen Kanälen gesucht"""
+        self.ssid = ssid
+        self.bssid = bssid
+        self.channel = channel
+        self.updates = 0
+        self._misses = 0
+        self._search = FIRST_CHANNEL
+
+    def __call__(self, now):
+        if self.ssid is None and self.bssid is None:
+            return 1
+
+        if self.channel:
+            channel = self.channel
+        else:
+            channel = self._search
+            self._search = self._search + 1 if self._search < LAST_CHANNEL else FIRST_CHANNEL
+
+        try:
+            found = self._scan(channel)
+        except Exception as e:
+            print(f"Fehler beim Scannen: {e}")
+            return 1
+
+        if found is None:
+            if self.channel:
+                self._misses += 1
+                if self._misses >= self.lost_after:
+                    # Ziel verloren (oder Kanal gewechselt): wieder überall suchen
+                    self.channel = 0
+                    self._search = FIRST_CHANNEL
+            return 0
+
+        self._misses = 0
+        self.channel = found.channel
+        if self.bssid is None:
+            self.bssid = found.bssid
+        if self.ssid is None:
+            self.ssid = found.ssid
+        self._update(found.rssi)
+        return 0
+
+    def _scan(self, channel):
+        # Stärkstes passendes Netzwerk auf diesem Kanal
+        best = None
+        try:
+            for network in self.radio.start_scanning_networks(
+                start_channel=channel, stop_channel=channel
+            ):
+                if self.bssid is not None:
+                    if network.bssid != self.bssid:
+                        continue
+                elif network.ssid != self.ssid:
+                    continue
+                if best is None or network.rssi > best.rssi:
+                    best = network
+        finally:
+            self.radio.stop_scanning_networks()
+        return best
+
+    def _update(self, rssi):
+        value = rssi << SHIFT
+        if not self.updates:
+            self._fast = value
+            self._slow = value
+        else:
+            self._fast += (value - self._fast) >> self.fast
+            self._slow += (value - self._slow) >> self.slow
+        self.updates += 1
+        self._rate_updates += 1
+
+    def rate(self):
+        """Messungen pro Sekunde seit dem letzten Aufruf"""
+        now = time.monotonic_ns()
+        elapsed = now - self._rate_ns
+        rate = self._rate_updates * 1_000_000_000 / elapsed if elapsed else 0
+        self._rate_updates = 0
+        self._rate_ns = now
+        return rate
@@ -0,0 +1,164 @@
+try:
+    import binascii
+except ImportError:
+    binascii = None
+
+
+class FrameBank:
+    """Alle Frames einer Animationsperiode hintereinander in einem bytearray
+
+    ``frame(index)`` liefert einen ``memoryview``-Ausschnitt - beim Abspielen
+    wird also nichts gerechnet und nichts kopiert, bis die Daten im
+    NeoPixel-Puffer landen. Die Ausschnitte werden einmal beim Anlegen
+    erzeugt, damit auch beim Abspielen kein neues Objekt entsteht.
+    """
+
+    VIEW_BYTES = 20  # Ungefährer Platz für einen Ausschnitt samt Listeneintrag
+
+    def __init__(self, frame_size, count):
+        self.frame_size = frame_size
+        self.count = count
+        self.data = bytearray(frame_size * count)
+        view = memoryview(self.data)
+        self._frames = [view[i * frame_size:(i + 1) * frame_size] for i in range(count)]
+
+    @staticmethod
+    def nbytes(frame_size, count):
+        """RAM, den eine Bank mit ``count`` Frames belegt (vor dem Anlegen)"""
+        return count * (frame_size + FrameBank.VIEW_BYTES)
+
+    def frame(self, index):
+        """Frame Nummer ``index`` als memoryview"""
+        return self._frames[index]
+
+    def fill(self, render):
+        """Füllt die Bank: ``render(index)`` gibt das Frame als Puffer zurück"""
+        size = self.frame_size
+        for index in range(self.count):
+            self.data[index * size:(index + 1) * size] = render(index)
+
+
+class FileBank:
+    """Frame-Bank als Datei auf dem Flash, für Animationen, die nicht ins RAM passen
+
+    Im RAM liegt nur ein einziges Frame: ``frame(index)`` liest es mit
+    ``readinto()`` direkt in einen vorbereiteten Puffer. Vorne in der Datei
+    steht eine Prüfsumme über zwei Frames, damit eine Bank von einer
+    anderen Einstellung (Farben, Länge) nicht versehentlich abgespielt wird.
+    """
+
+    HEADER = 16  # Bytes: Anzahl, Frame-Größe, Prüfsumme, reserviert
+
+    def __init__(self, path, frame_size, count):
+        self.path = path
+        self.frame_size = frame_size
+        self.count = count
+        self.buf = bytearray(frame_size)
+        self._file = None
+
+    def frame(self, index):
+        """Frame Nummer ``index``, gelesen in einen wiederverwendeten Puffer"""
+        self._file.seek(self.HEADER + index * self.frame_size)
+        self._file.readinto(self.buf)
+        return self.buf
+
+    def open(self, check):
+        """Öffnet die Datei, wenn sie zur Prüfsumme ``check`` passt"""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return False
+        header = f.read(self.HEADER)
+        if header != _header(self.count, self.frame_size, check):
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def write(self, render, check):
+        """Schreibt alle Frames in die Datei (False, wenn der Flash schreibgeschützt ist)"""
+        try:
+            with open(self.path, "wb") as f:
+                f.write(_header(self.count, self.frame_size, check))
+                for index in range(self.count):
+                    f.write(render(index))
+        except OSError:
+            return False
+        return self.open(check)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FrameBanks:
+    """Übersetzt periodische Animationen in Frame-Banks, solange das Budget reicht
+
+    ``compile()`` rendert eine ganze Periode einmal vor und gibt die Bank
+    zurück. Passt sie nicht mehr in ``budget`` Bytes RAM, wird sie - falls
+    ``directory`` gesetzt ist - als Datei auf dem Flash abgelegt. Geht beides
+    nicht, kommt ``None`` zurück und der Aufrufer rendert live weiter.
+
+    ``recompile()`` rendert alle Banks neu, z.B. wenn sich die in die Frames
+    eingebackene Helligkeit geändert hat.
+    """
+
+    def __init__(self, budget, directory=None):
+        self.budget = budget        # Höchstens so viele Bytes RAM für alle Banks
+        self.directory = directory  # Ordner für FileBanks, None = nur RAM
+        self.used = 0               # Belegte Bytes RAM
+        self.banks = 0              # Banks im RAM
+        self.files = 0              # Banks auf dem Flash
+        self.live = 0               # Animationen, die live gerendert werden müssen
+        self._compiled = []         # (Bank, render) für recompile()
+
+    def compile(self, name, render, count, frame_size):
+        """Bank für ``count`` Frames; ``render(index)`` gibt ein Frame als Puffer zurück"""
+        size = FrameBank.nbytes(frame_size, count)
+        if self.used + size <= self.budget:
+            bank = FrameBank(frame_size, count)
+            bank.fill(render)
+            self.used += size
+            self.banks += 1
+            self._compiled.append((bank, render))
+            return bank
+
+        if self.directory is not None and binascii is not None:
+            bank = FileBank(f"{self.directory}/{name}.bin", frame_size, count)
+            if self._store(bank, render):
+                self.files += 1
+                self._compiled.append((bank, render))
+                return bank
+
+        self.live += 1
+        return None
+
+    def recompile(self):
+        """Rendert alle Banks mit ihrem ``render`` neu (dauert so lange wie beim Start)"""
+        for bank, render in self._compiled:
+            if isinstance(bank, FileBank):
+                bank.close()
+                self._store(bank, render)
+            else:
+                bank.fill(render)
+
+    def _store(self, bank, render):
+        # Prüfsumme über zwei Frames: ändert sich mit Farben, Länge und Helligkeit
+        check = binascii.crc32(render(0))
+        check = binascii.crc32(render(bank.count // 2), check)
+        return bank.open(check) or bank.write(render, check)
+
+    def report(self, log=print):
+        """Gibt aus, wie viele Animationen vorberechnet sind (standardmäßig per print)"""
+        log(
+            f"Frame-Banks: {self.banks} im RAM ({self.used} von {self.budget} Bytes), "
+            f"{self.files} auf dem Flash, {self.live} live gerendert"
+        )
+
+
+def _header(count, frame_size, check):
+    header = bytearray(FileBank.HEADER)
+    for i, value in enumerate((count, frame_size, check & 0xFFFFFFFF)):
+        header[i * 4:i * 4 + 4] = value.to_bytes(4, "little")
+    return bytes(header)
@@ -0,0 +1,107 @@
+from techtie.ticks import ticks_add, ticks_diff, ticks_ms
+
+
+class FrameClock:
+    """Taktgeber für die Animation: feste Frame-Deadlines statt sleep(SPEED)
+
+    Die Deadline wird absolut fortgeschrieben (``deadline += period``), die
+    Rechenzeit eines Frames geht also nicht mehr zusätzlich in die Wartezeit
+    ein. Dauert ein Frame zu lange, werden die verpassten Frames übersprungen
+    und ``render(now, frames)`` erfährt, wie viele Perioden vergangen sind -
+    so bleibt das Tempo der Animation gleich.
+
+    Gibt ``render`` True zurück, steht das Bild still (z.B. im WLAN-Modus
+    zwischen zwei Scans): dann kommt das nächste Frame erst nach
+    ``idle_period`` Sekunden oder wenn jemand den Task mit
+    ``scheduler.wake()`` weckt. Die Pause zählt nicht als übersprungen.
+
+    Gerechnet wird in ganzen Millisekunden mit ``ticks_ms()``, damit ein
+    Frame keine großen Ganzzahlen anlegt.
+
+    Als Task für den Scheduler gedacht: ``scheduler.add(FrameClock(...))``.
+    """
+
+    def __init__(self, render, period, idle_period=1.0):
+        self.render = render
+        self.period_ms = max(1, round(period * 1000))
+        self.idle_ms = round(idle_period * 1000)
+        self.frames = 0        # Gerenderte Frames insgesamt
+        self.overruns = 0      # Frames, die ihre Deadline verpasst haben
+        self.skipped = 0       # Übersprungene Frames
+        self.idle = False      # Steht das Bild gerade still?
+        self.idles = 0         # Wie oft eine Pause begonnen hat
+        self._deadline = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Setzt min/mittel/max der Frame-Zeit zurück (z.B. nach jedem Bericht)"""
+        self._count = 0
+        self._total_ms = 0
+        self._min_ms = 0
+        self._max_ms = 0
+
+    def __call__(self, now):
+        start = ticks_ms()
+        if self._deadline is None or self.idle:
+            # Nach einer Pause geht es im Takt ab jetzt weiter
+            self._deadline = start
+            self.idle = False
+
+        # Verpasste Frames überspringen, statt sie alle nachzuholen
+        frames = 1
+        late = ticks_diff(start, self._deadline)
+        if late >= self.period_ms:
+            missed = late // self.period_ms
+            frames += missed
+            self.skipped += missed
+            self._deadline = ticks_add(self._deadline, missed * self.period_ms)
+
+        idle = self.render(now, frames)
+
+        end = ticks_ms()
+        self._record(ticks_diff(end, start))
+        if idle:
+            self.idle = True
+            self.idles += 1
+            self._deadline = ticks_add(end, self.idle_ms)
+            return self.idle_ms / 1000
+        self._deadline = ticks_add(self._deadline, self.period_ms)
+        wait = ticks_diff(self._deadline, end)
+        if wait < 0:
+            self.overruns += 1
+        return wait / 1000
+
+    def remaining(self):
+        """Sekunden bis zur nächsten Frame-Deadline (0, wenn sie schon erreicht ist)"""
+        if self._deadline is None:
+            return 0
+        return max(0, ticks_diff(self._deadline, ticks_ms())) / 1000
+
+    def _record(self, elapsed):
+        self.frames += 1
+        self._count += 1
+        self._total_ms += elapsed
+        if self._count == 1 or elapsed < self._min_ms:
+            self._min_ms = elapsed
+        if elapsed > self._max_ms:
+            self._max_ms = elapsed
+
+    def stats(self):
+        """Frame-Zeit in ms (min, mittel, max) seit dem letzten reset_stats()"""
+        if not self._count:
+            return (0.0, 0.0, 0.0)
+        return (
+            self._min_ms,
+            self._total_ms / self._count,
+            self._max_ms,
+        )
+
+    def report(self, log=print):
+        """Gibt die Frame-Statistik aus (standardmäßig per print)"""
+        fastest, average, slowest = self.stats()
+        log(
+            f"Frames: {self.frames}, Frame-Zeit min/mittel/max: "
+            f"{fastest:.1f}/{average:.1f}/{slowest:.1f} ms, "
+            f"Überläufe: {self.overruns}, übersprungen: {self.skipped}, Pausen: {self.idles}"
+        )
+        self.reset_stats()
@@ -0,0 +1,169 @@
+import time
+
+try:
+    import os
+except ImportError:
+    os = None
+
+try:
+    import binascii
+except ImportError:
+    binascii = None
+
+
+def bssid_hex(bssid):
+    """BSSID als Hex-Text ohne Trennzeichen ("" für None)"""
+    if bssid is None:
+        return ""
+    if binascii is not None:
+        return binascii.hexlify(bssid).decode()
+    return "".join("%02x" % b for b in bssid)
+
+
+def one_line(text):
+    """``text`` ohne Zeilenumbrüche (z.B. eine SSID, die in eine Log-Zeile kommt)"""
+    if "\n" in text or "\r" in text:
+        return text.replace("\r", " ").replace("\n", " ")
+    return text
+
+
+class RingBuffer:
+    """Fester Ringpuffer für Bytes
+
+    ``push()`` hängt hinten an (oder lehnt ab, wenn es nicht mehr passt),
+    ``chunk()`` und ``consume()`` holen vorne wieder ab - ohne Kopie, als
+    memoryview auf ein zusammenhängendes Stück.
+    """
+
+    def __init__(self, size):
+        self.buf = bytearray(size)
+        self.used = 0       # Belegte Bytes
+        self._head = 0      # Hier wird als Nächstes geschrieben
+
+    @property
+    def free(self):
+        return len(self.buf) - self.used
+
+    def push(self, data, count=None):
+        """Hängt ``data`` (bzw. die ersten ``count`` Bytes) an; False, wenn es nicht passt"""
+        if count is None:
+            count = len(data)
+        elif count < len(data):
+            data = memoryview(data)[:count]
+        size = len(self.buf)
+        if self.used + count > size:
+            return False
+        start = self._head
+        end = start + count
+        if end <= size:
+            self.buf[start:end] = data
+        else:
+            split = size - start
+            self.buf[start:] = data[:split]
+            self.buf[:end - size] = data[split:]
+        self._head = end % size
+        self.used += count
+        return True
+
+    def chunk(self, limit):
+        """Die ältesten, höchstens ``limit`` Bytes am Stück (memoryview, bleibt im Puffer)"""
+        size = len(self.buf)
+        tail = (self._head - self.used) % size
+        count = min(self.used, limit, size - tail)
+        return memoryview(self.buf)[tail:tail + count]
+
+    def consume(self, count):
+        """Gibt die ältesten ``count`` Bytes frei"""
+        self.used -= min(count, self.used)
+
+    def take(self, count):
+        """Holt die ältesten ``count`` Bytes als bytes heraus"""
+        first = bytes(self.chunk(count))
+        self.consume(len(first))
+        if len(first) < count:
+            rest = bytes(self.chunk(count - len(first)))
+            self.consume(len(rest))
+            return first + rest
+        return first
+
+    def clear(self):
+        self.used = 0
+
+
+class LogFile:
+    """Sammelt Daten im RAM und hängt sie selten in großen Stücken an eine Datei an
+
+    Grundlage für ``ScanLog`` und ``TraceRecorder``: Unterklassen schreiben
+    mit ``_push()`` in den Ringpuffer ``ring``. Als Task für den Scheduler
+    wird nur geschrieben, wenn der Puffer zur Hälfte voll ist oder
+    ``flush_every`` Sekunden vergangen sind - und nie kurz vor einem Frame
+    (``clock``). Die Datei wird nur angehängt und nach jedem Schreiben
+    geschlossen; ein Schreibfehler (keine Karte, voll, schreibgeschützt)
+    schaltet das Schreiben ab und wird über ``log`` gemeldet. Was nicht
+    mehr in den Puffer passt, zählt ``dropped``.
+    """
+
+    def __init__(self, path, size, flush_every, clock=None, min_gap=0.02, log=print):
+        self.path = path
+        self.flush_every = flush_every  # Spätestens nach so vielen Sekunden schreiben
+        self.clock = clock              # FrameClock: nur zwischen zwei Frames schreiben
+        self.min_gap = min_gap          # So viel Zeit muss bis zum nächsten Frame bleiben
+        self.log = log                  # Fehlermeldungen, z.B. telemetry.error
+        self.enabled = True             # Wird bei Schreibfehlern abgeschaltet
+        self.flushes = 0                # Schreibvorgänge
+        self.dropped = 0                # Wegen vollem Puffer verworfen
+        self.ring = RingBuffer(size)
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending(self):
+        """Noch nicht geschriebene Bytes"""
+        return self.ring.used
+
+    def _push(self, data, count=None):
+        if not self.enabled:
+            return False
+        if not self.ring.push(data, count):
+            self.dropped += 1
+            return False
+        return True
+
+    def __call__(self, now):
+        """Task: schreibt den Puffer, wenn es sich lohnt und Zeit ist"""
+        ring = self.ring
+        if not self.enabled or not ring.used:
+            return None
+        if ring.used * 2 < len(ring.buf) and now - self._last_flush < self.flush_every:
+            return None
+        if self.clock is not None:
+            gap = self.clock.remaining()
+            if gap < self.min_gap:
+                # Direkt nach dem nächsten Frame noch einmal versuchen
+                return gap
+        self.flush()
+        return None
+
+    def flush(self):
+        """Hängt alles aus dem Puffer an die Datei an (blockiert, bis es geschrieben ist)"""
+        self._last_flush = time.monotonic()
+        ring = self.ring
+        if not ring.used:
+            return
+        try:
+            with open(self.path, "ab") as f:
+                first = ring.chunk(ring.used)
+                f.write(first)
+                if len(first) < ring.used:
+                    f.write(memoryview(ring.buf)[:ring.used - len(first)])
+            if os is not None and hasattr(os, "sync"):
+                os.sync()
+        except OSError as e:
+            self.log(f"Fehler beim Schreiben von {self.path}: {e}")
+            self.enabled = False
+            return
+        ring.clear()
+        self.flushes += 1
+        self._written()
+
+    def _written(self):
+        """Nach jedem erfolgreichen Schreiben (für Zähler der Unterklassen)"""
@@ -0,0 +1,140 @@
+from array import array
+
+SHIFT = 4  # Geglättete RSSI-Werte werden mit 16 multipliziert gespeichert
+
+
+class NetworkTable:
+    """Feste Tabelle der gesehenen WLAN-Netzwerke, geschlüsselt nach BSSID
+
+    Statt bei jedem Scan neue Dicts und Listen anzulegen, werden die Einträge
+    in vorab angelegten Arrays an Ort und Stelle aktualisiert. Der RSSI-Wert
+    wird geglättet (gleitender Mittelwert), damit die Anzeige nicht bei jedem
+    Flackern um 1 dB springt. Netzwerke, die ``max_age`` Sekunden nicht mehr
+    gesehen wurden, fliegen raus.
+
+    ``order[:count]`` enthält die belegten Plätze, stärkstes Signal zuerst.
+    """
+
+    def __init__(self, capacity=32, smoothing=2, max_age=20):
+        self.capacity = capacity
+        self.smoothing = smoothing  # Glättung: neuer Wert zählt 1/2**smoothing
+        self.max_age = max_age      # Sekunden bis ein Netzwerk vergessen wird
+        self.count = 0
+        self.order = bytearray(capacity)
+        self.ssid = [""] * capacity
+        self.bssid = [None] * capacity
+        self.channel = bytearray(capacity)
+        self.last_rssi = array("b", [0] * capacity)  # Letzter gemessener Wert
+        self.last_seen = [0.0] * capacity
+        self._rssi = array("h", [0] * capacity)  # Geglättet, mal 16
+        self._slots = {}  # BSSID -> Platz
+        self._change = 0  # Summe der RSSI-Änderungen seit take_change()
+        self._changes = 0
+
+    def rssi(self, slot):
+        """Geglätteter RSSI-Wert eines Platzes in dBm"""
+        return (self._rssi[slot] + (1 << (SHIFT - 1))) >> SHIFT
+
+    def update(self, network, now):
+        """Übernimmt ein Scan-Ergebnis; gibt den Platz zurück (oder -1)"""
+        rssi = network.rssi
+        bssid = network.bssid
+        slot = self._slots.get(bssid, -1)
+        if slot < 0:
+            slot = self._insert(bssid, rssi)
+            if slot < 0:
+                return -1
+            self.ssid[slot] = network.ssid
+            self._rssi[slot] = rssi << SHIFT
+        else:
+            change = rssi - self.last_rssi[slot]
+            self._change += change if change >= 0 else -change
+            self._changes += 1
+            # Gleitender Mittelwert in Festkomma
+            value = self._rssi[slot]
+            self._rssi[slot] = value + (((rssi << SHIFT) - value) >> self.smoothing)
+        self.channel[slot] = network.channel
+        self.last_rssi[slot] = rssi
+        self.last_seen[slot] = now
+        return slot
+
+    def _insert(self, bssid, rssi):
+        if self.count < self.capacity:
+            # Freien Platz suchen
+            for slot in range(self.capacity):
+                if self.bssid[slot] is None:
+                    break
+            self.order[self.count] = slot
+            self.count += 1
+        else:
+            # Tabelle voll: das schwächste Netzwerk verdrängen, falls schwächer
+            slot = self.order[self.count - 1]
+            if self._rssi[slot] >= rssi << SHIFT:
+                return -1
+            del self._slots[self.bssid[slot]]
+        self.bssid[slot] = bssid
+        self._slots[bssid] = slot
+        return slot
+
+    def take_change(self):
+        """Mittlere RSSI-Änderung in dB seit dem letzten Aufruf (None ohne Messung)"""
+        if not self._changes:
+            return None
+        change = self._change / self._changes
+        self._change = 0
+        self._changes = 0
+        return change
+
+    def evict(self, now):
+        """Entfernt Netzwerke, die länger als max_age nicht gesehen wurden"""
+        kept = 0
+        for i in range(self.count):
+            slot = self.order[i]
+            if now - self.last_seen[slot] > self.max_age:
+                del self._slots[self.bssid[slot]]
+                self.bssid[slot] = None
+                self.ssid[slot] = ""
+            else:
+                self.order[kept] = slot
+                kept += 1
+        self.count = kept
+
+    def sort(self):
+        """Bringt order nach geglättetem RSSI in Reihenfolge
+
+        Insertion Sort: nach einem Scan ist die Liste fast sortiert, dann
+        sind nur wenige Verschiebungen nötig.
+        """
+        order = self.order
+        values = self._rssi
+        for i in range(1, self.count):
+            slot = order[i]
+            value = values[slot]
+            j = i - 1
+            while j >= 0 and values[order[j]] < value:
+                order[j + 1] = order[j]
+                j -= 1
+            order[j + 1] = slot
+
+    def digest(self, limit, target=None):
+        """Prüfsumme über die ersten ``limit`` Netzwerke (nur SSID ``target``,
+        falls gesetzt): ändert sich, sobald sich an ihrer Anzeige etwas ändert"""
+        digest = 0
+        count = 0
+        for i in range(self.count):
+            if count >= limit:
+                break
+            slot = self.order[i]
+            if target is not None and self.ssid[slot] != target:
+                continue
+            digest = (digest * 31 + slot * 131 + self.rssi(slot) * 7 + self.channel[slot]) & 0xFFFFFF
+            count += 1
+        return (digest * 31 + count) & 0xFFFFFF
+
+    def clear(self):
+        """Vergisst alle Netzwerke"""
+        for i in range(self.count):
+            self.bssid[self.order[i]] = None
+            self.ssid[self.order[i]] = ""
+        self._slots.clear()
+        self.count = 0
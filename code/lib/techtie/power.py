@@ -0,0 +1,113 @@
+import time
+
+from techtie.ticks import ticks_diff, ticks_ms
+
+try:
+    import alarm
+except ImportError:
+    alarm = None
+
+# Grobe Richtwerte für den ESP32-S2 ohne LEDs und ohne WLAN-Funk, in mA
+ACTIVE_MA = 40.0   # CPU rechnet
+IDLE_MA = 20.0     # time.sleep(): CPU wartet, USB und Takt laufen weiter
+SLEEP_MA = 1.0     # Light Sleep über alarm
+
+
+class PowerManager:
+    """Schläft in langen Pausen zwischen den Tasks im Light Sleep
+
+    Wird als ``scheduler.sleep`` eingesetzt und bekommt die Zeit bis zum
+    nächsten fälligen Task. Im Light Sleep stehen auch die Hintergrund-Tasks
+    von CircuitPython still, ``keypad`` tastet den Taster dann nicht ab.
+    Deshalb:
+
+    - Pausen unter ``min_sleep`` Sekunden (z.B. zwischen zwei Frames einer
+      Animation) überbrückt ``time.sleep()``; ``keypad`` läuft weiter und
+      die Flanken behalten ihre genauen Zeitstempel.
+    - Längere Pausen (z.B. im ruhenden WLAN-Modus) gehen mit ``alarm`` in
+      den Light Sleep, bis der Termin erreicht ist oder der Taster gedrückt
+      wird. Dafür gibt ``button`` den Pin kurz frei; nach dem Aufwachen
+      durch den Taster wird ``on_wake()`` aufgerufen. Ist der Taster gerade
+      gedrückt (``button.busy``), bleibt es bei ``time.sleep()``.
+
+    Ohne ``alarm`` (oder mit ``enabled = False``) bleibt es immer bei
+    ``time.sleep()``. Pro Modus (``mode``) wird in ms (``ticks_ms()``)
+    mitgezählt, wie lange das Board rechnet, wartet und schläft;
+    ``report()`` schätzt daraus den mittleren Strom.
+    """
+
+    def __init__(self, button, pin, modes, min_sleep=0.2):
+        self.button = button
+        self.min_sleep = min_sleep    # Kürzere Pausen lohnen den Light Sleep nicht
+        self.enabled = alarm is not None
+        self.mode = 0
+        self.on_wake = None           # Wird nach dem Wecken durch den Taster aufgerufen
+        self.active_ms = [0] * modes
+        self.idle_ms = [0] * modes
+        self.sleep_ms = [0] * modes
+        self.sleeps = [0] * modes     # Light-Sleep-Phasen
+        self.pin_wakes = [0] * modes  # Davon durch den Taster beendet
+        self._pin_alarm = None
+        if alarm is not None:
+            self._pin_alarm = alarm.pin.PinAlarm(pin, value=False, pull=True)
+        self._awake = ticks_ms()
+
+    def select(self, mode):
+        """Ab jetzt zählt die Zeit für ``mode``"""
+        now = ticks_ms()
+        self.active_ms[self.mode] += ticks_diff(now, self._awake)
+        self._awake = now
+        self.mode = mode
+
+    def sleep(self, seconds):
+        """Wartet ``seconds`` Sekunden (oder bis zum Tasterdruck)"""
+        mode = self.mode
+        start = ticks_ms()
+        self.active_ms[mode] += ticks_diff(start, self._awake)
+        if not self.enabled or seconds < self.min_sleep or self.button.busy:
+            time.sleep(seconds)
+            self._awake = ticks_ms()
+            self.idle_ms[mode] += ticks_diff(self._awake, start)
+            return
+
+        # Nur hier entsteht ein neuer TimeAlarm, also höchstens einmal pro
+        # langer Pause und nie zwischen zwei Frames einer Animation
+        time_alarm = alarm.time.TimeAlarm(monotonic_time=time.monotonic() + seconds)
+        woke = None
+        self.button.suspend()
+        try:
+            woke = alarm.light_sleep_until_alarms(time_alarm, self._pin_alarm)
+        finally:
+            self.button.resume(isinstance(woke, alarm.pin.PinAlarm))
+        self._awake = ticks_ms()
+        self.sleep_ms[mode] += ticks_diff(self._awake, start)
+        self.sleeps[mode] += 1
+        if isinstance(woke, alarm.pin.PinAlarm):
+            self.pin_wakes[mode] += 1
+            if self.on_wake is not None:
+                self.on_wake()
+
+    def current(self, mode):
+        """Geschätzter mittlerer Strom in mA im Modus ``mode`` (None ohne Messung)"""
+        total = self.active_ms[mode] + self.idle_ms[mode] + self.sleep_ms[mode]
+        if not total:
+            return None
+        return (self.active_ms[mode] * ACTIVE_MA + self.idle_ms[mode] * IDLE_MA
+                + self.sleep_ms[mode] * SLEEP_MA) / total
+
+    def report(self, names, log=print):
+        """Gibt pro Modus Rechen-, Warte- und Schlafanteil und den geschätzten
+        Strom aus (standardmäßig per print)"""
+        self.select(self.mode)
+        for mode, name in enumerate(names):
+            current = self.current(mode)
+            if current is None:
+                continue
+            total = self.active_ms[mode] + self.idle_ms[mode] + self.sleep_ms[mode]
+            log(
+                f"Energie {name}: rechnet {self.active_ms[mode] * 100 / total:.0f} %, "
+                f"wartet {self.idle_ms[mode] * 100 / total:.0f} %, "
+                f"schläft {self.sleep_ms[mode] * 100 / total:.0f} % "
+                f"({self.sleeps[mode]}x, {self.pin_wakes[mode]}x per Taster geweckt), "
+                f"etwa {current:.1f} mA ohne LEDs"
+            )
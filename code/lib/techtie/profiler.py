@@ -0,0 +1,110 @@
+import gc
+import time
+
+_mem_free = getattr(gc, "mem_free", None)  # Fehlt am PC
+
+
+class Profiler:
+    """Rechenzeit und Heap-Verbrauch einzelner Abschnitte der Hauptschleife
+
+    Gemessen wird nur, solange ``enabled`` gesetzt ist - ausgeschaltet kostet
+    ein Abschnitt zwei Methodenaufrufe. Jeder Abschnitt hat eine feste
+    Nummer (Index in ``sections``), die Zähler liegen in Listen, die schon
+    beim Anlegen ihre volle Größe haben (Abschnitte nicht verschachteln)::
+
+        start = profiler.start()
+        ...
+        profiler.stop(RENDER, start)
+
+    Neben der Zeit (``time.monotonic_ns()``, für µs-Auflösung) wird
+    ``gc.mem_free()`` vor und nach dem Abschnitt gelesen: sinkt der freie
+    Heap, hat der Abschnitt so viele Bytes angelegt. Die großen Ganzzahlen
+    der Zeitmessung entstehen außerhalb dieser beiden Lesungen und zählen
+    nicht mit; ausgeschaltet liest der Profiler gar keine Zeit. Räumt
+    zwischendurch die Speicherbereinigung auf, zählt dieser Aufruf nicht.
+    ``report()`` stößt außerdem eine volle Speicherbereinigung an und misst,
+    wie lange sie dauert - so lange würde die Animation stocken, wenn sie
+    von selbst losläuft.
+    """
+
+    def __init__(self, sections):
+        self.sections = sections
+        self.enabled = False
+        count = len(sections)
+        self.calls = [0] * count
+        self.total_ns = [0] * count
+        self.max_ns = [0] * count
+        self.allocated = [0] * count   # Angelegte Bytes (nur mit gc.mem_free)
+        self.allocating = [0] * count  # Aufrufe, die etwas angelegt haben
+        self._free = 0
+
+    def start(self):
+        """Beginn eines Abschnitts; Rückgabewert an stop() weitergeben"""
+        if not self.enabled:
+            return None
+        start = time.monotonic_ns()
+        if _mem_free is not None:
+            self._free = _mem_free()
+        return start
+
+    def stop(self, section, start):
+        """Ende des Abschnitts Nummer ``section``"""
+        if start is None or not self.enabled:
+            return
+        free = _mem_free() if _mem_free is not None else 0
+        elapsed = time.monotonic_ns() - start
+        if _mem_free is not None:
+            used = self._free - free
+            if used > 0:
+                self.allocated[section] += used
+                self.allocating[section] += 1
+        self.calls[section] += 1
+        self.total_ns[section] += elapsed
+        if elapsed > self.max_ns[section]:
+            self.max_ns[section] = elapsed
+
+    def wrap(self, section, task):
+        """Task für den Scheduler, der ``task`` als Abschnitt ``section`` misst"""
+        def profiled(now):
+            start = self.start()
+            result = task(now)
+            self.stop(section, start)
+            return result
+        return profiled
+
+    def reset(self):
+        for values in (self.calls, self.total_ns, self.max_ns, self.allocated,
+                       self.allocating):
+            for i in range(len(values)):
+                values[i] = 0
+
+    def collect(self):
+        """Volle Speicherbereinigung: (Dauer in ms, freigegebene Bytes oder None)"""
+        before = _mem_free() if _mem_free is not None else None
+        start = time.monotonic_ns()
+        gc.collect()
+        elapsed = (time.monotonic_ns() - start) / 1_000_000
+        if before is None:
+            return elapsed, None
+        return elapsed, _mem_free() - before
+
+    def report(self, log=print):
+        """Gibt die Abschnitte und eine gemessene Speicherbereinigung aus und
+        setzt die Zähler zurück (standardmäßig per print)"""
+        for i, name in enumerate(self.sections):
+            calls = self.calls[i]
+            if not calls:
+                continue
+            line = (f"Profil {name}: {calls}x, mittel {self.total_ns[i] / calls / 1000:.0f} µs, "
+                    f"max {self.max_ns[i] / 1000:.0f} µs")
+            if _mem_free is not None:
+                line += (f", {self.allocated[i] / calls:.0f} Bytes/Aufruf "
+                         f"({self.allocating[i]} Aufrufe mit Speicherbedarf)")
+            log(line)
+        pause, freed = self.collect()
+        if freed is None:
+            log(f"Speicherbereinigung: {pause:.1f} ms")
+        else:
+            log(f"Speicherbereinigung: {pause:.1f} ms, {freed} Bytes freigegeben, "
+                f"frei {_mem_free()} Bytes")
+        self.reset()
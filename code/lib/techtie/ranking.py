@@ -0,0 +1,167 @@
+from array import array
+
+
+class TopK:
+    """Behält von einem Scan nur die ``k`` stärksten Netzwerke
+
+    Die Ergebnisse kommen einzeln aus dem Scan-Iterator (``add()``), es
+    wird keine Liste aller Netzwerke aufgebaut und nichts sortiert: Die
+    Einträge stehen in vorab angelegten Arrays, stärkstes Signal zuerst.
+    Ein neues Netzwerk wird an seinen Platz geschoben und verdrängt das
+    schwächste; alles, was schwächer als der letzte Platz ist, kostet nur
+    einen Vergleich. Der Speicher hängt also nur von ``k`` ab, nicht davon,
+    wie viele Netzwerke der Scan findet.
+
+    Schneller ist das nicht: am PC braucht TopK bei 10 und 100 Netzwerken
+    zwei- bis viermal so lange wie Sammeln und ``sort()``, erst bei 1000
+    ist es vorn (``host/bench.py``). Es lohnt sich nur für unsortierte
+    Scan-Ergebnisse mit unbekannter Anzahl; ist die Eingabe schon sortiert
+    (``NetworkTable.order``), reichen die ersten ``k`` Einträge.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.count = 0
+        self.seen = 0               # Netzwerke seit clear(), auch die verworfenen
+        self.rssi = array("b", [0] * k)
+        self.channel = bytearray(k)
+        self.ssid = [""] * k
+        self.bssid = [None] * k
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Leert die Auswahl für den nächsten Scan"""
+        for i in range(self.count):
+            self.ssid[i] = ""
+            self.bssid[i] = None
+        self.count = 0
+        self.seen = 0
+
+    def add(self, network):
+        """Übernimmt ein Scan-Ergebnis (``wifi.Network``); gibt den Platz zurück (oder -1)"""
+        rssi = network.rssi
+        if self.count >= self.k and rssi <= self.rssi[self.k - 1]:
+            # Schwächer als der letzte Platz: der häufigste Fall bei vielen Netzwerken
+            self.seen += 1
+            return -1
+        return self.insert(rssi, network.channel, network.bssid, network.ssid)
+
+    def insert(self, rssi, channel, bssid, ssid):
+        """Wie ``add()``, aber mit einzelnen Werten; gibt den Platz zurück (oder -1)"""
+        self.seen += 1
+        k = self.k
+        count = self.count
+        values = self.rssi
+        if count >= k and rssi <= values[k - 1]:
+            return -1
+        pos = count if count < k else k - 1
+        # Dasselbe Netzwerk schon drin (z.B. doppelt gemeldet): das stärkere behalten
+        if bssid is not None:
+            for i in range(count):
+                if self.bssid[i] == bssid:
+                    if rssi <= values[i]:
+                        return -1
+                    pos = i
+                    count -= 1
+                    break
+        if count < k:
+            self.count = count + 1
+        # Nach vorne schieben, bis der Vorgänger mindestens so stark ist
+        while pos > 0 and values[pos - 1] < rssi:
+            values[pos] = values[pos - 1]
+            self.channel[pos] = self.channel[pos - 1]
+            self.ssid[pos] = self.ssid[pos - 1]
+            self.bssid[pos] = self.bssid[pos - 1]
+            pos -= 1
+        values[pos] = rssi
+        self.channel[pos] = channel
+        self.ssid[pos] = ssid
+        self.bssid[pos] = bssid
+        return pos
+
+
+class RankHysteresis:
+    """Ordnet Netzwerke festen LEDs zu und tauscht nur bei deutlichem Abstand
+
+    Bei reiner Sortierung springen zwei fast gleich starke Netzwerke bei
+    jedem Scan zwischen zwei LEDs hin und her. Hier bleibt jedes Netzwerk
+    auf seiner LED, bis ein anderes um mehr als ``margin`` dB stärker ist;
+    das gilt auch für ein neues Netzwerk, das eins der angezeigten
+    verdrängen würde. Verglichen wird mit jedem Netzwerk weiter vorn, nicht
+    nur mit dem direkten Nachbarn: Von C (-54), B (-52), A (-50) übernimmt A
+    bei 3 dB Abstand die LED von C, obwohl es B nicht schlägt; B bleibt.
+
+    ``update()`` bekommt die Kandidaten als parallele Folgen (z.B. die
+    Arrays von ``TopK``), danach zeigt LED ``i`` den Kandidaten
+    ``order[i]`` für ``i < shown``. Damit ein knapp abgerutschtes Netzwerk
+    seine LED behalten kann, sollte es mehr Kandidaten als LEDs geben.
+    """
+
+    def __init__(self, leds, margin, candidates=None):
+        if candidates is None:
+            candidates = leds * 2
+        self.leds = leds
+        self.margin = margin
+        self.shown = 0
+        self.changes = 0                        # LEDs, die ein anderes Netzwerk bekommen haben
+        self.keys = [None] * leds               # Angezeigtes Netzwerk (BSSID) je LED
+        self.order = array("H", [0] * candidates)
+        self._used = bytearray(candidates)
+
+    def update(self, keys, values, count):
+        """Neue Kandidaten (``keys`` und ``values`` in dBm, ``count`` Stück);
+        gibt die Anzahl belegter LEDs zurück"""
+        count = min(count, len(self.order))
+        order = self.order
+        used = self._used
+        for c in range(count):
+            used[c] = 0
+        # Bisher angezeigte Netzwerke in ihrer bisherigen Reihenfolge, dann
+        # die übrigen Kandidaten in ihrer Rangfolge
+        n = 0
+        for led in range(self.shown):
+            key = self.keys[led]
+            for c in range(count):
+                if not used[c] and keys[c] == key:
+                    used[c] = 1
+                    order[n] = c
+                    n += 1
+                    break
+        for c in range(count):
+            if not used[c]:
+                order[n] = c
+                n += 1
+
+        # Selection Sort mit Abstand: ein Platz behält sein Netzwerk, solange
+        # keins der folgenden um mehr als margin dB stärker ist; sonst
+        # übernimmt ihn das stärkste davon und tauscht mit dem verdrängten.
+        # Danach ist kein Netzwerk mehr als margin dB stärker als eins davor.
+        margin = self.margin
+        for i in range(n - 1):
+            best = i
+            for j in range(i + 1, n):
+                if values[order[j]] > values[order[best]]:
+                    best = j
+            if values[order[best]] - margin > values[order[i]]:
+                c = order[i]
+                order[i] = order[best]
+                order[best] = c
+
+        shown = min(n, self.leds)
+        for led in range(shown):
+            key = keys[order[led]]
+            if led >= self.shown or self.keys[led] != key:
+                self.changes += 1
+                self.keys[led] = key
+        for led in range(shown, self.shown):
+            self.keys[led] = None
+        self.shown = shown
+        return shown
+
+    def clear(self):
+        """Vergisst die Zuordnung"""
+        for led in range(self.leds):
+            self.keys[led] = None
+        self.shown = 0
@@ -0,0 +1,215 @@
+import struct
+
+# Befehle (Textzeilen, z.B. aus dem UART-Terminal von Bluefruit Connect)
+MODE = "M"        # M2        Modus 2
+BRIGHTNESS = "B"  # B30       Helligkeit 30 %
+TARGET = "T"      # TGastnetz nur dieses Netzwerk anzeigen, "T" allein = alle
+
+# Nachrichten an das Handy: Art (1 Byte), Länge der Nutzdaten (1 Byte), Nutzdaten
+ACK = 0x41        # "A" <BB    Befehl, 1 = ausgeführt / 0 = ungültig
+SCAN = 0x57       # "W" <BB    laufende Nummer, Anzahl Netzwerke, dann je
+                  #     <bB6sB RSSI, Kanal, BSSID, Länge der SSID, dann die SSID
+
+_HEADER = "<BB"
+_ENTRY = "<bB6sB"
+
+
+def start_ble(name):
+    """BleRemote mit dem Nordic-UART-Dienst; None, wo das Board kein Bluetooth hat"""
+    try:
+        from adafruit_ble import BLERadio
+        from adafruit_ble.advertising.standard import ProvideServicesAdvertisement
+        from adafruit_ble.services.nordic import UARTService
+    except ImportError as e:
+        print(f"Bluetooth nicht verfügbar: {e}")
+        return None
+    radio = BLERadio()
+    radio.name = name
+    uart = UARTService()
+    return BleRemote(radio, uart, ProvideServicesAdvertisement(uart))
+
+
+class BleRemote:
+    """Fernsteuerung über Bluetooth LE (Nordic-UART-Dienst)
+
+    Befehle kommen als Textzeilen (``M2``, ``B30``, ``TGastnetz``) und
+    werden an ``on_command(befehl, wert)`` weitergereicht; gibt der Aufruf
+    True zurück, quittiert die Fernsteuerung mit 1, sonst mit 0.
+
+    Die Netzwerk-Tabelle (``table``) geht bei jeder Änderung als eine
+    binäre Nachricht raus - höchstens ``limit`` Netzwerke, mit ``target``
+    nur die mit dieser SSID. Die Nachricht wird in Pakete zu ``packet``
+    Bytes zerlegt (eine Notification pro Paket), ein Aufruf sendet höchstens
+    ``burst`` davon und nie kurz vor einem Frame (``clock``). Ist die
+    vorige Nachricht noch nicht ganz draußen, wartet die nächste; es geht
+    also immer nur der neueste Stand raus.
+
+    Als Task für den Scheduler gedacht. Ohne Verbindung wirbt er nur
+    (Advertising) und sieht alle ``idle`` Sekunden nach, ob sich ein Handy
+    verbunden hat.
+    """
+
+    def __init__(self, radio, uart, advertisement, limit=8, packet=20, burst=2,
+                 clock=None, min_gap=0.01, size=512, idle=0.5):
+        self.radio = radio
+        self.uart = uart
+        self.advertisement = advertisement
+        self.limit = limit
+        self.packet = packet
+        self.burst = burst
+        self.clock = clock
+        self.min_gap = min_gap
+        self.idle = idle
+        self.on_command = None      # on_command(befehl, wert) -> True, wenn gültig
+        self.table = None           # NetworkTable, sobald der WLAN-Teil geladen ist
+        self.target = None          # SSID, auf die sich die Scan-Nachrichten beschränken
+        self.commands = 0
+        self.messages = 0
+        self.notifications = 0
+        self.connections = 0
+        self._connected = False
+        self._line = bytearray(64)
+        self._length = 0            # Bytes in _line
+        self._out = bytearray(size)
+        self._used = 0              # Bytes in _out
+        self._sent = 0              # Davon schon gesendet
+        self._digest = None
+        self._seq = 0
+
+    def __call__(self, now):
+        if not self.radio.connected:
+            if self._connected:
+                self._connected = False
+                self._reset()
+            if not self.radio.advertising:
+                self.radio.start_advertising(self.advertisement)
+            return self.idle
+        if not self._connected:
+            self._connected = True
+            self.connections += 1
+            self._reset()
+
+        self._receive()
+        if self._sent >= self._used:
+            self._used = self._sent = 0
+            self._publish()
+        if self._used and self.clock is not None and self.clock.remaining() < self.min_gap:
+            return self.clock.remaining()
+        self._send()
+        return None
+
+    def _reset(self):
+        self._length = 0
+        self._used = self._sent = 0
+        self._digest = None   # Nach dem Verbinden den vollen Stand schicken
+
+    def _receive(self):
+        waiting = self.uart.in_waiting
+        while waiting:
+            if self._length >= len(self._line):
+                self._length = 0   # Zeile zu lang: verwerfen
+            space = len(self._line) - self._length
+            count = self.uart.readinto(memoryview(self._line)[self._length:],
+                                       min(waiting, space))
+            if not count:
+                return
+            waiting -= count
+            self._length += count
+            self._split()
+
+    def _split(self):
+        # Vollständige Zeilen ausführen, den Rest nach vorne schieben
+        line = self._line
+        start = 0
+        for i in range(self._length):
+            if line[i] == 10 or line[i] == 13:
+                if i > start:
+                    self._execute(bytes(line[start:i]))
+                start = i + 1
+        if start:
+            rest = self._length - start
+            line[:rest] = line[start:self._length]
+            self._length = rest
+
+    def _execute(self, line):
+        self.commands += 1
+        command = chr(line[0]).upper()
+        ok = False
+        try:
+            value = line[1:].decode().strip()
+            if command == TARGET:
+                ok = self._call(command, value or None)
+                self._digest = None   # Auswahl geändert: neu schicken
+            elif command in (MODE, BRIGHTNESS):
+                ok = self._call(command, int(value))
+        except ValueError:
+            pass   # Keine Zahl oder kein gültiges UTF-8
+        self._message(ACK, struct.pack("<BB", ord(command) & 0xFF, 1 if ok else 0))
+
+    def _call(self, command, value):
+        if self.on_command is None:
+            return False
+        return bool(self.on_command(command, value))
+
+    def _publish(self):
+        table = self.table
+        if table is None:
+            return
+        target = self.target
+        digest = table.digest(self.limit, target)
+        if digest == self._digest:
+            return
+        self._digest = digest
+
+        out = self._out
+        pos = 2 + struct.calcsize(_HEADER)
+        entry = struct.calcsize(_ENTRY)
+        end = min(len(out), 2 + 255)   # Länge der Nutzdaten passt in ein Byte
+        written = 0
+        for i in range(table.count):
+            if written >= self.limit:
+                break
+            slot = table.order[i]
+            ssid = table.ssid[slot]
+            if target is not None and ssid != target:
+                continue
+            name = ssid.encode()[:32]
+            if pos + entry + len(name) > end:
+                break   # Passt nicht mehr in eine Nachricht
+            struct.pack_into(_ENTRY, out, pos, table.rssi(slot), table.channel[slot],
+                             bytes(table.bssid[slot] or b""), len(name))
+            pos += entry
+            out[pos:pos + len(name)] = name
+            pos += len(name)
+            written += 1
+        self._seq = (self._seq + 1) & 0xFF
+        struct.pack_into(_HEADER, out, 0, SCAN, pos - 2)
+        struct.pack_into(_HEADER, out, 2, self._seq, written)
+        self._used = pos
+        self.messages += 1
+
+    def _message(self, kind, payload):
+        # Quittungen hinten anhängen; passt nichts mehr, geht sie verloren
+        end = self._used + 2 + len(payload)
+        if end > len(self._out):
+            return
+        struct.pack_into(_HEADER, self._out, self._used, kind, len(payload))
+        self._out[self._used + 2:end] = payload
+        self._used = end
+
+    def _send(self):
+        for _ in range(self.burst):
+            if self._sent >= self._used:
+                return
+            end = min(self._used, self._sent + self.packet)
+            self.uart.write(memoryview(self._out)[self._sent:end])
+            self._sent = end
+            self.notifications += 1
+
+    def report(self, log=print):
+        """Gibt aus, was über Bluetooth gelaufen ist (standardmäßig per print)"""
+        state = "verbunden" if self._connected else "wartet auf Verbindung"
+        log(
+            f"Bluetooth ({state}): {self.connections} Verbindungen, {self.commands} Befehle, "
+            f"{self.messages} Scan-Nachrichten in {self.notifications} Paketen"
+        )
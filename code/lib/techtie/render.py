@@ -0,0 +1,353 @@
+from array import array
+
+
+class FrameEngine:
+    """Rendert Lauflicht- und Regenbogen-Frames mit vorberechneten Tabellen
+
+    Beim Start werden Fade-Kurve, Farbmischung und Farbrad einmal in
+    Bytetabellen "eingebacken". Pro Frame bleiben dann nur noch Ganzzahl-
+    Rechnungen und Tabellenzugriffe übrig, die direkt in ``buf`` schreiben -
+    ohne ``math.exp``, Fließkomma oder neue Tupel.
+
+    ``fade(position, pixel_position)``, ``blend(color1, color2, amount)`` und
+    ``wheel(pos)`` sind die bekannten Funktionen aus ``code.py``; sie werden
+    nur beim Vorberechnen aufgerufen, deshalb sieht das Ergebnis genauso aus.
+
+    Auf langen Streifen wächst der Aufwand kaum mit der Länge: das Lauflicht
+    löscht das Frame am Stück und rechnet nur die LEDs in Reichweite des
+    Lichtpunkts, der Regenbogen (ab ``LONG_STRIP`` LEDs) ist ein Ausschnitt
+    aus einem vorberechneten, doppelt langen Streifen.
+
+    Mit ``set_gamma()`` stecken auch Helligkeit und Gamma in den Tabellen,
+    die Frames kommen dann schon fertig für die NeoPixels heraus - ohne
+    einen weiteren Durchgang pro Byte.
+    """
+
+    LONG_STRIP = 256  # Ab hier Regenbogen als Ausschnitt statt pro LED
+
+    def __init__(self, num_pixels, fade, blend, wheel, steps=10):
+        self.num_pixels = num_pixels
+        self.steps = steps                 # Zwischenschritte pro LED (10 = position += 0.1)
+        self.period = num_pixels * steps   # Schritte für eine volle Runde
+        self.step = 0                      # Position des Lauflichts in Schritten
+        self.buf = bytearray(num_pixels * 3)
+        self.gamma = None                  # Eingebackene GammaTable (None = Rohwerte)
+
+        self._fade = fade
+        self._blend = blend
+        self._half = self.period // 2      # Größter Abstand (kreisförmig)
+        self._reach = self._find_reach()   # Größter Abstand, der noch leuchtet
+        self._shade_colors = []            # Grundfarben, für die es Fade-Zeilen gibt
+        self._shades = bytearray()         # Pro Grundfarbe: Farbe für jeden Abstand
+        self._black = bytes(num_pixels * 3)
+
+        # Farbrad: 256 Farben hintereinander als R, G, B
+        wheel_raw = bytearray(256 * 3)
+        for pos in range(256):
+            wheel_raw[pos * 3:pos * 3 + 3] = bytes(wheel(pos))
+        self._wheel = bytearray(wheel_raw)
+        # Rohwerte und die daraus korrigierten Tabellen für set_gamma()
+        self._shades_raw = bytearray()
+        self._tables = [(wheel_raw, self._wheel), (self._shades_raw, self._shades)]
+        # Regenbogen-Startposition jeder LED
+        self._rainbow = bytearray(i * 256 // num_pixels for i in range(num_pixels))
+        self._strip = None
+        if num_pixels >= self.LONG_STRIP:
+            # Regenbogen zweimal hintereinander: jedes Frame ist ein Ausschnitt
+            strip = bytearray(num_pixels * 6)
+            for i in range(num_pixels * 2):
+                k = (i * 256 // num_pixels & 255) * 3
+                strip[i * 3:i * 3 + 3] = self._wheel[k:k + 3]
+            self._tables.append((bytes(strip), strip))
+            # Ein fertiger Ausschnitt pro Offset, damit render_rainbow()
+            # keine neue memoryview anlegen muss
+            view = memoryview(strip)
+            size = num_pixels * 3
+            self._strip = []
+            for offset in range(256):
+                start = (offset * num_pixels >> 8) * 3
+                self._strip.append(view[start:start + size])
+
+    def _find_reach(self):
+        # Ab diesem Abstand bleibt selbst Weiß bei voller Helligkeit schwarz
+        white = (255, 255, 255)
+        for distance in range(self._half + 1):
+            amount = self._fade(distance / self.steps, 0)
+            if self._blend((0, 0, 0), white, amount) == (0, 0, 0):
+                return distance - 1
+        return self._half
+
+    def palette(self, colors):
+        """Bereitet eine Liste von Grundfarben (eine pro LED) für render_fade() vor"""
+        rows = []
+        for color in colors:
+            color = tuple(color)
+            if color not in self._shade_colors:
+                self._add_shade(color)
+            rows.append(self._shade_colors.index(color) * (self._reach + 1) * 3)
+        return rows
+
+    def _add_shade(self, color):
+        # Fertig gemischte Farbe für jeden Abstand bis zur Reichweite
+        row = bytearray((self._reach + 1) * 3)
+        for distance in range(self._reach + 1):
+            amount = self._fade(distance / self.steps, 0)
+            row[distance * 3:distance * 3 + 3] = bytes(self._blend((0, 0, 0), color, amount))
+        self._shade_colors.append(color)
+        self._shades_raw.extend(row)
+        if self.gamma is not None:
+            self.gamma.apply(row, row)
+        self._shades.extend(row)
+
+    def set_gamma(self, gamma):
+        """Backt eine GammaTable in die Tabellen ein (None = wieder Rohwerte);
+        nach jedem ``gamma.set_brightness()`` erneut aufrufen"""
+        self.gamma = gamma
+        for raw, table in self._tables:
+            if gamma is None:
+                table[:] = raw
+            else:
+                gamma.apply(raw, table)
+
+    def render_fade(self, palette):
+        """Lauflicht: jede LED leuchtet je nach Abstand zum Lichtpunkt"""
+        buf = self.buf
+        shades = self._shades
+        step = self.step
+        steps = self.steps
+        period = self.period
+        half = self._half
+        reach = self._reach
+        num_pixels = self.num_pixels
+        first = (step - reach) // steps        # Erste LED in Reichweite (evtl. < 0)
+        last = (step + reach) // steps         # Letzte LED in Reichweite
+        if last - first + 1 < num_pixels:
+            # Alles schwarz, dann nur die LEDs um den Lichtpunkt
+            buf[:] = self._black
+            stop = last + 1
+        else:
+            first = 0
+            stop = num_pixels
+        # range() direkt im for, sonst legt MicroPython ein range-Objekt an
+        for n in range(first, stop):
+            i = n % num_pixels
+            distance = step - i * steps
+            if distance < 0:
+                distance = -distance
+            # Kreisförmige Distanz (Übergang vom Ende zurück zum Anfang)
+            if distance > half:
+                distance = period - distance
+            j = i * 3
+            if distance > reach:
+                buf[j] = 0
+                buf[j + 1] = 0
+                buf[j + 2] = 0
+                continue
+            k = palette[i] + distance * 3
+            buf[j] = shades[k]
+            buf[j + 1] = shades[k + 1]
+            buf[j + 2] = shades[k + 2]
+
+    def render_rainbow(self, offset):
+        """Regenbogen: jede LED bekommt ihre Farbe direkt aus dem Farbrad"""
+        buf = self.buf
+        if self._strip is not None:
+            # Langer Streifen: um offset/256 der Länge verschobener Ausschnitt
+            # (höchstens eine Farbrad-Stufe Unterschied zur Rechnung pro LED)
+            buf[:] = self._strip[offset & 255]
+            return
+        table = self._wheel
+        rainbow = self._rainbow
+        j = 0
+        for i in range(self.num_pixels):
+            k = ((rainbow[i] + offset) & 255) * 3
+            buf[j] = table[k]
+            buf[j + 1] = table[k + 1]
+            buf[j + 2] = table[k + 2]
+            j += 3
+
+
+class CrossFade:
+    """Überblendet beim Moduswechsel vom alten in den neuen Modus
+
+    Beide Modi laufen während der Überblendung weiter: das Frame des alten
+    Modus wird nach ``old`` kopiert, das des neuen mit ``blend()`` darüber
+    gemischt. Gerechnet wird nur mit Ganzzahlen (Gewicht 0-256) in zwei
+    vorab angelegten Puffern, pro Frame entsteht kein neues Objekt.
+    """
+
+    def __init__(self, num_pixels, frames=10):
+        self.frames = frames              # Dauer der Überblendung in Frames
+        self.source = None                # Alter Modus, solange überblendet wird
+        self.old = bytearray(num_pixels * 3)
+        self.buf = bytearray(num_pixels * 3)
+        self._left = 0                    # Verbleibende Frames
+
+    @property
+    def active(self):
+        return self._left > 0
+
+    def start(self, source):
+        """Beginnt eine Überblendung vom Modus ``source`` (eine laufende
+        Überblendung beginnt von vorn)"""
+        if self.frames <= 0:
+            return
+        self.source = source
+        self._left = self.frames
+
+    def blend(self, new, frames=1):
+        """Mischt ``new`` über ``old``; ``frames`` = vergangene Frame-Perioden.
+        Gibt ``buf`` zurück bzw. ``new``, sobald die Überblendung vorbei ist"""
+        left = self._left - frames
+        if left <= 0:
+            self._left = 0
+            self.source = None
+            return new
+        self._left = left
+        weight = (self.frames - left) * 256 // self.frames
+        keep = 256 - weight
+        old = self.old
+        buf = self.buf
+        for i in range(len(buf)):
+            buf[i] = (old[i] * keep + new[i] * weight) >> 8
+        return buf
+
+
+class GammaTable:
+    """Helligkeit und Gammakorrektur als Tabelle mit 256 Einträgen
+
+    Statt den NeoPixel-Treiber bei jedem ``show()`` jeden Farbwert mit einer
+    Fließkomma-Helligkeit multiplizieren zu lassen (er läuft mit
+    ``brightness=1.0``), wird die Tabelle möglichst schon beim Vorberechnen
+    angewendet: in den Tabellen der ``FrameEngine``, in den Frame-Banks und
+    in den Signalfarben. Nur was pro Frame live entsteht, geht mit
+    ``apply()`` Byte für Byte durch die Tabelle. ``set_brightness()`` baut
+    nur die Tabelle neu; wer sie eingebacken hat, muss neu vorberechnen.
+
+    ``wide`` enthält dieselben Werte mit 8 Nachkommabits (mal 256) für
+    ``TemporalDither``.
+    """
+
+    def __init__(self, brightness=1.0, gamma=1.0):
+        self.gamma = gamma
+        self.brightness = brightness
+        self.table = bytearray(256)
+        self.wide = array("H", [0] * 256)
+        self.set_brightness(brightness)
+
+    def set_brightness(self, brightness):
+        """Neue Helligkeit (0.0 bis 1.0), wirkt ab dem nächsten Frame"""
+        brightness = max(0.0, min(1.0, brightness))
+        self.brightness = brightness
+        scale = brightness * 255
+        for value in range(256):
+            exact = (value / 255) ** self.gamma * scale
+            # Gerundet statt abgeschnitten, damit dunkle Ausläufer Stufen behalten
+            self.table[value] = int(exact + 0.5)
+            self.wide[value] = min(0xFF00, int(exact * 256 + 0.5))
+
+    def apply(self, src, dst):
+        """Schreibt ``src`` korrigiert nach ``dst`` (gleich lang, ohne neue Objekte)"""
+        table = self.table
+        for i in range(len(dst)):
+            dst[i] = table[src[i]]
+
+
+class TemporalDither:
+    """Zeitliches Dithering: mehr als 8 Bit Farbtiefe auf 8-Bit-NeoPixels
+
+    Bei geringer Helligkeit fallen nach der Gamma-Tabelle viele Eingangswerte
+    auf dieselbe 8-Bit-Stufe, ein Lauflicht läuft in den dunklen Ausläufern
+    sichtbar in Stufen aus. Hier wird jeder Kanal mit 8 Nachkommabits aus
+    ``GammaTable.wide`` geholt und in einem 16-Bit-Akkumulator aufaddiert:
+    gesendet werden die oberen 8 Bit, der Rest bleibt für das nächste Frame
+    stehen. Über einige Frames gemittelt trifft jede LED so den genauen
+    Wert, z.B. 0.25 als eine 1 in jedem vierten Frame.
+
+    Pro Kanal ein Tabellenzugriff, eine Addition und zwei Bit-Operationen,
+    ohne neue Objekte. Dithering braucht laufende Frames; steht das Bild
+    (Animation pausiert), bleibt die zuletzt gesendete Stufe stehen.
+    """
+
+    def __init__(self, size, gamma):
+        self.gamma = gamma
+        self.exact = True               # Letztes Frame ohne Nachkommastellen
+        self._error = bytearray(size)   # Übertrag (Nachkommabits) je Kanal
+
+    def apply(self, src, dst):
+        """Schreibt ``src`` korrigiert und gedithert nach ``dst`` (gleich lang)"""
+        table = self.gamma.wide
+        error = self._error
+        fraction = 0
+        for i in range(len(dst)):
+            value = table[src[i]]
+            fraction |= value
+            value += error[i]
+            dst[i] = value >> 8
+            error[i] = value & 0xFF
+        self.exact = not fraction & 0xFF
+
+    def reset(self):
+        """Vergisst die Überträge"""
+        error = self._error
+        for i in range(len(error)):
+            error[i] = 0
+
+
+class PixelOutput:
+    """Schickt ein Frame nur dann an die NeoPixels, wenn es sich geändert hat
+
+    Die Übertragung an den Streifen (``pixels.show()``) kostet bei jedem Aufruf
+    gleich viel Zeit, auch wenn dieselben Farben noch einmal gesendet werden.
+    ``show(buf)`` vergleicht deshalb zuerst mit dem zuletzt gesendeten Frame.
+    Normalerweise sind die Frames schon korrigiert (Tabelle eingebacken).
+    Mit ``gamma`` (GammaTable) wird ein geändertes Frame hier noch einmal
+    Byte für Byte durch die Tabelle geschickt, mit ``dither`` durch ein
+    ``TemporalDither``; dann wird auch ein unverändertes Frame weiter
+    gesendet, solange es Nachkommastellen hat - erst der Wechsel über die
+    Frames ergibt die feineren Stufen.
+    """
+
+    def __init__(self, pixels, num_pixels, gamma=None, dither=False):
+        self.pixels = pixels
+        self.gamma = gamma
+        self.dither = None
+        if dither and gamma is not None:
+            self.dither = TemporalDither(num_pixels * 3, gamma)
+        self.shown = 0       # Tatsächlich gesendete Frames
+        self.unchanged = 0   # Übersprungene, weil unverändert
+        self._last = bytearray(num_pixels * 3)
+        self._out = bytearray(num_pixels * 3) if gamma is not None else self._last
+        self._valid = False
+
+    def show(self, buf):
+        """Sendet ``buf`` (R, G, B je LED, auch als memoryview); gibt True zurück,
+        wenn gesendet wurde"""
+        dither = self.dither
+        if self._valid and self._last == buf and (dither is None or dither.exact):
+            self.unchanged += 1
+            return False
+        self._last[:] = buf
+        self._valid = True
+        if dither is not None:
+            dither.apply(self._last, self._out)
+        elif self.gamma is not None:
+            self.gamma.apply(self._last, self._out)
+        self.pixels[:] = self._out
+        self.pixels.show()
+        self.shown += 1
+        return True
+
+    @property
+    def sent(self):
+        """Zuletzt gesendete Daten, so wie sie an die NeoPixels gingen"""
+        return self._out
+
+    def set_brightness(self, brightness):
+        """Ändert die Helligkeit der GammaTable und sendet das Frame neu"""
+        self.gamma.set_brightness(brightness)
+        self._valid = False
+
+    def report(self, log=print):
+        """Gibt die Zähler aus (standardmäßig per print)"""
+        log(f"Frames gesendet: {self.shown}, unverändert übersprungen: {self.unchanged}")
@@ -0,0 +1,79 @@
+import time
+
+from techtie.logbuf import LogFile, bssid_hex, one_line
+
+
+def mount_sd(spi, cs, path="/sd"):
+    """Hängt eine SD-Karte unter ``path`` ein; False, wenn das nicht klappt"""
+    try:
+        import sdcardio
+        import storage
+
+        card = sdcardio.SDCard(spi, cs)
+        storage.mount(storage.VfsFat(card), path)
+        return True
+    except (ImportError, OSError) as e:
+        print(f"SD-Karte nicht verfügbar: {e}")
+        return False
+
+
+class ScanLog(LogFile):
+    """Schreibt den Scan-Verlauf gesammelt als CSV auf die SD-Karte
+
+    Jeder Scan landet zuerst in einem Ringpuffer im RAM, eine Zeile pro
+    Netzwerk::
+
+        zeit_s,ort,kanal,rssi,bssid,ssid
+
+    ``ort`` ist ein Zähler, den man z.B. beim Weitergehen hochsetzt
+    (``next_place()``), damit das Auswertetool ``host/scan_history.py`` eine
+    Karte pro Ort zeichnen kann. Eine Zeile ``#start`` markiert jeden
+    Neustart, ab dort zählt ``zeit_s`` die Sekunden seit dem Anlegen des
+    Logs und beginnt also wieder bei 0. Zeilenumbrüche in
+    einer SSID werden zu Leerzeichen, damit jede Messung eine Zeile bleibt.
+
+    Geschrieben wird wie bei jedem ``LogFile`` nur selten, in großen Stücken
+    und nie kurz vor einem Frame; bei Stromausfall geht höchstens die
+    letzte, halbe Zeile verloren.
+    """
+
+    def __init__(self, path, size=8192, flush_every=60, clock=None, min_gap=0.02, log=print):
+        super().__init__(path, size, flush_every, clock, min_gap, log)
+        self.place = 0                  # Aktueller Ort
+        self.records = 0                # Geschriebene Zeilen
+        self._lines = 0                 # Zeilen im Puffer
+        self._start = time.monotonic()  # zeit_s = 0
+        self._line("#start")
+
+    def next_place(self):
+        """Nächster Ort: alle folgenden Messungen gehören dorthin"""
+        self.place += 1
+        return self.place
+
+    def add(self, now, channel, rssi, bssid, ssid):
+        """Merkt sich eine einzelne Messung (``now`` von ``time.monotonic()``)"""
+        self._line(f"{now - self._start:.1f},{self.place},{channel},{rssi},"
+                   f"{bssid_hex(bssid)},{one_line(ssid)}")
+
+    def record(self, table, now):
+        """Merkt sich alle Netzwerke einer NetworkTable (z.B. nach jedem Scan)"""
+        for i in range(table.count):
+            slot = table.order[i]
+            self.add(now, table.channel[slot], table.rssi(slot), table.bssid[slot],
+                     table.ssid[slot])
+
+    def _line(self, line):
+        if self._push((line + "\n").encode()):
+            self._lines += 1
+
+    def _written(self):
+        self.records += self._lines
+        self._lines = 0
+
+    def report(self, log=print):
+        """Gibt aus, wie viel geschrieben und verworfen wurde (standardmäßig per print)"""
+        state = "aktiv" if self.enabled else "abgeschaltet"
+        log(
+            f"SD-Log ({state}): {self.records} Zeilen in {self.flushes} Schreibvorgängen, "
+            f"{self.pending} Bytes im Puffer, {self.dropped} verworfen, Ort {self.place}"
+        )
@@ -0,0 +1,86 @@
+MIN_DBM = -100  # Schwächster Wert in der Tabelle
+MAX_DBM = 0     # Stärkster Wert in der Tabelle
+
+
+class SignalClassifier:
+    """Ordnet Signalstärken (dBm) über vorberechnete Tabellen Stufe und Farbe zu
+
+    Beim Anlegen wird für jeden Wert von -100 bis 0 dBm einmal ausgerechnet,
+    welche Stufe und Farbe dazugehört. Danach ist jede Abfrage nur noch ein
+    Tabellenzugriff, egal wie viele Schwellwerte es gibt.
+
+    Stufe ``i`` gilt bis einschließlich ``thresholds[i]``, alles darüber ist die
+    letzte Stufe. Mit ``gradient=True`` gehen die Farben zwischen den
+    Schwellwerten fließend ineinander über statt in Stufen. Mit
+    ``set_gamma()`` schreibt ``write()`` die Farben schon mit Helligkeit und
+    Gamma korrigiert in den Frame-Puffer, ``color()`` bleibt unkorrigiert.
+    """
+
+    def __init__(self, thresholds, colors, gradient=False):
+        self.thresholds = list(thresholds)
+        self.colors = [tuple(color) for color in colors]
+        self.gradient = gradient
+        size = MAX_DBM - MIN_DBM + 1
+        self._levels = bytearray(size)
+        self._colors = []          # Farbe als Tupel für jeden dBm-Wert
+        self._raw = bytearray(size * 3)    # Dieselben Farben als R, G, B
+        for i in range(size):
+            dbm = MIN_DBM + i
+            level = self._classify(dbm)
+            color = self._interpolate(dbm) if gradient else self.colors[level]
+            self._levels[i] = level
+            self._colors.append(color)
+            self._raw[i * 3:i * 3 + 3] = bytes(color)
+        self._bytes = bytearray(self._raw) # Für write(), evtl. korrigiert
+
+    def _classify(self, dbm):
+        for i, threshold in enumerate(self.thresholds):
+            if dbm <= threshold:
+                return i
+        return len(self.colors) - 1  # Bestes Signal
+
+    def _interpolate(self, dbm):
+        # Jede Farbe sitzt auf ihrem Schwellwert, dazwischen wird gemischt
+        thresholds = self.thresholds
+        colors = self.colors
+        if dbm <= thresholds[0]:
+            return colors[0]
+        for i in range(1, min(len(thresholds), len(colors))):
+            if dbm <= thresholds[i]:
+                low = thresholds[i - 1]
+                amount = (dbm - low) / (thresholds[i] - low)
+                c1 = colors[i - 1]
+                c2 = colors[i]
+                return tuple(int(a + (b - a) * amount + 0.5) for a, b in zip(c1, c2))
+        return colors[-1]
+
+    def _index(self, dbm):
+        if dbm <= MIN_DBM:
+            return 0
+        if dbm >= MAX_DBM:
+            return MAX_DBM - MIN_DBM
+        return dbm - MIN_DBM
+
+    def level(self, dbm):
+        """Stufe (0 = sehr schwach) einer Signalstärke"""
+        return self._levels[self._index(dbm)]
+
+    def color(self, dbm):
+        """Farbe einer Signalstärke als (R, G, B)"""
+        return self._colors[self._index(dbm)]
+
+    def set_gamma(self, gamma):
+        """Backt eine GammaTable in die Farben für ``write()`` ein (None = Rohwerte)"""
+        if gamma is None:
+            self._bytes[:] = self._raw
+        else:
+            gamma.apply(self._raw, self._bytes)
+
+    def write(self, buf, pixel, dbm):
+        """Schreibt die Farbe direkt in einen Frame-Puffer (R, G, B je LED)"""
+        k = self._index(dbm) * 3
+        j = pixel * 3
+        table = self._bytes
+        buf[j] = table[k]
+        buf[j + 1] = table[k + 1]
+        buf[j + 2] = table[k + 2]
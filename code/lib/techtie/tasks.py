@@ -0,0 +1,66 @@
+import time
+
+from techtie.ticks import ticks_add, ticks_diff, ticks_ms
+
+
+class Scheduler:
+    """Einfacher kooperativer Scheduler: ruft Tasks auf, sobald sie fällig sind
+
+    Ein Task ist eine Funktion ``task(now)``. Gibt sie eine Zahl zurück, ist das
+    die Wartezeit in Sekunden bis zum nächsten Aufruf, sonst gilt das beim
+    Hinzufügen angegebene Intervall. Tasks dürfen nie lange blockieren, damit
+    die anderen (Animation, Taster) pünktlich drankommen.
+
+    Intern rechnet der Scheduler mit ``ticks_ms()`` (kleine Ganzzahlen, siehe
+    ``techtie.ticks``) und festen Deadlines, damit sich Verspätungen nicht
+    aufsummieren. Gewartet wird mit ``sleep`` (z.B. ``PowerManager.sleep``
+    statt ``time.sleep``).
+    """
+
+    def __init__(self):
+        self._tasks = []  # Einträge: [task, intervall_ms, deadline (Ticks)]
+        self.sleep = time.sleep
+
+    def add(self, task, interval=0, delay=0):
+        """Fügt einen Task hinzu, der nach ``delay`` Sekunden das erste Mal fällig ist"""
+        first = ticks_add(ticks_ms(), round(delay * 1000))
+        self._tasks.append([task, round(interval * 1000), first])
+
+    def wake(self, task):
+        """Macht einen Task sofort fällig (z.B. nach einem Moduswechsel)"""
+        for entry in self._tasks:
+            if entry[0] is task:
+                entry[2] = ticks_ms()
+
+    def run_once(self):
+        """Führt alle fälligen Tasks einmal aus"""
+        for entry in self._tasks:
+            now = ticks_ms()
+            if ticks_diff(entry[2], now) > 0:
+                continue
+            delay = entry[0](time.monotonic())
+            if delay is None:
+                # Feste Deadline fortschreiben; wer zu weit hinterher ist,
+                # setzt neu auf, statt verpasste Aufrufe nachzuholen
+                entry[2] = ticks_add(entry[2], entry[1])
+                if ticks_diff(entry[2], now) <= 0:
+                    entry[2] = ticks_add(now, entry[1])
+            else:
+                entry[2] = ticks_add(ticks_ms(), round(delay * 1000))
+
+    def next_due(self):
+        """Ticks (``ticks_ms()``), zu denen der nächste Task fällig wird"""
+        due = None
+        now = ticks_ms()
+        for entry in self._tasks:
+            if due is None or ticks_diff(entry[2], now) < ticks_diff(due, now):
+                due = entry[2]
+        return due
+
+    def run(self):
+        """Endlosschleife: Tasks ausführen und bis zum nächsten Termin schlafen"""
+        while True:
+            self.run_once()
+            delay = ticks_diff(self.next_due(), ticks_ms())
+            if delay > 0:
+                self.sleep(delay / 1000)
@@ -0,0 +1,138 @@
+import sys
+
+from techtie.logbuf import RingBuffer, bssid_hex, one_line
+
+try:
+    import usb_cdc
+except ImportError:
+    usb_cdc = None
+
+try:
+    import supervisor
+except ImportError:
+    supervisor = None
+
+# Log-Level: nur Meldungen bis einschließlich des eingestellten Levels erscheinen
+ERROR = 0
+WARNING = 1
+INFO = 2
+DEBUG = 3
+
+
+class Telemetry:
+    """Ausgaben auf der seriellen Konsole, ohne die Animation aufzuhalten
+
+    Meldungen landen zuerst in einem Ringpuffer im RAM. Der Puffer wird als
+    Task für den Scheduler in kleinen Stücken an die USB-Konsole geschickt -
+    ohne zu warten, wenn der PC gerade nichts abholt. Passt eine Meldung nicht
+    mehr in den Puffer, wird sie verworfen und in ``dropped`` gezählt.
+
+    Scan-Ergebnisse werden nur ausgegeben, wenn sie sich geändert haben. Mit
+    ``compact=True`` erscheinen sie als maschinenlesbare Zeilen, die mit ``@``
+    beginnen (siehe ``host/serial_log.py``)::
+
+        @S,<zeit_ms>,<anzahl>
+        @N,<rang>,<rssi>,<kanal>,<bssid>,<ssid>
+    """
+
+    def __init__(self, level=INFO, compact=False, size=2048, chunk=64, idle=None):
+        self.level = level
+        self.compact = compact
+        self.chunk = chunk        # Höchstens so viele Bytes pro Aufruf senden
+        self.idle = idle          # Wartezeit, wenn nichts ansteht (None = Intervall des Tasks)
+        self.dropped = 0          # Wegen vollem Puffer verworfene Meldungen
+        self.ring = RingBuffer(size)
+        self._limits = {}         # Schlüssel -> Zeitpunkt der letzten Ausgabe
+        self._scan_digest = None
+        self._serial = None
+        if usb_cdc is not None and usb_cdc.console is not None:
+            self._serial = usb_cdc.console
+            self._serial.write_timeout = 0  # Nie auf den PC warten
+
+    def log(self, level, message):
+        """Reiht eine Meldung ein, wenn ihr Level ausgegeben werden soll"""
+        if level <= self.level:
+            self._push(message)
+
+    def error(self, message):
+        self.log(ERROR, message)
+
+    def warning(self, message):
+        self.log(WARNING, message)
+
+    def info(self, message):
+        self.log(INFO, message)
+
+    def debug(self, message):
+        self.log(DEBUG, message)
+
+    def every(self, key, interval, now):
+        """True, wenn zu ``key`` seit ``interval`` Sekunden nichts ausgegeben wurde"""
+        last = self._limits.get(key)
+        if last is not None and now - last < interval:
+            return False
+        self._limits[key] = now
+        return True
+
+    def scan(self, table, count, now, force=False):
+        """Gibt die ersten ``count`` Netzwerke der Tabelle aus, falls geändert"""
+        count = min(count, table.count)
+        if not count and not force:
+            return
+        digest = table.digest(count)
+        if not force:
+            if digest == self._scan_digest:
+                return
+            self._scan_digest = digest
+
+        if self.compact:
+            self._push(f"@S,{int(now * 1000)},{count}")
+            for i in range(count):
+                slot = table.order[i]
+                self._push(
+                    f"@N,{i + 1},{table.rssi(slot)},{table.channel[slot]},"
+                    f"{bssid_hex(table.bssid[slot])},{one_line(table.ssid[slot])}"
+                )
+        elif INFO <= self.level or force:
+            self._push("\nGefundene WLAN-Netzwerke:")
+            for i in range(count):
+                slot = table.order[i]
+                self._push(
+                    f"{i + 1}. {one_line(table.ssid[slot])}: {table.rssi(slot)} dBm "
+                    f"(Kanal {table.channel[slot]})"
+                )
+
+    def read_command(self):
+        """Liest ein Zeichen von der Konsole, falls eins da ist (sonst None)"""
+        if supervisor is None or not supervisor.runtime.serial_bytes_available:
+            return None
+        return sys.stdin.read(1)
+
+    @property
+    def pending(self):
+        """Noch nicht gesendete Bytes"""
+        return self.ring.used
+
+    def _push(self, message):
+        if not self.ring.push((message + "\n").encode()):
+            self.dropped += 1
+
+    def __call__(self, now):
+        """Task: sendet den nächsten Teil des Puffers"""
+        ring = self.ring
+        if not ring.used:
+            return self.idle
+        if self._serial is None:
+            # Ohne usb_cdc (z.B. am PC) alles auf einmal über print()
+            print(ring.take(ring.used).decode(), end="")
+            return None
+        written = self._serial.write(ring.chunk(self.chunk))
+        if written:
+            ring.consume(written)
+        return None
+
+    def drain(self):
+        """Sendet alles, was noch im Puffer liegt (darf warten, z.B. beim Beenden)"""
+        ring = self.ring
+        if ring.used:
+            print(ring.take(ring.used).decode(), end="")
@@ -0,0 +1,35 @@
+"""Millisekunden-Ticks, die auf dem Board keinen Speicher anlegen
+
+``time.monotonic_ns()`` liefert schon nach gut einer Sekunde Laufzeit eine
+große Ganzzahl, die CircuitPython auf dem Heap anlegt; ``time.monotonic()``
+verliert als Fließkommazahl nach einigen Stunden seine Auflösung.
+``supervisor.ticks_ms()`` zählt Millisekunden und läuft nach 2**29 ms
+(gut 6 Tage) über - die Werte bleiben immer kleine Ganzzahlen.
+
+Wegen des Überlaufs werden Ticks nie direkt verglichen oder subtrahiert,
+sondern nur mit ``ticks_add()`` und ``ticks_diff()`` (wie ``adafruit_ticks``).
+Abstände müssen unter 2**28 ms (gut 3 Tage) bleiben.
+"""
+
+import time
+
+PERIOD = 1 << 29
+MASK = PERIOD - 1
+_HALF = PERIOD >> 1
+
+try:
+    from supervisor import ticks_ms
+except ImportError:
+    def ticks_ms():
+        """Ersatz, wo ``supervisor`` fehlt"""
+        return int(time.monotonic() * 1000) & MASK
+
+
+def ticks_add(ticks, delta):
+    """Ticks ``delta`` ms nach (bzw. vor) ``ticks``"""
+    return (ticks + delta) & MASK
+
+
+def ticks_diff(end, start):
+    """Abstand ``end - start`` in ms, mit Vorzeichen"""
+    return ((end - start + _HALF) & MASK) - _HALF
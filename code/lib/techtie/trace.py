@@ -0,0 +1,134 @@
+import struct
+
+from techtie.logbuf import LogFile
+from techtie.ticks import MASK, ticks_diff, ticks_ms
+
+try:
+    import binascii
+except ImportError:
+    binascii = None
+
+# Satzarten; jeder Satz beginnt mit der Art (1 Byte), die meisten mit der
+# Zeit in ms seit dem Start der Aufzeichnung (4 Bytes), alles little-endian
+BOOT = 0x42     # "B" <BIB   Art, Zeit, Version        - Neustart der Firmware
+EDGE = 0x45     # "E" <BIB   Art, Zeit, gedrückt       - Flanke am Taster
+CHANNEL = 0x43  # "C" <BIB   Art, Zeit, Kanal          - Beginn eines Kanal-Scans
+NETWORK = 0x4E  # "N" <BbB6sB Art, RSSI, Kanal, BSSID, Länge der SSID, dann die SSID
+DONE = 0x44     # "D" <BH    Art, Dauer in ms          - Ende des Kanal-Scans
+FRAME = 0x46    # "F" <BIBHI Art, Zeit, Perioden, Rechenzeit in µs, CRC32 der Pixel
+
+VERSION = 1
+
+_FORMATS = {
+    BOOT: "<BIB", EDGE: "<BIB", CHANNEL: "<BIB", NETWORK: "<BbB6sB", DONE: "<BH",
+    FRAME: "<BIBHI",
+}
+
+
+class TraceRecorder(LogFile):
+    """Zeichnet eine Sitzung kompakt auf, um sie am PC nachzuspielen
+
+    Aufgezeichnet wird alles, was von außen in die Hauptschleife kommt -
+    Flanken am Taster (``edge``), die Ergebnisse jedes Kanal-Scans (über
+    ``radio()``) - und zu jedem Frame Zeitpunkt, Rechenzeit und eine
+    Prüfsumme der gesendeten Pixel (``frame``). ``host/replay.py`` spielt
+    die Datei unter der virtuellen Uhr nach und vergleicht die Pixel.
+
+    Zeiten kommen von ``ticks_ms()``. Geschrieben wird wie bei jedem
+    ``LogFile`` nur selten und nie kurz vor einem Frame. Ist der Puffer
+    voll, gehen Sätze verloren (``dropped``) - dann lässt sich die Sitzung
+    nicht mehr genau nachspielen.
+    """
+
+    def __init__(self, path, size=8192, flush_every=10, clock=None, min_gap=0.02, log=print):
+        super().__init__(path, size, flush_every, clock, min_gap, log)
+        self.records = 0
+        self._record = bytearray(16)    # Ein Satz wird hier gepackt und dann angehängt
+        self._base = ticks_ms()
+        self._scan_start = self._base
+        self._push_record(BOOT, 0, VERSION)
+
+    def _ms(self, ticks):
+        # Zeit seit Beginn der Aufzeichnung; läuft nach 2**29 ms über
+        return (ticks - self._base) & MASK
+
+    def _push_record(self, kind, *values, extra=0):
+        fmt = _FORMATS[kind]
+        size = struct.calcsize(fmt)
+        if not self.enabled:
+            return False
+        if self.ring.free < size + extra:
+            self.dropped += 1
+            return False
+        struct.pack_into(fmt, self._record, 0, kind, *values)
+        self.ring.push(self._record, size)
+        self.records += 1
+        return True
+
+    def edge(self, pressed, age_ms=0):
+        """Flanke am Taster, die ``age_ms`` zurückliegt (ButtonEvents.on_edge)"""
+        self._push_record(EDGE, max(0, self._ms(ticks_ms()) - age_ms), 1 if pressed else 0)
+
+    def frame(self, start, frames, pixels):
+        """Frame, das bei ``start`` (``ticks_ms()``) begonnen hat; ``pixels`` = gesendete Daten"""
+        cost = min(0xFFFF, ticks_diff(ticks_ms(), start) * 1000)
+        check = binascii.crc32(pixels) & 0xFFFFFFFF if binascii is not None else 0
+        self._push_record(FRAME, self._ms(start), min(frames, 255), cost, check)
+
+    def radio(self, radio):
+        """``radio`` mit Aufzeichnung jedes Kanal-Scans (für den WifiScanner)"""
+        return TraceRadio(radio, self)
+
+    def _channel(self, channel):
+        self._scan_start = ticks_ms()
+        self._push_record(CHANNEL, self._ms(self._scan_start), channel)
+
+    def _network(self, network):
+        ssid = network.ssid.encode()[:32]
+        bssid = bytes(network.bssid or b"")[:6]
+        # Satz und SSID nur zusammen: ein Satz ohne Namen wäre unbrauchbar
+        if self._push_record(NETWORK, network.rssi, network.channel, bssid, len(ssid),
+                             extra=len(ssid)):
+            self.ring.push(ssid)
+
+    def _done(self):
+        duration = ticks_diff(ticks_ms(), self._scan_start)
+        self._push_record(DONE, min(0xFFFF, duration))
+
+    def report(self, log=print):
+        """Gibt aus, wie viel aufgezeichnet wurde (standardmäßig per print)"""
+        state = "aktiv" if self.enabled else "abgeschaltet"
+        log(
+            f"Aufzeichnung ({state}): {self.records} Sätze in {self.flushes} Schreibvorgängen, "
+            f"{self.pending} Bytes im Puffer, {self.dropped} verloren"
+        )
+
+
+class TraceRadio:
+    """Reicht ``wifi.radio`` durch und zeichnet jeden Kanal-Scan auf"""
+
+    def __init__(self, radio, recorder):
+        self._radio = radio
+        self._recorder = recorder
+
+    def start_scanning_networks(self, *, start_channel=1, stop_channel=11):
+        networks = self._radio.start_scanning_networks(
+            start_channel=start_channel, stop_channel=stop_channel
+        )
+        return self._record(networks, start_channel)
+
+    def _record(self, networks, channel):
+        recorder = self._recorder
+        recorder._channel(channel)
+        try:
+            for network in networks:
+                recorder._network(network)
+                yield network
+        finally:
+            recorder._done()
+
+    def stop_scanning_networks(self):
+        self._radio.stop_scanning_networks()
+
+    def __getattr__(self, name):
+        return getattr(self._radio, name)
@@ -0,0 +1,180 @@
+from techtie.ticks import ticks_diff, ticks_ms
+
+FIRST_CHANNEL = 1   # Erster gescannter WLAN-Kanal
+LAST_CHANNEL = 11   # Letzter gescannter WLAN-Kanal
+
+
+class ScanPlanner:
+    """Plant, welche Kanäle beim nächsten Scan drankommen und wann
+
+    Meistens werden nur die Kanäle gescannt, auf denen schon Netzwerke bekannt
+    sind; nur jeder ``full_every``-te Scan geht über alle Kanäle, um neue
+    Netzwerke zu finden. Das Intervall bis zum nächsten Scan richtet sich
+    danach, wie stark sich die RSSI-Werte zuletzt verändert haben: bei
+    Bewegung wird öfter gescannt, in ruhiger Umgebung seltener.
+    """
+
+    def __init__(self, min_interval=1, max_interval=5, full_every=6, volatile_db=4):
+        self.min_interval = min_interval  # Kürzester Abstand bei starker Änderung
+        self.max_interval = max_interval  # Längster Abstand bei ruhigen Werten
+        self.full_every = full_every      # Jeder wievielte Scan alle Kanäle abdeckt
+        self.volatile_db = volatile_db    # Ab dieser mittleren Änderung: min_interval
+        self.interval = max_interval
+        self.full = True                  # Geht der geplante Scan über alle Kanäle?
+        self.channels = bytearray(LAST_CHANNEL - FIRST_CHANNEL + 1)
+        self.count = 0                    # Anzahl Kanäle in channels
+        self._scans = 0
+
+    def plan(self, table):
+        """Legt die Kanäle des nächsten Scans fest; gibt ihre Anzahl zurück"""
+        occupied = 0
+        for i in range(table.count):
+            occupied |= 1 << table.channel[table.order[i]]
+        self.full = not occupied or self._scans % self.full_every == 0
+        self._scans += 1
+
+        count = 0
+        for channel in range(FIRST_CHANNEL, LAST_CHANNEL + 1):
+            if self.full or occupied & (1 << channel):
+                self.channels[count] = channel
+                count += 1
+        self.count = count
+        return count
+
+    def finished(self, table):
+        """Passt das Intervall an die Änderung der Messwerte an und gibt es zurück"""
+        change = table.take_change()
+        if change is not None:
+            ratio = min(1, change / self.volatile_db)
+            self.interval = self.max_interval - (self.max_interval - self.min_interval) * ratio
+        return self.interval
+
+
+class WifiScanner:
+    """Nicht-blockierender WLAN-Scan als Task für den Scheduler
+
+    Statt alle Kanäle in einem Rutsch abzuarbeiten, scannt jeder Aufruf nur
+    einen einzigen Kanal. Dazwischen laufen Animation und Tasterabfrage ganz
+    normal weiter, ein Aufruf blockiert höchstens so lange wie ein Kanal.
+    Welche Kanäle drankommen und wann, entscheidet der ``ScanPlanner``.
+
+    Ein Kanal dauert meist länger als eine Frame-Periode, jeder kostet also
+    etwa ein übersprungenes Frame. Mit ``clock`` beginnt ein Kanal deshalb
+    nur direkt nach einem Frame, wenn bis zum nächsten noch ``min_gap``
+    Sekunden Zeit sind; so fällt höchstens der Rest der Funkzeit in die
+    Animation.
+
+    Die Ergebnisse landen direkt in einer ``NetworkTable``, die nach jedem
+    Kanal neu geordnet wird. ``on_scan(table, now)`` wird nach jedem
+    abgeschlossenen Scan aufgerufen (z.B. ``ScanLog.record``).
+    """
+
+    def __init__(self, radio, table, planner, led=None, on_scan=None, clock=None, min_gap=0.02,
+                 log=print):
+        self.radio = radio
+        self.table = table        # NetworkTable mit den gefundenen Netzwerken
+        self.planner = planner    # ScanPlanner: Kanäle und Intervall
+        self.led = led            # Status-LED, leuchtet während des Scans
+        self.on_scan = on_scan    # Wird nach jedem abgeschlossenen Scan aufgerufen
+        self.clock = clock        # FrameClock: Kanäle nur direkt nach einem Frame
+        self.min_gap = min_gap    # So viel Zeit muss bis zum nächsten Frame bleiben
+        self.log = log            # Fehlermeldungen, z.B. telemetry.error
+        self.enabled = False      # Scannt nur, wenn der WLAN-Modus aktiv ist
+        self.scan_count = 0       # Anzahl abgeschlossener Scans
+        self.radio_ms = 0         # Funkzeit seit dem letzten report()
+        self._index = -1          # Nächster Kanal in planner.channels, -1 = kein Scan
+        self._last_scan = None
+        self._report_ticks = ticks_ms()
+
+    def request_scan(self):
+        """Beim nächsten Aufruf sofort einen neuen Scan beginnen"""
+        self._last_scan = None
+
+    def __call__(self, now):
+        if not self.enabled:
+            self.stop()
+            return self.planner.max_interval
+
+        if self._index < 0:
+            interval = self.planner.interval
+            if self._last_scan is not None and now - self._last_scan < interval:
+                return self._last_scan + interval - now
+            gap = self._gap()
+            if gap is not None:
+                return gap
+            self._last_scan = now
+            self.planner.plan(self.table)
+            self._index = 0
+            if self.led is not None:
+                self.led.value = True
+        else:
+            gap = self._gap()
+            if gap is not None:
+                return gap
+
+        start = ticks_ms()
+        try:
+            self._scan_channel(self.planner.channels[self._index], now)
+        except Exception as e:
+            self.log(f"Fehler beim Scannen: {e}")
+            self.stop()
+            return self.planner.interval
+        finally:
+            self.radio_ms += ticks_diff(ticks_ms(), start)
+
+        self.table.sort()
+        self._index += 1
+        if self._index >= self.planner.count:
+            self._finish(now)
+            return self.planner.interval
+        return 0
+
+    def _gap(self):
+        """Sekunden bis direkt nach dem nächsten Frame, None = jetzt scannen"""
+        if self.clock is None or self.clock.idle:
+            return None
+        gap = self.clock.remaining()
+        if gap < self.min_gap:
+            return gap
+        return None
+
+    def stop(self):
+        """Bricht einen laufenden Scan ab"""
+        if self._index >= 0:
+            self._index = -1
+            if self.led is not None:
+                self.led.value = False
+
+    def _scan_channel(self, channel, now):
+        try:
+            for network in self.radio.start_scanning_networks(
+                start_channel=channel, stop_channel=channel
+            ):
+                self.table.update(network, now)
+        finally:
+            self.radio.stop_scanning_networks()
+
+    def _finish(self, now):
+        self._index = -1
+        if self.led is not None:
+            self.led.value = False
+
+        # Verschwundene Netzwerke vergessen, nächsten Abstand festlegen
+        self.table.evict(now)
+        self.planner.finished(self.table)
+        self.scan_count += 1
+        if self.on_scan is not None:
+            self.on_scan(self.table, now)
+
+    def report(self, log=print):
+        """Gibt Scan-Statistik und Funkzeit-Anteil aus (standardmäßig per print)"""
+        now = ticks_ms()
+        elapsed = ticks_diff(now, self._report_ticks)
+        share = 100 * self.radio_ms / elapsed if elapsed else 0
+        kind = "alle" if self.planner.full else "belegte"
+        log(
+            f"WLAN: {self.scan_count} Scans, zuletzt {self.planner.count} Kanäle ({kind}), "
+            f"Intervall {self.planner.interval:.1f} s, Funkzeit {share:.1f} %"
+        )
+        self.radio_ms = 0
+        self._report_ticks = now
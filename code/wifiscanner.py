@@ -3,87 +3,70 @@ import board
 import neopixel
 import digitalio
 import wifi
-import math
+from techtie.buttons import ButtonEvents, SHORT, LONG
+from techtie.colors import map_signal_to_color
+from techtie.config import (
+    BRIGHTNESS, BUTTON_PIN, LONG_PRESS, NUM_PIXELS, PIXEL_PIN, RANK_MARGIN, SD_CS_PIN,
+    SD_FLUSH_INTERVAL, SD_LOG_FILE, SD_SPI_PINS, SIGNAL_COLORS, SIGNAL_THRESHOLDS,
+)
+from techtie.foxhunt import FoxHunt
+from techtie.ranking import RankHysteresis, TopK
+from techtie.scanlog import ScanLog, mount_sd
 
-# Konfiguration
-PIXEL_PIN = board.IO18    # NeoPixel-Datenpin
-BUTTON_PIN = board.IO17   # Taster-Pin
-NUM_PIXELS = 6            # Anzahl der NeoPixels
-BRIGHTNESS = 0.3          # Helligkeit der LEDs
+# Konfiguration (Pins, Farben und Schwellwerte stehen in lib/techtie/config.py)
 SCAN_INTERVAL = 5         # Sekunden zwischen WLAN-Scans
+TARGET_SSID = None        # Ziel der Fuchsjagd (None = stärkstes Netzwerk beim Umschalten)
+TREND_DB = 1              # Ab dieser Änderung in dB gilt das Signal als wärmer/kälter
+BUTTON_POLL = 0.01        # Sekunden zwischen zwei Blicken auf den Taster beim Warten
 
-# Farbdefinitionen für verschiedene Signalstärken
-# Farben gehen von Rot (schwaches Signal) über Gelb zu Grün (starkes Signal)
-SIGNAL_COLORS = [
-    (255, 0, 0),      # Sehr schwach: Rot
-    (255, 60, 0),     # Schwach: Orange-Rot
-    (255, 120, 0),    # Mäßig: Orange
-    (255, 200, 0),    # Gut: Gelb-Orange
-    (150, 255, 0),    # Sehr gut: Gelb-Grün
-    (0, 255, 0)       # Ausgezeichnet: Grün
-]
-
-# Signalstärke-Schwellwerte in dBm (typische WLAN-Werte)
-# -30 dBm ist ausgezeichnet, -90 dBm ist sehr schwach
-SIGNAL_THRESHOLDS = [-90, -80, -70, -60, -50, -40]
+# Trendanzeige der Fuchsjagd auf den freien LEDs über dem Balken
+WARMER = (60, 15, 0)      # Signal wird stärker: glimmt orange
+COLDER = (0, 0, 60)       # Signal wird schwächer: glimmt blau
 
 # NeoPixel initialisieren
 pixels = neopixel.NeoPixel(
     PIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False
 )
 
-# Taster initialisieren (optional für Moduswechsel)
-button = digitalio.DigitalInOut(BUTTON_PIN)
-button.direction = digitalio.Direction.INPUT
-button.pull = digitalio.Pull.UP
+# Taster (optional für Moduswechsel); Flanken werden im Hintergrund erfasst,
+# auch während eines Scans
+button = ButtonEvents(BUTTON_PIN, LONG_PRESS, double_press=0)
 
 # LED für Statusanzeige
 led = digitalio.DigitalInOut(board.LED)
 led.direction = digitalio.Direction.OUTPUT
 
-def map_signal_to_color(signal_strength):
-    """Wandelt Signalstärke (dBm) in eine Farbe um"""
-    for i, threshold in enumerate(SIGNAL_THRESHOLDS):
-        if signal_strength <= threshold:
-            return SIGNAL_COLORS[i]
-    return SIGNAL_COLORS[-1]  # Bestes Signal
-
-def get_signal_index(signal_strength):
-    """Gibt den Signalstärke-Index (0-5) basierend auf dBm zurück"""
-    for i, threshold in enumerate(SIGNAL_THRESHOLDS):
-        if signal_strength <= threshold:
-            return i
-    return 5  # Bestes Signal
-
-def scan_wifi():
-    """Scannt nach WLAN-Netzwerken und gibt sie sortiert nach Signalstärke zurück"""
+# Nur die stärksten Netzwerke eines Scans werden behalten (doppelt so viele
+# wie LEDs, damit ein knapp abgerutschtes Netzwerk seine LED behalten kann)
+strongest = TopK(NUM_PIXELS * 2)
+ranking = RankHysteresis(NUM_PIXELS, RANK_MARGIN, NUM_PIXELS * 2)
+
+def scan_wifi(log=None):
+    """Scannt nach WLAN-Netzwerken und gibt die stärksten zurück (TopK,
+    stärkstes Signal zuerst); mit ``log`` landen alle im Scan-Verlauf"""
     print("Scanne nach WLAN-Netzwerken...")
-    networks = []
+    strongest.clear()
     
     try:
         # LED einschalten während des Scans
         led.value = True
         
-        # Starte den Scan
+        # Starte den Scan; jedes Ergebnis wird sofort einsortiert oder verworfen
+        now = time.monotonic()
         for network in wifi.radio.start_scanning_networks():
-            # Sammle Netzwerkinformationen
-            networks.append({
-                'ssid': network.ssid,
-                'rssi': network.rssi,
-                'channel': network.channel
-            })
+            strongest.add(network)
+            if log is not None:
+                log.add(now, network.channel, network.rssi, network.bssid, network.ssid)
         
         # Stoppe den Scan
         wifi.radio.stop_scanning_networks()
         
-        # Sortiere nach Signalstärke (stärkstes Signal zuerst)
-        networks.sort(key=lambda x: x['rssi'], reverse=True)
-        
-        return networks
+        return strongest
     
     except Exception as e:
         print(f"Fehler beim Scannen: {e}")
-        return []
+        strongest.clear()
+        return strongest
     
     finally:
         # LED ausschalten
@@ -95,56 +78,92 @@ def clear_pixels():
     pixels.show()
 
 def display_mode_1(networks):
-    """Zeigt die Signalstärke der ersten 6 Netzwerke an"""
+    """Zeigt die Signalstärke der stärksten Netzwerke an, jedes auf seiner LED"""
     clear_pixels()
     
-    # Zeige maximal NUM_PIXELS Netzwerke an
-    for i in range(min(len(networks), NUM_PIXELS)):
-        signal_strength = networks[i]['rssi']
-        color = map_signal_to_color(signal_strength)
-        pixels[i] = color
+    # Zeige maximal NUM_PIXELS Netzwerke an; eine LED wechselt erst das
+    # Netzwerk, wenn ein anderes um mehr als RANK_MARGIN dB stärker ist
+    shown = ranking.update(networks.bssid, networks.rssi, networks.count)
+    for i in range(shown):
+        pixels[i] = map_signal_to_color(networks.rssi[ranking.order[i]])
     
     pixels.show()
     
     # Netzwerkinformationen ausgeben
-    print("\nGefundene WLAN-Netzwerke:")
-    for i, network in enumerate(networks[:NUM_PIXELS]):
-        print(f"{i+1}. {network['ssid']}: {network['rssi']} dBm (Kanal {network['channel']})")
-
-def display_mode_2(networks):
-    """Zeigt die Details eines Netzwerks mit allen LEDs an"""
-    if not networks:
+    print(f"\nGefundene WLAN-Netzwerke ({networks.seen}):")
+    for i in range(shown):
+        n = ranking.order[i]
+        print(f"{i+1}. {networks.ssid[n]}: {networks.rssi[n]} dBm (Kanal {networks.channel[n]})")
+
+def display_mode_2(hunt):
+    """Fuchsjagd: Balken für die Signalstärke des Ziels, darüber der Trend"""
+    if not hunt.locked:
         clear_pixels()
         return
     
-    # Verwende das stärkste Netzwerk
-    network = networks[0]
-    signal_index = get_signal_index(network['rssi'])
+    # Balkenlänge in 1/16 LED, von der schwächsten bis zur besten Schwelle
+    low = SIGNAL_THRESHOLDS[0]
+    high = SIGNAL_THRESHOLDS[-1]
+    level = (hunt.rssi - low) * NUM_PIXELS * 16 // (high - low)
+    level = max(16, min(NUM_PIXELS * 16, level))
+    
+    # Freie LEDs zeigen, ob es wärmer oder kälter wird
+    if hunt.trend >= TREND_DB:
+        trend_color = WARMER
+    elif hunt.trend <= -TREND_DB:
+        trend_color = COLDER
+    else:
+        trend_color = (0, 0, 0)
     
-    # Zeige Signalstärke als Balkenanzeige
-    clear_pixels()
     for i in range(NUM_PIXELS):
-        if i <= signal_index:
+        lit = level - i * 16
+        if lit >= 16:
             pixels[i] = SIGNAL_COLORS[i]
+        elif lit > 0:
+            # Angebrochene LED leuchtet anteilig
+            r, g, b = SIGNAL_COLORS[i]
+            pixels[i] = (r * lit >> 4, g * lit >> 4, b * lit >> 4)
         else:
-            pixels[i] = (0, 0, 0)
+            pixels[i] = trend_color
     
     pixels.show()
-    
-    # Netzwerkinformationen ausgeben
-    print(f"\nDetailsansicht für: {network['ssid']}")
-    print(f"Signalstärke: {network['rssi']} dBm (Kanal {network['channel']})")
-    print(f"Qualität: {signal_index + 1}/6")
-
-def button_released():
-    """Erkennt, ob der Taster gedrückt und losgelassen wurde"""
-    if not button.value:  # Taster ist gedrückt (LOW wegen Pull-up)
-        time.sleep(0.1)  # Entprellen
-        while not button.value:
-            pass  # Warte, bis der Taster losgelassen wird
-        time.sleep(0.1)  # Entprellen
-        return True
-    return False
+
+def print_hunt(hunt):
+    """Gibt den Stand der Fuchsjagd auf der Konsole aus"""
+    if hunt.locked:
+        print(f"{hunt.ssid}: {hunt.rssi} dBm (Kanal {hunt.channel}), "
+              f"Trend {hunt.trend:+.1f} dB, {hunt.rate():.1f} Messungen/s")
+    else:
+        print(f"Suche {hunt.ssid or 'Ziel'}...")
+
+def start_hunt(hunt, networks):
+    """Legt das Ziel der Fuchsjagd fest"""
+    if TARGET_SSID:
+        hunt.lock(ssid=TARGET_SSID)
+    else:
+        if not networks:
+            networks = scan_wifi()
+        if networks:
+            # Stärkstes Netzwerk verfolgen, sein Kanal ist schon bekannt
+            hunt.lock(networks.ssid[0], networks.bssid[0], networks.channel[0])
+    print(f"\nFuchsjagd auf: {hunt.ssid}")
+
+def next_gesture():
+    """Nächste Taster-Geste (SHORT oder LONG) oder None"""
+    button.update()
+    return button.get()
+
+def wait(seconds):
+    """Wartet, bricht aber ab, sobald eine Taster-Geste vorliegt"""
+    end = time.monotonic() + seconds
+    while True:
+        button.update()
+        if button.pending:
+            return
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(BUTTON_POLL, remaining))
 
 # Hauptprogramm
 print("WLAN-Signalstärke-Anzeige gestartet")
@@ -157,12 +176,27 @@ for _ in range(3):
     led.value = False
     time.sleep(0.1)
 
+# Fuchsjagd: scannt nur noch den Kanal des Ziels
+hunt = FoxHunt(wifi.radio)
+
+# Scan-Verlauf auf der SD-Karte, geschrieben wird nur in der Wartezeit
+scan_log = None
+if SD_CS_PIN is not None:
+    import busio
+    if mount_sd(busio.SPI(*SD_SPI_PINS), SD_CS_PIN):
+        scan_log = ScanLog(SD_LOG_FILE, flush_every=SD_FLUSH_INTERVAL)
+
 try:
-    mode = 1  # Anzeigemodus (1 = Mehrere Netzwerke, 2 = Einzelnes Netzwerk)
+    mode = 1  # Anzeigemodus (1 = Mehrere Netzwerke, 2 = Fuchsjagd auf ein Netzwerk)
+    networks = None
+    last_print = 0
     
     while True:
-        # Überprüfe Tasterdruck für Moduswechsel
-        if button_released():
+        # Kurzer Druck: Moduswechsel, langer Druck in der Fuchsjagd: neues Ziel
+        gesture = next_gesture()
+        if gesture == LONG and mode == 2:
+            start_hunt(hunt, scan_wifi())
+        elif gesture == SHORT:
             mode = 3 - mode  # Wechsle zwischen 1 und 2
             print(f"Modus gewechselt: {mode}")
             
@@ -171,20 +205,35 @@ try:
             pixels[mode-1] = (0, 0, 255)  # Blaue LED zeigt Modus an
             pixels.show()
             time.sleep(0.5)
+            
+            if mode == 2:
+                start_hunt(hunt, networks)
         
-        # Scanne nach WLAN-Netzwerken
-        networks = scan_wifi()
-        
-        # Zeige gefundene Netzwerke im aktuellen Modus an
         if mode == 1:
+            # Scanne nach WLAN-Netzwerken und zeige sie an
+            networks = scan_wifi(scan_log)
             display_mode_1(networks)
+            if scan_log is not None:
+                scan_log(time.monotonic())
+            
+            # Warte vor dem nächsten Scan (ein Tastendruck beendet das Warten)
+            print(f"\nNächster Scan in {SCAN_INTERVAL} Sekunden...")
+            wait(SCAN_INTERVAL)
         else:
-            display_mode_2(networks)
-        
-        # Warte vor dem nächsten Scan
-        print(f"\nNächster Scan in {SCAN_INTERVAL} Sekunden...")
-        time.sleep(SCAN_INTERVAL)
+            # Fuchsjagd: so schnell messen, wie das Radio es erlaubt
+            delay = hunt(time.monotonic())
+            display_mode_2(hunt)
+            
+            # Höchstens einmal pro Sekunde auf der Konsole ausgeben
+            now = time.monotonic()
+            if now - last_print >= 1:
+                last_print = now
+                print_hunt(hunt)
+            if delay:
+                time.sleep(delay)
 
 except KeyboardInterrupt:
+    if scan_log is not None:
+        scan_log.flush()
     print("\nProgramm beendet.")
     clear_pixels()
@@ -0,0 +1,399 @@
+"""Benchmarks der Firmware am PC
+
+Misst die Kosten pro Frame der einzelnen Farbfunktionen aus ``code.py``,
+vergleicht den alten Per-Pixel-Weg mit der FrameEngine (auch auf langen
+Streifen mit bis zu 1000 LEDs, samt Ausgabe an die NeoPixels), misst das zeitliche Dithering (Kosten und
+Farbstufen), vergleicht die Auswahl der stärksten
+Netzwerke aus synthetischen Scans mit 10 bis 1000 Netzwerken, lässt die ganze
+Hauptschleife in jedem Modus unter der virtuellen Uhr laufen und misst, wie
+viel Rechenzeit und Speicher jedes Skript bis zum ersten Frame braucht.
+
+    python host/bench.py [--number 2000] [--seconds 20]
+
+Die absoluten Zeiten gelten für CPython auf dem PC; auf dem ESP32-S2 ist alles
+deutlich langsamer, die Verhältnisse bleiben aber vergleichbar.
+"""
+
+import argparse
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+from firmware import load_definitions
+from sim import random_networks, simulate
+
+import neopixel
+import wifi
+from techtie import colors, config
+from techtie.ranking import RankHysteresis, TopK
+from techtie.render import FrameEngine, GammaTable, PixelOutput, TemporalDither
+
+MODE_NAMES = ["Blau/Orange", "Blau/Weiß", "Regenbogen", "WLAN-Signalstärke"]
+
+
+def legacy_fade_frame(fw, position, pattern_state, color_mode):
+    """Ein Lauflicht-Frame so, wie es code.py früher berechnet hat"""
+    pixels = fw["pixels"]
+    for i in range(fw["NUM_PIXELS"]):
+        intensity = fw["fade_value"](position, i)
+        base_color = fw["get_color_for_position"](i, pattern_state, color_mode)
+        pixels[i] = fw["blend_colors"](fw["OFF"], base_color, intensity)
+
+
+def legacy_rainbow_frame(fw, rainbow_offset):
+    pixels = fw["pixels"]
+    for i in range(fw["NUM_PIXELS"]):
+        pixels[i] = fw["get_color_for_position"](i, 0, 2, rainbow_offset)
+
+
+def legacy_map_signal_to_color(fw, signal_strength):
+    """Schwellwert-Suche, wie code.py sie früher für jedes Netzwerk gemacht hat"""
+    for i, threshold in enumerate(config.SIGNAL_THRESHOLDS):
+        if signal_strength <= threshold:
+            return config.SIGNAL_COLORS[i]
+    return config.SIGNAL_COLORS[-1]
+
+
+def fade_frame(engine, pixels, palette):
+    """Ein Lauflicht-Frame mit FrameEngine, ohne show() wie beim alten Weg"""
+    engine.render_fade(palette)
+    pixels[:] = engine.buf
+
+
+def rainbow_frame(engine, pixels, offset):
+    engine.render_rainbow(offset)
+    pixels[:] = engine.buf
+
+
+def check_identical(fw):
+    """Prüft eine volle Runde beider Lauflicht-Modi und des Regenbogens"""
+    pixels = fw["pixels"]
+    engine = fw["engine"]
+    mismatches = 0
+    for mode in (0, 1):
+        for state in (0, 1):
+            position = 0.0
+            for step in range(engine.period):
+                legacy_fade_frame(fw, position, state, mode)
+                expected = bytes(pixels.buf)
+                # Wie RunningLight.render(): Schritt direkt aus dem Frame-Zähler
+                engine.step = step
+                engine.render_fade(fw["PALETTES"][mode][state])
+                mismatches += engine.buf != expected
+                position = (position + 0.1) % fw["NUM_PIXELS"]
+    for offset in range(256):
+        legacy_rainbow_frame(fw, offset)
+        expected = bytes(pixels.buf)
+        engine.render_rainbow(offset)
+        mismatches += engine.buf != expected
+    return mismatches
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<34} {seconds * 1e6:8.2f} µs/Frame")
+    return seconds
+
+
+def bench_functions(fw, number):
+    """Kosten der Farbfunktionen, je einmal pro LED aufgerufen"""
+    n = fw["NUM_PIXELS"]
+    fade_value = fw["fade_value"]
+    blend_colors = fw["blend_colors"]
+    wheel = fw["wheel"]
+    map_signal_to_color = colors.signal_classifier().color
+    get_color_for_position = fw["get_color_for_position"]
+    off = fw["OFF"]
+    blue = config.BLUE
+
+    mismatches = sum(map_signal_to_color(dbm) != legacy_map_signal_to_color(fw, dbm)
+                     for dbm in range(-110, 11))
+    print(f"Farbfunktionen ({n} Aufrufe pro Frame, abweichende Signalfarben: {mismatches}):")
+    bench("fade_value", lambda: [fade_value(2.3, i) for i in range(n)], number)
+    bench("blend_colors", lambda: [blend_colors(off, blue, 0.4) for i in range(n)], number)
+    bench("wheel", lambda: [wheel(i * 40) for i in range(n)], number)
+    bench("map_signal_to_color alt (Suche)",
+          lambda: [legacy_map_signal_to_color(fw, -45 - 9 * i) for i in range(n)], number)
+    bench("map_signal_to_color (Tabelle)", lambda: [map_signal_to_color(-45 - 9 * i) for i in range(n)], number)
+    bench("get_color_for_position", lambda: [get_color_for_position(i, 0, 0) for i in range(n)], number)
+
+
+def bench_engine(fw, number):
+    """Alter Per-Pixel-Weg gegen FrameEngine"""
+    engine = fw["engine"]
+    pixels = fw["pixels"]
+    palette = fw["PALETTES"][0][0]
+
+    print(f"\nFrameEngine (abweichende Frames gegenüber alt: {check_identical(fw)}):")
+    old = bench("Lauflicht alt (fade/blend)", lambda: legacy_fade_frame(fw, 2.3, 0, 0), number)
+    new = bench("Lauflicht FrameEngine", lambda: fade_frame(engine, pixels, palette), number)
+    print(f"  {'':<34} {old / new:8.1f}x schneller")
+    old = bench("Regenbogen alt (wheel)", lambda: legacy_rainbow_frame(fw, 100), number)
+    new = bench("Regenbogen FrameEngine", lambda: rainbow_frame(engine, pixels, 100), number)
+    print(f"  {'':<34} {old / new:8.1f}x schneller")
+
+
+def output_frame(output, frames, index):
+    """Sendet abwechselnd zwei verschiedene Frames (damit nichts übersprungen wird)"""
+    index[0] ^= 1
+    output.show(frames[index[0]])
+
+
+def bench_strips(number):
+    """Lauflicht und Regenbogen auf 6 bis 1000 LEDs: alt pro LED gegen FrameEngine,
+    dazu die Ausgabe mit eingebackener Tabelle gegen GammaTable.apply() pro Byte"""
+    print("\nLange Streifen (µs pro Frame, in Klammern pro LED; Abweichung = größter Farbunterschied;")
+    print("Ausgabe = PixelOutput.show() mit eingebackener Tabelle / mit apply() pro Byte):")
+    print(f"  {'LEDs':>5} {'Lauflicht alt':>16} {'FrameEngine':>16} {'Abw.':>5}   "
+          f"{'Regenbogen alt':>16} {'FrameEngine':>16} {'Abw.':>5}   "
+          f"{'Ausgabe':>16} {'mit apply()':>16}")
+    for n in (6, 60, 300, 1000):
+        pixels = neopixel.NeoPixel(None, n, auto_write=False)
+        fade = lambda p, q, n=n: colors.fade_value(p, q, num_pixels=n)
+        engine = FrameEngine(n, fade, colors.blend_colors, colors.wheel)
+        base = [colors.get_color_for_position(i, 0, 0, num_pixels=n) for i in range(n)]
+        palette = engine.palette(base)
+
+        def legacy_fade(step):
+            for i in range(n):
+                pixels[i] = colors.blend_colors(config.OFF, base[i], fade(step / engine.steps, i))
+
+        def legacy_rainbow(offset):
+            for i in range(n):
+                pixels[i] = colors.get_color_for_position(i, 0, 2, offset, num_pixels=n)
+
+        # Genauigkeit über eine Stichprobe von Positionen
+        fade_error = 0
+        for step in range(0, engine.period, max(1, engine.period // 97)):
+            legacy_fade(step)
+            engine.step = step
+            engine.render_fade(palette)
+            fade_error = max(fade_error, max(abs(a - b) for a, b in zip(pixels.buf, engine.buf)))
+        rainbow_error = 0
+        for offset in range(0, 256, 5):
+            legacy_rainbow(offset)
+            engine.render_rainbow(offset)
+            rainbow_error = max(rainbow_error,
+                                max(abs(a - b) for a, b in zip(pixels.buf, engine.buf)))
+
+        frames = [bytes(engine.buf), bytes(b ^ 1 for b in engine.buf)]
+        baked = PixelOutput(pixels, n)
+        applied = PixelOutput(pixels, n, GammaTable(config.BRIGHTNESS, config.GAMMA))
+        index = [0]
+
+        count = max(1, number * 6 // n)
+        engine.step = 37 % engine.period
+        results = [
+            min(timeit.repeat(func, number=count, repeat=3)) / count
+            for func in (
+                lambda: legacy_fade(37),
+                lambda: fade_frame(engine, pixels, palette),
+                lambda: legacy_rainbow(100),
+                lambda: rainbow_frame(engine, pixels, 100),
+                lambda: output_frame(baked, frames, index),
+                lambda: output_frame(applied, frames, index),
+            )
+        ]
+        cells = [f"{t * 1e6:8.1f} ({t * 1e6 / n:5.2f})" for t in results]
+        print(f"  {n:5d} {cells[0]:>16} {cells[1]:>16} {fade_error:5d}   "
+              f"{cells[2]:>16} {cells[3]:>16} {rainbow_error:5d}   "
+              f"{cells[4]:>16} {cells[5]:>16}")
+
+
+def dither_levels(gamma, frames=256):
+    """Unterscheidbare Helligkeitsstufen für die Eingangswerte 0-255: mit 8 Bit
+    und gemittelt über ``frames`` Frames mit Dithering, dazu die größte
+    Abweichung des Mittelwerts vom genauen Wert"""
+    src = bytes(range(256))
+    dst = bytearray(256)
+    total = [0] * 256
+    dither = TemporalDither(256, gamma)
+    for _ in range(frames):
+        dither.apply(src, dst)
+        for i in range(256):
+            total[i] += dst[i]
+    averages = [t / frames for t in total]
+    error = max(abs(a - w / 256) for a, w in zip(averages, gamma.wide))
+    return len(set(gamma.table)), len({round(a * 256) for a in averages}), error
+
+
+def bench_dither(number):
+    """Gamma-Tabelle allein gegen Gamma-Tabelle mit zeitlichem Dithering"""
+    gamma = GammaTable(config.BRIGHTNESS, config.GAMMA)
+    plain, dithered, error = dither_levels(gamma)
+    print(f"\nZeitliches Dithering (Helligkeit {config.BRIGHTNESS}, Gamma {config.GAMMA}): "
+          f"{plain} Stufen mit 8 Bit, {dithered} im Mittel über 256 Frames "
+          f"(größte Abweichung {error:.3f}):")
+    print(f"  {'LEDs':>5} {'GammaTable':>14} {'mit Dithering':>14} {'Frames/s am PC':>15}")
+    for n in (6, 60, 300, 1000):
+        src = bytes((i * 37) & 0xFF for i in range(n * 3))
+        dst = bytearray(n * 3)
+        dither = TemporalDither(n * 3, gamma)
+        count = max(1, number * 6 // n)
+        old, new = (
+            min(timeit.repeat(func, number=count, repeat=3)) / count
+            for func in (lambda: gamma.apply(src, dst), lambda: dither.apply(src, dst))
+        )
+        print(f"  {n:5d} {old * 1e6:11.1f} µs {new * 1e6:11.1f} µs {1 / new:15.0f}")
+
+
+def legacy_scan(networks):
+    """Alle Netzwerke als Dicts sammeln und sortieren, wie wifiscanner.py es früher gemacht hat"""
+    result = []
+    for network in networks:
+        result.append({
+            'ssid': network.ssid,
+            'rssi': network.rssi,
+            'channel': network.channel,
+            'bssid': network.bssid
+        })
+    result.sort(key=lambda x: x['rssi'], reverse=True)
+    return result
+
+
+def topk_scan(strongest, networks):
+    strongest.clear()
+    for network in networks:
+        strongest.add(network)
+    return strongest
+
+
+def peak_memory(func):
+    """Größter zusätzlicher Speicher in Bytes, während ``func`` läuft"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def jittered_scans(networks, count, jitter, seed=2):
+    """``count`` Scans derselben Netzwerke, RSSI jeweils um bis zu ``jitter`` dB verrauscht"""
+    rng = random.Random(seed)
+    return [
+        [wifi.Network(n.ssid, n.rssi + rng.randint(-jitter, jitter), n.channel, n.bssid)
+         for n in networks]
+        for _ in range(count)
+    ]
+
+
+def led_changes(scans, leds, margin):
+    """Wie oft eine LED nach dem ersten Scan ein anderes Netzwerk bekommt"""
+    strongest = TopK(leds * 2)
+    ranking = RankHysteresis(leds, margin, leds * 2)
+    first = None
+    for scan in scans:
+        topk_scan(strongest, scan)
+        ranking.update(strongest.bssid, strongest.rssi, strongest.count)
+        if first is None:
+            first = ranking.changes
+    return ranking.changes - first
+
+
+def bench_topk(number):
+    """Stärkste Netzwerke eines Scans: alle sammeln und sortieren gegen TopK"""
+    leds = config.NUM_PIXELS
+    k = leds * 2
+    print(f"\nStärkste Netzwerke pro Scan (K = {k}; Speicher = Spitze während der Auswahl; "
+          f"LED-Wechsel in 50 Scans mit ±3 dB Rauschen, ohne / mit {config.RANK_MARGIN} dB Abstand):")
+    print(f"  {'Netze':>5} {'Liste + sort':>14} {'Speicher':>10} {'TopK':>12} {'Speicher':>10} "
+          f"{'Abw.':>5} {'LED-Wechsel':>12}")
+    strongest = TopK(k)
+    for n in (10, 100, 1000):
+        networks = random_networks(n, seed=n)
+        expected = [entry['rssi'] for entry in legacy_scan(networks)[:k]]
+        topk_scan(strongest, networks)
+        mismatches = sum(a != b for a, b in zip(expected, strongest.rssi[:strongest.count]))
+        mismatches += abs(len(expected) - strongest.count)
+
+        count = max(1, number * 10 // n)
+        old, new = (
+            min(timeit.repeat(func, number=count, repeat=3)) / count
+            for func in (lambda: legacy_scan(networks), lambda: topk_scan(strongest, networks))
+        )
+        old_bytes = peak_memory(lambda: legacy_scan(networks))
+        new_bytes = peak_memory(lambda: topk_scan(strongest, networks))
+
+        scans = jittered_scans(networks, 50, 3)
+        changes = f"{led_changes(scans, leds, 0)} / {led_changes(scans, leds, config.RANK_MARGIN)}"
+        print(f"  {n:5d} {old * 1e6:11.1f} µs {old_bytes:8d} B {new * 1e6:9.1f} µs {new_bytes:8d} B "
+              f"{mismatches:5d} {changes:>12}")
+
+
+def bench_loop(seconds):
+    """Ganze Hauptschleife von code.py in jedem Modus unter der virtuellen Uhr"""
+    settle = 2.0  # Moduswechsel und erster Scan liegen vor dem Messfenster
+    print(f"\nHauptschleife code.py ({seconds:g} virtuelle Sekunden pro Modus):")
+    for mode, name in enumerate(MODE_NAMES):
+        presses = [0.2 + 0.4 * i for i in range(mode)]  # Abstand > DOUBLE_PRESS
+        run = simulate("code.py", settle + seconds, presses)
+        costs = sorted(run.loop_costs(settle))
+        if not costs:
+            continue
+        mean = sum(costs) / len(costs)
+        p95 = costs[int(len(costs) * 0.95)]
+        sent = sum(1 for t, _ in run.pixels.frames if t >= settle)
+        per_frame = sum(costs) / (seconds / run.namespace["SPEED"])
+        print(f"  {name:<20} {len(costs):6d} Durchläufe  mittel {mean * 1e6:6.1f} µs  "
+              f"p95 {p95 * 1e6:6.1f} µs  max {costs[-1] * 1e6:7.1f} µs  "
+              f"{per_frame * 1e6:6.1f} µs/Frame  {sent / seconds:5.1f} show()/s")
+
+
+def first_frame(name, measure_memory):
+    """Startet ein Skript frisch und misst bis zum ersten show()"""
+    for module in [m for m in sys.modules if m.startswith("techtie")]:
+        del sys.modules[module]
+    original = neopixel.NeoPixel.show
+    first = {}
+
+    def show(self):
+        if not first:
+            first["seconds"] = time.perf_counter() - start
+            first["bytes"] = tracemalloc.get_traced_memory()[0] if measure_memory else 0
+            first["modules"] = [m[8:] for m in sys.modules if m.startswith("techtie.")]
+        original(self)
+
+    neopixel.NeoPixel.show = show
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        simulate(name, 3)
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+        neopixel.NeoPixel.show = original
+    return first
+
+
+def bench_boot():
+    """Rechenzeit und Speicher vom Start eines Skripts bis zum ersten Frame"""
+    print("\nStart bis zum ersten Frame (frisch importierte techtie-Module):")
+    for name in ("led.py", "code.py", "wifiscanner.py"):
+        timing = first_frame(name, False)
+        memory = first_frame(name, True)
+        print(f"  {name:<16} {timing['seconds'] * 1e3:7.1f} ms  {memory['bytes'] / 1024:7.1f} KiB  "
+              f"{len(timing['modules']):2d} Module ({', '.join(timing['modules'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Wiederholungen pro Messung")
+    parser.add_argument("--seconds", type=float, default=20, help="virtuelle Sekunden pro Modus")
+    args = parser.parse_args()
+
+    fw = load_definitions("code.py")
+    bench_functions(fw, args.number)
+    bench_engine(fw, args.number)
+    bench_strips(args.number)
+    bench_dither(args.number)
+    bench_topk(args.number)
+    bench_loop(args.seconds)
+    bench_boot()
+
+
+if __name__ == "__main__":
+    main()
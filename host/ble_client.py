@@ -0,0 +1,130 @@
+"""Steuert ``code.py`` am PC über das nachgebildete Bluetooth (Nordic UART)
+
+Ein simuliertes Handy verbindet sich, schickt Befehle (Modus, Helligkeit,
+Ziel-SSID) und sammelt die Notifications der Firmware. Dieses Skript setzt
+sie wieder zu Nachrichten zusammen und zeigt Quittungen und Scan-Ergebnisse
+mit ihrem Zeitpunkt an - so lässt sich das Protokoll ohne Board und ohne
+Bluetooth prüfen.
+
+    python host/ble_client.py [--seconds 20] [--send 1:M3 --send 6:TNetz-2 ...]
+
+Der Rückgabewert ist 1, wenn ein Befehl nicht quittiert wurde oder eine
+Nachricht nicht zu lesen war - geeignet für CI.
+"""
+
+import argparse
+import struct
+import sys
+
+from sim import random_networks, simulate
+
+from techtie import config
+from techtie.remote import ACK, SCAN
+
+BLE_NAME = "TechTie"  # Für die Simulation, auch wenn config.py Bluetooth abschaltet
+
+DEFAULT_COMMANDS = [
+    (1.0, "M3"),          # WLAN-Modus
+    (3.0, "B50"),         # Helligkeit 50 %
+    (6.0, "TNetz-2"),     # Nur noch Netz-2 anzeigen
+    (10.0, "T"),          # Wieder alle
+    (12.0, "M9"),         # Ungültiger Modus: Quittung 0
+    (14.0, "M0"),
+]
+
+
+def decode(notifications):
+    """Setzt Notifications zu Nachrichten zusammen: Liste von (Zeitpunkt, Art, Inhalt)
+
+    Quittungen haben als Inhalt (Befehl, ausgeführt), Scan-Nachrichten
+    (laufende Nummer, [(rssi, kanal, bssid, ssid), ...]). Ein unvollständiger
+    Rest am Ende wird ignoriert.
+    """
+    messages = []
+    stream = bytearray()
+    start = None
+    for at, data in notifications:
+        if not stream:
+            start = at
+        stream += data
+        while len(stream) >= 2 and len(stream) >= 2 + stream[1]:
+            kind, length = stream[0], stream[1]
+            payload = bytes(stream[2:2 + length])
+            del stream[:2 + length]
+            if kind == ACK:
+                messages.append((start, "ack", (chr(payload[0]), bool(payload[1]))))
+            elif kind == SCAN:
+                messages.append((start, "scan", _scan(payload)))
+            else:
+                raise ValueError(f"Unbekannte Nachricht 0x{kind:02x}")
+            start = at
+    return messages
+
+
+def _scan(payload):
+    seq, count = struct.unpack_from("<BB", payload)
+    pos = 2
+    networks = []
+    for _ in range(count):
+        rssi, channel, bssid, length = struct.unpack_from("<bB6sB", payload, pos)
+        pos += struct.calcsize("<bB6sB")
+        ssid = payload[pos:pos + length].decode()
+        pos += length
+        networks.append((rssi, channel, bssid.hex(), ssid))
+    return seq, networks
+
+
+def parse_command(text):
+    at, _, command = text.partition(":")
+    return float(at), command
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=16, help="virtuelle Laufzeit")
+    parser.add_argument("--send", type=parse_command, action="append",
+                        help="Befehl als Zeitpunkt:Text, z.B. 1:M3 (mehrfach möglich)")
+    args = parser.parse_args()
+
+    commands = args.send or DEFAULT_COMMANDS
+    schedule = [(at, command + "\n") for at, command in commands]
+    saved = config.BLE_NAME
+    config.BLE_NAME = config.BLE_NAME or BLE_NAME
+    try:
+        run = simulate("code.py", args.seconds, networks=random_networks(12), jitter=3,
+                       ble=schedule)
+    finally:
+        config.BLE_NAME = saved
+    if run.ble is None:
+        sys.exit("code.py hat kein Bluetooth gestartet (BLE_NAME in config.py?)")
+    uart = run.ble.advertisement.services[0]
+
+    failed = False
+    try:
+        messages = decode(uart.notifications)
+    except (ValueError, struct.error) as e:
+        print(f"Nachricht nicht lesbar: {e}")
+        messages = []
+        failed = True
+    acks = 0
+    for at, kind, content in messages:
+        if kind == "ack":
+            acks += 1
+            command, ok = content
+            print(f"{at:7.2f} s  Quittung {command}: {'ok' if ok else 'ungültig'}")
+        else:
+            seq, networks = content
+            names = ", ".join(f"{ssid} {rssi} dBm" for rssi, channel, bssid, ssid in networks)
+            print(f"{at:7.2f} s  Scan #{seq}: {len(networks)} Netzwerke ({names})")
+
+    size = sum(len(data) for _, data in uart.notifications)
+    print(f"\n{len(uart.notifications)} Notifications, {size} Bytes, "
+          f"{len(messages)} Nachrichten")
+    if acks != len(commands):
+        print(f"{len(commands)} Befehle gesendet, aber {acks} Quittungen")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
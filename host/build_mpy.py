@@ -0,0 +1,52 @@
+"""Kompiliert die techtie-Bibliothek zu .mpy-Dateien für das Board
+
+.mpy-Dateien muss CircuitPython beim Start nicht erst übersetzen, das spart
+Startzeit und RAM (wie bei der mitgelieferten ``lib/adafruit_ble``).
+``config.py`` bleibt als .py-Datei, damit man sie auf dem Board bearbeiten
+kann. Braucht ``mpy-cross`` in der Version, die zur CircuitPython-Firmware
+passt (https://adafruit-circuit-python.s3.amazonaws.com/index.html?prefix=bin/mpy-cross/).
+
+    python host/build_mpy.py [--out build/lib] [--mpy-cross mpy-cross]
+
+Danach den Inhalt von ``build/lib`` nach ``CIRCUITPY/lib`` kopieren und die
+alten .py-Dateien von ``lib/techtie`` dort löschen.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+from firmware import CODE
+
+KEEP_SOURCE = {"config.py"}  # Bleibt editierbar auf dem Board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="build/lib", help="Zielordner (wie CIRCUITPY/lib)")
+    parser.add_argument("--mpy-cross", default="mpy-cross", help="Pfad zu mpy-cross")
+    args = parser.parse_args()
+
+    if shutil.which(args.mpy_cross) is None:
+        sys.exit(f"{args.mpy_cross} nicht gefunden, siehe Hinweise in {__file__}")
+
+    source = os.path.join(CODE, "lib", "techtie")
+    target = os.path.join(args.out, "techtie")
+    os.makedirs(target, exist_ok=True)
+    for name in sorted(os.listdir(source)):
+        if not name.endswith(".py"):
+            continue
+        path = os.path.join(source, name)
+        if name in KEEP_SOURCE:
+            shutil.copy(path, target)
+            print(f"  {name} (kopiert)")
+            continue
+        output = os.path.join(target, name[:-3] + ".mpy")
+        subprocess.run([args.mpy_cross, path, "-o", output], check=True)
+        print(f"  {name} -> {os.path.getsize(output)} Bytes")
+
+
+if __name__ == "__main__":
+    main()
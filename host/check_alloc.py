@@ -0,0 +1,226 @@
+"""Prüft, dass die Hauptschleife von code.py im Dauerbetrieb nichts anlegt
+
+Auf dem Board hält jedes neue Objekt (Tupel, Liste, Text, Slice-Kopie ...)
+irgendwann die Speicherbereinigung an, und die Animation stockt. Dieses
+Skript lässt ``code.py`` in jedem LED-Modus unter der virtuellen Uhr laufen
+und verfolgt nach einer Einschwingzeit jeden Bytecode, der innerhalb eines
+Frames (``FrameClock.__call__`` und alles, was es aufruft) in ``code/``
+ausgeführt wird:
+
+- Bytecodes, die neue Objekte bauen (Tupel, Listen, Dicts, f-Strings,
+  Funktionen, Generatoren, gelesene Slices), und Aufrufe von eingebauten
+  Funktionen, die Texte oder Listen erzeugen, gelten als Fehler.
+- Ganzzahlen und Fließkommazahlen zählen nicht: CircuitPython legt sie
+  (bis 30 Bit) nicht auf dem Heap an. Ausnahme ist ``time.monotonic_ns()``,
+  das schon nach gut einer Sekunde eine große Ganzzahl liefert - jeder
+  Aufruf innerhalb eines Frames gilt als Fehler (``techtie.ticks`` nehmen).
+- ``range()`` legt auf dem Board nur dann kein Objekt an, wenn es direkt im
+  Kopf einer ``for``-Schleife steht; jeder andere Aufruf (z.B. erst in eine
+  Variable) gilt als Fehler.
+
+Jeder Modus läuft dreimal: wie eingestellt (meist aus Frame-Banks), mit
+``FRAME_BANK_BUDGET = 0`` (alles live gerendert) und live auf einem langen
+Streifen mit ``LONG_STRIP`` LEDs, wo die FrameEngine andere Wege nimmt.
+
+    python host/check_alloc.py [--seconds 10]
+
+Der Rückgabewert ist 1, wenn etwas gefunden wurde - geeignet für CI.
+"""
+
+import argparse
+import ast
+import contextlib
+import dis
+import os
+import sys
+
+from firmware import CODE
+from sim import simulate
+
+from techtie import config
+from techtie.framebank import FrameBanks
+from techtie.render import FrameEngine
+
+MODE_NAMES = ["Blau/Orange", "Blau/Weiß", "Regenbogen", "WLAN-Signalstärke"]
+
+ALLOCATING_OPS = {
+    "BUILD_TUPLE", "BUILD_LIST", "BUILD_MAP", "BUILD_SET", "BUILD_CONST_KEY_MAP",
+    "BUILD_STRING", "FORMAT_VALUE", "LIST_APPEND", "LIST_EXTEND", "MAKE_FUNCTION",
+    "RETURN_GENERATOR",
+}
+# Eingebaute Funktionen und Methoden, die neue Texte, Listen oder Bytes liefern
+ALLOCATING_CALLS = {
+    "sorted", "format", "join", "split", "encode", "decode", "hexlify", "to_bytes",
+    "copy", "items", "keys", "values", "append", "extend", "insert",
+}
+# Liefern auf dem Board große Ganzzahlen (Heap); am PC ggf. von sim ersetzt
+BIG_INT_CALLS = {"monotonic_ns"}
+RANGE_OBJECT = "range() außerhalb von for"
+
+
+def stored_ranges(path):
+    """Quelltext-Stellen von ``range()``-Aufrufen, die nicht direkt im Kopf
+    einer Schleife stehen, als (Zeile, Endzeile, Spalte, Endspalte) wie ``dis``"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    direct = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.For, ast.comprehension)):
+            direct.add(id(node.iter))
+    spans = set()
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == "range" and id(node) not in direct):
+            spans.add((node.lineno, node.end_lineno, node.col_offset, node.end_col_offset))
+    return spans
+
+
+class AllocationTracer:
+    """Sammelt die Stellen, an denen innerhalb eines Frames etwas angelegt wird"""
+
+    def __init__(self, start):
+        self.start = start      # Ab dieser virtuellen Zeit wird geprüft
+        self.depth = 0          # > 0, solange ein Frame läuft
+        self.found = {}         # (Datei, Zeile, was) -> Anzahl
+        self.frames = 0
+        self._next = {}         # code -> {offset: nächster Bytecode}
+        self._ranges = {}       # Datei -> stored_ranges()
+
+    def _checking(self):
+        import time
+        return time.monotonic() >= self.start
+
+    def trace_calls(self, frame, event, arg):
+        code = frame.f_code
+        if not code.co_filename.startswith(CODE):
+            return None
+        if not self.depth:
+            if code.co_name != "__call__" or not code.co_filename.endswith("frameclock.py"):
+                return None
+            if not self._checking():
+                return None
+            self.frames += 1
+        self.depth += 1
+        frame.f_trace_opcodes = True
+        return self.trace_opcodes
+
+    def trace_opcodes(self, frame, event, arg):
+        if event == "return":
+            self.depth -= 1
+        elif event == "opcode":
+            code = frame.f_code
+            name, following = self._instruction(code, frame.f_lasti)
+            if name in ALLOCATING_OPS:
+                self._found(code, frame.f_lineno, name)
+            elif name == RANGE_OBJECT:
+                self._found(code, frame.f_lineno, name)
+            elif name == "BUILD_SLICE" and following != "STORE_SUBSCR":
+                # Gelesener Slice: neue Kopie bzw. neue memoryview
+                self._found(code, frame.f_lineno, "Slice gelesen")
+        return self.trace_opcodes
+
+    def profile(self, frame, event, arg):
+        if not self.depth:
+            return
+        if event == "c_call" and (arg.__name__ in ALLOCATING_CALLS or arg.__name__ in BIG_INT_CALLS):
+            caller, name = frame, arg.__name__
+        elif event == "call" and frame.f_code.co_name in BIG_INT_CALLS:
+            # Ersatz aus sim.VirtualClock: gemeldet wird der Aufrufer
+            caller, name = frame.f_back, frame.f_code.co_name
+        else:
+            return
+        if caller is not None and caller.f_code.co_filename.startswith(CODE):
+            self._found(caller.f_code, caller.f_lineno, f"{name}()")
+
+    def _instruction(self, code, offset):
+        table = self._next.get(code)
+        if table is None:
+            instructions = [i for i in dis.get_instructions(code) if i.opname != "CACHE"]
+            ranges = self._ranges.get(code.co_filename)
+            if ranges is None:
+                ranges = self._ranges[code.co_filename] = stored_ranges(code.co_filename)
+            table = {}
+            for i, instruction in enumerate(instructions):
+                following = instructions[i + 1].opname if i + 1 < len(instructions) else None
+                name = instruction.opname
+                if name == "CALL" and tuple(instruction.positions) in ranges:
+                    name = RANGE_OBJECT
+                table[instruction.offset] = (name, following)
+            self._next[code] = table
+        return table.get(offset, (None, None))
+
+    def _found(self, code, line, what):
+        key = (os.path.relpath(code.co_filename, CODE), line, what)
+        self.found[key] = self.found.get(key, 0) + 1
+
+
+@contextlib.contextmanager
+def live_render(num_pixels=None):
+    """Wie ``FRAME_BANK_BUDGET = 0`` (optional mit ``num_pixels`` LEDs):
+    keine Frame-Banks, alle Animationen werden live gerendert"""
+    original = FrameBanks.__init__
+    saved = config.NUM_PIXELS
+
+    def without_banks(self, budget, directory=None):
+        original(self, 0, None)
+
+    FrameBanks.__init__ = without_banks
+    if num_pixels is not None:
+        config.NUM_PIXELS = num_pixels
+    try:
+        yield
+    finally:
+        FrameBanks.__init__ = original
+        config.NUM_PIXELS = saved
+
+
+def check_mode(mode, settle, seconds):
+    """Lässt code.py im Modus ``mode`` laufen und gibt den Tracer zurück"""
+    presses = [0.2 + 0.4 * i for i in range(mode)]  # Abstand > DOUBLE_PRESS
+    tracer = AllocationTracer(settle)
+    sys.settrace(tracer.trace_calls)
+    sys.setprofile(tracer.profile)
+    try:
+        simulate("code.py", settle + seconds, presses)
+    finally:
+        sys.settrace(None)
+        sys.setprofile(None)
+    return tracer
+
+
+def report(name, tracer):
+    """Gibt das Ergebnis eines Laufs aus; True, wenn etwas gefunden wurde"""
+    if not tracer.frames:
+        print(f"{name}: keine Frames im Prüffenster")
+        return True
+    if not tracer.found:
+        print(f"{name}: {tracer.frames} Frames ohne neue Objekte")
+        return False
+    print(f"{name}: {tracer.frames} Frames, neue Objekte an {len(tracer.found)} Stellen:")
+    for (path, line, what), count in sorted(tracer.found.items()):
+        print(f"  {path}:{line}  {what}  ({count}x, {count / tracer.frames:.2f} pro Frame)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10, help="virtuelle Sekunden pro Modus")
+    parser.add_argument("--settle", type=float, default=4, help="Einschwingzeit vor der Prüfung")
+    args = parser.parse_args()
+
+    runs = [
+        ("", contextlib.nullcontext),
+        (" (live)", live_render),
+        (f" (live, {FrameEngine.LONG_STRIP} LEDs)", lambda: live_render(FrameEngine.LONG_STRIP)),
+    ]
+    failed = False
+    for suffix, setup in runs:
+        for mode, name in enumerate(MODE_NAMES):
+            with setup():
+                tracer = check_mode(mode, args.settle, args.seconds)
+            failed = report(name + suffix, tracer) or failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Hilfsfunktionen, um die Firmware-Skripte am PC zu laden
+
+Die Skripte in ``code/`` laufen auf dem Board als Endlosschleife. Für Tests und
+Benchmarks braucht man oft nur ihre Konstanten und Funktionen - dafür führt
+``load_definitions()`` nur Importe, Zuweisungen und Definitionen aus.
+"""
+
+import ast
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CODE = os.path.normpath(os.path.join(HERE, "..", "code"))
+SHIM = os.path.join(HERE, "shim")
+
+# Nachgebildete Hardware-Module vor die echte Bibliothek stellen
+for path in (CODE, os.path.join(CODE, "lib"), SHIM):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+_DEFINITIONS = (ast.Import, ast.ImportFrom, ast.Assign, ast.AugAssign,
+                ast.FunctionDef, ast.ClassDef)
+
+
+def script_path(name):
+    """Pfad eines Firmware-Skripts, z.B. script_path("code.py")"""
+    return os.path.join(CODE, name)
+
+
+def load_definitions(name):
+    """Führt nur die Definitionen eines Firmware-Skripts aus und gibt sie zurück"""
+    path = script_path(name)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    tree.body = [node for node in tree.body if isinstance(node, _DEFINITIONS)]
+    namespace = {"__name__": "firmware", "__file__": path}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace
@@ -0,0 +1,301 @@
+"""Spielt eine Aufzeichnung vom Board (``TRACE_FILE``) am PC nach
+
+Die Aufzeichnung enthält alles, was von außen in die Hauptschleife kam -
+Taster-Flanken und die Ergebnisse jedes Kanal-Scans - und zu jedem Frame
+Zeitpunkt, Rechenzeit auf dem Board und eine Prüfsumme der gesendeten
+Pixel. Dieses Skript lässt ``code.py`` unter der virtuellen Uhr mit genau
+diesen Eingaben laufen (schneller als in Echtzeit), rendert jedes Frame zu
+seinem aufgezeichneten Zeitpunkt und vergleicht die Pixel:
+
+- Abweichende Frames werden gezählt, das erste wird mit Zeitpunkt gemeldet.
+- Die Rechenzeit pro Frame (Board und PC) landet auf Wunsch als CSV in
+  ``--profile``; ``--max-mean-us`` schlägt fehl, wenn ein Frame am PC im
+  Mittel länger braucht.
+
+    python host/replay.py trace.bin [--session -1] [--profile frames.csv]
+    python host/replay.py --record trace.bin [--seconds 20]
+
+``--record`` erzeugt eine Aufzeichnung aus einer Simulation (Taster wird
+nach Fahrplan gedrückt, RSSI schwankt). Der Rückgabewert ist 1 bei
+abweichenden Frames oder überschrittener Rechenzeit - geeignet für CI.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+from sim import random_networks, simulate
+
+import neopixel
+import wifi
+from techtie import config
+from techtie.frameclock import FrameClock
+from techtie.ticks import MASK, ticks_ms
+from techtie.trace import BOOT, CHANNEL, DONE, EDGE, FRAME, NETWORK, VERSION, _FORMATS
+
+
+class Scan:
+    """Ein aufgezeichneter Kanal-Scan"""
+
+    def __init__(self, at, channel):
+        self.at = at            # ms seit Beginn der Aufzeichnung
+        self.channel = channel
+        self.networks = []      # wifi.Network in der gemeldeten Reihenfolge
+        self.duration = 0       # ms
+
+
+class Session:
+    """Eine Sitzung (vom Neustart bis zum nächsten BOOT-Satz)"""
+
+    def __init__(self, version):
+        self.version = version
+        self.edges = []         # (ms, gedrückt)
+        self.scans = []         # Scan
+        self.frames = []        # (ms, Perioden, Rechenzeit in µs, CRC32)
+
+
+def read_trace(data):
+    """Zerlegt eine Aufzeichnung in Sitzungen; ein abgeschnittener oder
+    unbekannter Satz beendet das Lesen"""
+    sessions = []
+    session = None
+    scan = None
+    pos = 0
+    while pos < len(data):
+        kind = data[pos]
+        fmt = _FORMATS.get(kind)
+        if fmt is None:
+            print(f"Unbekannte Satzart 0x{kind:02x} bei Byte {pos}, Rest ignoriert")
+            break
+        size = struct.calcsize(fmt)
+        if pos + size > len(data):
+            break
+        values = struct.unpack_from(fmt, data, pos)[1:]
+        pos += size
+        if kind == BOOT:
+            session = Session(values[1])
+            sessions.append(session)
+            continue
+        if session is None:
+            # Anfang fehlt (z.B. Datei rotiert): trotzdem lesen
+            session = Session(VERSION)
+            sessions.append(session)
+        if kind == EDGE:
+            session.edges.append((values[0], bool(values[1])))
+        elif kind == CHANNEL:
+            scan = Scan(values[0], values[1])
+            session.scans.append(scan)
+        elif kind == NETWORK:
+            rssi, channel, bssid, length = values
+            if pos + length > len(data):
+                break
+            ssid = bytes(data[pos:pos + length]).decode("utf-8", "replace")
+            pos += length
+            if scan is not None:
+                scan.networks.append(wifi.Network(ssid, rssi, channel, bssid))
+        elif kind == DONE:
+            if scan is not None:
+                scan.duration = values[0]
+            scan = None
+        elif kind == FRAME:
+            session.frames.append(values)
+    return sessions
+
+
+def presses_from(edges, origin):
+    """Taster-Flanken als (Beginn, Dauer) in virtuellen Sekunden ab ``origin`` (ms)"""
+    presses = []
+    down = None
+    for at, pressed in edges:
+        t = max(0, at - origin) / 1000
+        if pressed:
+            down = t
+        elif down is not None:
+            presses.append((down, max(0.001, t - down)))
+            down = None
+    if down is not None:
+        presses.append((down, 3600.0))  # Bis zum Ende gedrückt
+    return presses
+
+
+class ReplayRadio:
+    """WLAN-Radio, das die aufgezeichneten Scans der Reihe nach zurückgibt"""
+
+    def __init__(self, scans):
+        self.scans = list(scans)
+        self.enabled = True
+        self.used = 0
+        self.mismatched = 0     # Scans, bei denen der Kanal nicht passte
+
+    def start_scanning_networks(self, *, start_channel=1, stop_channel=11):
+        if self.used >= len(self.scans):
+            return iter(())
+        scan = self.scans[self.used]
+        self.used += 1
+        if scan.channel != start_channel:
+            self.mismatched += 1
+        return self._scan(scan)
+
+    def _scan(self, scan):
+        time.sleep(scan.duration / 1000)
+        yield from scan.networks
+
+    def stop_scanning_networks(self):
+        pass
+
+
+class FramePlayer:
+    """Ersetzt ``FrameClock.__call__``: rendert jedes aufgezeichnete Frame
+    zu seinem Zeitpunkt und vergleicht die gesendeten Pixel"""
+
+    def __init__(self, frames, origin):
+        self.frames = frames
+        self.origin = origin
+        self.index = 0
+        self.results = []   # (ms, Perioden, Board µs, PC µs, CRC Board, CRC PC)
+
+    def _at(self, index):
+        return (self.frames[index][0] - self.origin) / 1000
+
+    def __call__(self, clock, now):
+        if self.index >= len(self.frames):
+            raise KeyboardInterrupt
+        at, periods, cost, expected = self.frames[self.index]
+        wait = self._at(self.index) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        start = time.perf_counter()
+        clock.render(time.monotonic(), periods)
+        host = (time.perf_counter() - start) * 1_000_000
+        clock._record(cost / 1000)
+
+        pixels = neopixel.NeoPixel.instances[0]
+        self.results.append((at, periods, cost, host, expected, zlib.crc32(pixels.buf)))
+        self.index += 1
+        # Rechenzeit des Boards vergehen lassen, damit Scans und Taster
+        # dieselben Lücken zwischen den Frames sehen
+        time.sleep(cost / 1_000_000)
+        if self.index >= len(self.frames):
+            clock._deadline = ticks_ms()
+            return 0
+        clock._deadline = int(self._at(self.index) * 1000) & MASK
+        return max(0, self._at(self.index) - time.monotonic())
+
+
+def replay(session):
+    """Spielt ``session`` mit code.py nach; gibt (FramePlayer, ReplayRadio, Run) zurück"""
+    origin = session.frames[0][0]
+    player = FramePlayer(session.frames, origin)
+    radio = ReplayRadio(session.scans)
+    saved = FrameClock.__call__
+    FrameClock.__call__ = lambda clock, now: player(clock, now)
+    try:
+        seconds = player._at(len(session.frames) - 1) + 60
+        run = simulate("code.py", seconds, presses_from(session.edges, origin), radio=radio)
+    finally:
+        FrameClock.__call__ = saved
+    return player, radio, run
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def record(path, seconds):
+    """Erzeugt eine Aufzeichnung aus einer Simulation von code.py"""
+    if os.path.exists(path):
+        os.remove(path)
+    saved = config.TRACE_FILE
+    config.TRACE_FILE = path
+    try:
+        # Durch alle Modi bis zum WLAN-Modus, Abstand > DOUBLE_PRESS
+        presses = [seconds * i / 5 for i in range(1, 4)]
+        run = simulate("code.py", seconds, presses, networks=random_networks(12), jitter=4)
+    finally:
+        config.TRACE_FILE = saved
+    print(f"{path}: {os.path.getsize(path)} Bytes, {run.namespace['clock'].frames} Frames, "
+          f"{len(run.radio.scans)} Kanal-Scans")
+
+
+def write_profile(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("frame,zeit_ms,perioden,board_us,pc_us,crc_board,crc_pc,gleich\n")
+        for i, (at, periods, cost, host, expected, actual) in enumerate(results):
+            f.write(f"{i},{at},{periods},{cost},{host:.1f},{expected:08x},{actual:08x},"
+                    f"{int(expected == actual)}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="Aufzeichnung (TRACE_FILE vom Board)")
+    parser.add_argument("--session", type=int, default=-1, help="Sitzung (Standard: letzte)")
+    parser.add_argument("--profile", help="CSV-Datei für die Rechenzeit pro Frame")
+    parser.add_argument("--max-mean-us", type=float,
+                        help="höchste mittlere Rechenzeit pro Frame am PC")
+    parser.add_argument("--record", action="store_true",
+                        help="Aufzeichnung aus einer Simulation erzeugen")
+    parser.add_argument("--seconds", type=float, default=20, help="Laufzeit für --record")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.trace, args.seconds)
+        return
+
+    with open(args.trace, "rb") as f:
+        sessions = read_trace(f.read())
+    if not sessions:
+        sys.exit(f"{args.trace}: keine Sitzung gefunden")
+    session = sessions[args.session]
+    if not session.frames:
+        sys.exit(f"{args.trace}: Sitzung ohne Frames")
+    if session.version != VERSION:
+        print(f"Achtung: Aufzeichnung in Version {session.version}, erwartet {VERSION}")
+
+    start = time.perf_counter()
+    player, radio, run = replay(session)
+    elapsed = time.perf_counter() - start
+    results = player.results
+    duration = (session.frames[-1][0] - session.frames[0][0]) / 1000
+
+    print(f"Sitzung {args.session % len(sessions) + 1}/{len(sessions)}: "
+          f"{len(results)}/{len(session.frames)} Frames, {len(session.edges)} Flanken, "
+          f"{radio.used}/{len(session.scans)} Kanal-Scans in {elapsed:.1f} s "
+          f"({duration / elapsed:.0f}x Echtzeit)")
+
+    failed = False
+    different = [i for i, r in enumerate(results) if r[4] != r[5]]
+    if len(results) < len(session.frames):
+        print(f"Nachspielen nach {len(results)} Frames abgebrochen")
+        failed = True
+    if different:
+        first = results[different[0]]
+        print(f"{len(different)} Frames weichen ab, zuerst Frame {different[0]} "
+              f"bei {(first[0] - session.frames[0][0]) / 1000:.3f} s")
+        failed = True
+    else:
+        print("Alle Frames stimmen überein")
+    if radio.mismatched:
+        print(f"{radio.mismatched} Kanal-Scans auf einem anderen Kanal als aufgezeichnet")
+
+    for label, column in (("Board", 2), ("PC", 3)):
+        costs = [r[column] for r in results]
+        print(f"Rechenzeit {label}: mittel {sum(costs) / len(costs):.0f} µs, "
+              f"p95 {percentile(costs, 0.95):.0f} µs, max {max(costs):.0f} µs")
+    if args.profile:
+        write_profile(args.profile, results)
+        print(f"Profil pro Frame in {args.profile}")
+    if args.max_mean_us is not None:
+        mean = sum(r[3] for r in results) / len(results)
+        if mean > args.max_mean_us:
+            print(f"Mittlere Rechenzeit am PC {mean:.0f} µs über {args.max_mean_us:.0f} µs")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Startet ein Firmware-Skript am PC mit nachgebildeter Hardware und virtueller Uhr
+
+Der Taster wird beim Start so oft gedrückt, dass ``code.py`` im gewünschten
+Modus landet (Standard: 3 = WLAN). Am Ende zeigt das Skript, wie viele Frames
+gerendert und gesendet wurden.
+
+    python host/run.py [--seconds 20] [--mode 3] [--script code.py]
+"""
+
+import argparse
+
+from sim import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20, help="virtuelle Laufzeit")
+    parser.add_argument("--mode", type=int, default=3, help="Modus, in den geschaltet wird")
+    parser.add_argument("--script", default="code.py", help="Skript in code/")
+    args = parser.parse_args()
+
+    # Abstand größer als DOUBLE_PRESS, sonst zählen zwei Drücke als Doppelklick
+    presses = [0.5 + 0.6 * i for i in range(args.mode)]
+    run = simulate(args.script, args.seconds, presses, quiet=False)
+
+    print(f"\n{len(run.pixels.frames)} Frames gesendet, "
+          f"{len(run.radio.scans)} Kanal-Scans")
+    clock = run.namespace.get("clock")
+    output = run.namespace.get("output")
+    if clock is not None:
+        print(f"{clock.frames} Frames gerendert, {clock.skipped} übersprungen")
+    if output is not None:
+        print(f"{output.unchanged} unveränderte Frames nicht gesendet")
+
+
+if __name__ == "__main__":
+    main()
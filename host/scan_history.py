@@ -0,0 +1,170 @@
+"""Wertet den Scan-Verlauf von der SD-Karte aus (``scans.csv`` von ``ScanLog``)
+
+Die Datei wird Zeile für Zeile gelesen; im Speicher liegen nur Summen pro
+Netzwerk und Zeitabschnitt bzw. Ort, auch mehrere MB große Logs sind also
+kein Problem. Unvollständige Zeilen (z.B. nach einem Stromausfall) werden
+übersprungen.
+
+    python host/scan_history.py /Volumes/SD/scans.csv              # Übersicht pro SSID
+    python host/scan_history.py scans.csv --timeline 60            # Verlauf in 60-s-Schritten
+    python host/scan_history.py scans.csv --places                 # Karte pro Ort
+    python host/scan_history.py scans.csv --places --csv > ort.csv # Karte als CSV
+"""
+
+import argparse
+import csv
+import sys
+
+SHADES = " .:-=+*#%@"  # Schwach -> stark
+WEAK = -95             # dBm für das schwächste Zeichen
+STRONG = -35           # dBm für das stärkste Zeichen
+HIDDEN = "<versteckt>"
+
+
+def records(lines):
+    """Liefert (zeit_s, ort, kanal, rssi, bssid, ssid) für jede gültige Zeile
+
+    Nach jedem Neustart (``#start``) beginnt die Zeit in der Datei wieder bei
+    0; sie wird um die letzte Zeit davor verschoben, damit mehrere Sitzungen
+    in einer Datei hintereinander liegen.
+    """
+    offset = 0.0
+    latest = 0.0
+    for line in lines:
+        if not line.endswith("\n"):
+            continue  # Letzte Zeile nur halb geschrieben
+        if line.startswith("#"):
+            if line.startswith("#start"):
+                offset = latest
+            continue
+        fields = line.rstrip("\r\n").split(",", 5)
+        if len(fields) != 6:
+            continue
+        try:
+            t = float(fields[0]) + offset
+            place = int(fields[1])
+            channel = int(fields[2])
+            rssi = int(fields[3])
+        except ValueError:
+            continue
+        latest = max(latest, t)
+        yield t, place, channel, rssi, fields[4], fields[5] or HIDDEN
+
+
+class Summary:
+    """Laufende Statistik pro SSID und optional pro Spalte (Zeitabschnitt oder Ort)"""
+
+    def __init__(self, column=None):
+        self.column = column    # Funktion record -> Spalte, None = keine Karte
+        self.ssids = {}         # ssid -> [anzahl, summe, min, max, erste, letzte, bssids]
+        self.cells = {}         # (ssid, spalte) -> [anzahl, summe]
+        self.columns = set()
+
+    def add(self, record):
+        t, place, channel, rssi, bssid, ssid = record
+        entry = self.ssids.get(ssid)
+        if entry is None:
+            self.ssids[ssid] = [1, rssi, rssi, rssi, t, t, {bssid}]
+        else:
+            entry[0] += 1
+            entry[1] += rssi
+            entry[2] = min(entry[2], rssi)
+            entry[3] = max(entry[3], rssi)
+            entry[4] = min(entry[4], t)
+            entry[5] = max(entry[5], t)
+            entry[6].add(bssid)
+        if self.column is not None:
+            column = self.column(record)
+            self.columns.add(column)
+            cell = self.cells.get((ssid, column))
+            if cell is None:
+                self.cells[(ssid, column)] = [1, rssi]
+            else:
+                cell[0] += 1
+                cell[1] += rssi
+
+    def top(self, count):
+        """Die ``count`` am häufigsten gesehenen SSIDs"""
+        ranked = sorted(self.ssids.items(), key=lambda item: -item[1][0])
+        return [ssid for ssid, _ in ranked[:count]]
+
+    def mean(self, ssid, column):
+        cell = self.cells.get((ssid, column))
+        return None if cell is None else cell[1] / cell[0]
+
+
+def shade(rssi):
+    if rssi is None:
+        return " "
+    level = (rssi - WEAK) * (len(SHADES) - 1) / (STRONG - WEAK)
+    return SHADES[max(1, min(len(SHADES) - 1, round(level)))]
+
+
+def print_summary(summary, count):
+    print(f"{'SSID':<24} {'BSSIDs':>6} {'Anz.':>7} {'min':>5} {'mittel':>7} {'max':>5} "
+          f"{'von s':>8} {'bis s':>8}")
+    for ssid in summary.top(count):
+        n, total, low, high, first, last, bssids = summary.ssids[ssid]
+        print(f"{ssid[:24]:<24} {len(bssids):6d} {n:7d} {low:5d} {total / n:7.1f} "
+              f"{high:5d} {first:8.0f} {last:8.0f}")
+
+
+def print_heatmap(summary, ssids, label):
+    columns = sorted(summary.columns)
+    print(f"{label}: {columns[0]} ... {columns[-1]}  ('{SHADES[1]}' = {WEAK} dBm, "
+          f"'{SHADES[-1]}' = {STRONG} dBm)")
+    for ssid in ssids:
+        row = "".join(shade(summary.mean(ssid, column)) for column in columns)
+        print(f"{ssid[:24]:<24} |{row}|")
+
+
+def write_csv(summary, ssids, label):
+    columns = sorted(summary.columns)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["ssid"] + [f"{label} {column}" for column in columns])
+    for ssid in ssids:
+        row = [summary.mean(ssid, column) for column in columns]
+        writer.writerow([ssid] + ["" if value is None else f"{value:.1f}" for value in row])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Log-Dateien von der SD-Karte, - für stdin")
+    parser.add_argument("--top", type=int, default=20, help="so viele SSIDs anzeigen")
+    view = parser.add_mutually_exclusive_group()
+    view.add_argument("--timeline", type=float, metavar="SEKUNDEN",
+                      help="Signal über die Zeit in Abschnitten dieser Länge")
+    view.add_argument("--places", action="store_true", help="mittleres Signal pro Ort")
+    parser.add_argument("--csv", action="store_true", help="Karte als CSV statt als Text")
+    args = parser.parse_args()
+
+    if args.timeline:
+        bucket = args.timeline
+        summary = Summary(lambda record: int(record[0] // bucket))
+        label = f"Zeit in {bucket:g}-s-Schritten"
+    elif args.places:
+        summary = Summary(lambda record: record[1])
+        label = "Ort"
+    else:
+        summary = Summary()
+        label = None
+
+    for name in args.logs:
+        f = sys.stdin if name == "-" else open(name, encoding="utf-8", errors="replace")
+        with f:
+            for record in records(f):
+                summary.add(record)
+
+    if not summary.ssids:
+        print("Keine Messungen gefunden")
+        return
+    if label is None:
+        print_summary(summary, args.top)
+    elif args.csv:
+        write_csv(summary, summary.top(args.top), label)
+    else:
+        print_heatmap(summary, summary.top(args.top), label)
+
+
+if __name__ == "__main__":
+    main()
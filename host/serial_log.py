@@ -0,0 +1,71 @@
+"""Wertet die kompakten @-Zeilen der Telemetrie aus einem Konsolen-Mitschnitt aus
+
+Auf dem Board mit ``SERIAL_COMPACT = True`` (oder Taste ``c`` in der Konsole)
+geben Scans maschinenlesbare Zeilen aus. Alle anderen Zeilen im Mitschnitt
+werden übersprungen.
+
+    python host/serial_log.py mitschnitt.txt          # Übersicht pro Netzwerk
+    python host/serial_log.py mitschnitt.txt --csv    # Alle Messungen als CSV
+    cat /dev/ttyACM0 | python host/serial_log.py -    # Live von der Konsole
+"""
+
+import argparse
+import csv
+import sys
+
+
+def records(lines):
+    """Liefert für jede Netzwerk-Zeile (zeit_ms, rang, rssi, kanal, bssid, ssid)"""
+    time_ms = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("@S,"):
+            fields = line[3:].split(",")
+            time_ms = int(fields[0])
+        elif line.startswith("@N,") and time_ms is not None:
+            # Die SSID steht am Ende und darf selbst Kommas enthalten
+            rank, rssi, channel, bssid, ssid = line[3:].split(",", 4)
+            yield time_ms, int(rank), int(rssi), int(channel), bssid, ssid
+
+
+def summarize(rows):
+    """Min/Mittel/Max der Signalstärke pro Netzwerk"""
+    stats = {}
+    for time_ms, _, rssi, channel, bssid, ssid in rows:
+        entry = stats.get(bssid)
+        if entry is None:
+            stats[bssid] = [ssid, channel, 1, rssi, rssi, rssi, time_ms, time_ms]
+        else:
+            entry[2] += 1
+            entry[3] += rssi
+            entry[4] = min(entry[4], rssi)
+            entry[5] = max(entry[5], rssi)
+            entry[7] = time_ms
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="Mitschnitt der Konsole, - für stdin")
+    parser.add_argument("--csv", action="store_true", help="alle Messungen als CSV ausgeben")
+    args = parser.parse_args()
+
+    f = sys.stdin if args.log == "-" else open(args.log, encoding="utf-8", errors="replace")
+    with f:
+        if args.csv:
+            writer = csv.writer(sys.stdout)
+            writer.writerow(["zeit_ms", "rang", "rssi", "kanal", "bssid", "ssid"])
+            writer.writerows(records(f))
+            return
+        stats = summarize(records(f))
+
+    print(f"{'SSID':<24} {'BSSID':<12} {'Kanal':>5} {'Anz.':>5} {'min':>5} {'mittel':>7} {'max':>5}")
+    for bssid, (ssid, channel, count, total, low, high, _, _) in sorted(
+        stats.items(), key=lambda item: -item[1][3] / item[1][2]
+    ):
+        print(f"{ssid[:24]:<24} {bssid:<12} {channel:5d} {count:5d} {low:5d} "
+              f"{total / count:7.1f} {high:5d}")
+
+
+if __name__ == "__main__":
+    main()
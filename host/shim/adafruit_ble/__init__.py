@@ -0,0 +1,55 @@
+"""Nachbildung von ``adafruit_ble`` für Tests am PC
+
+``BLERadio`` steht für das Bluetooth des Boards. Die Gegenstelle (das Handy)
+spielt ``sim``: ``central_connect()`` verbindet sich, sobald das Board wirbt,
+``central_send()`` schreibt in den UART-Dienst, ``central_disconnect()``
+trennt wieder. Was die Firmware schreibt, steht mit Zeitstempel in
+``UARTService.notifications``.
+"""
+
+
+class BLERadio:
+    instances = []  # Alle angelegten Radios, damit Tools sie finden
+
+    def __init__(self):
+        self.name = "CIRCUITPY"
+        self.connected = False
+        self.advertising = False
+        self.advertisement = None
+        self.advertised = 0   # Wie oft start_advertising() aufgerufen wurde
+        BLERadio.instances.append(self)
+
+    def start_advertising(self, advertisement, scan_response=None, interval=0.1, timeout=None):
+        if self.connected:
+            raise RuntimeError("Already connected")
+        self.advertising = True
+        self.advertisement = advertisement
+        self.advertised += 1
+
+    def stop_advertising(self):
+        self.advertising = False
+
+    def _services(self):
+        return self.advertisement.services if self.advertisement is not None else ()
+
+    def central_connect(self):
+        """Verbindet das Handy; True, wenn das Board gerade wirbt"""
+        if not self.advertising:
+            return False
+        self.advertising = False
+        self.connected = True
+        for service in self._services():
+            service.connected = True
+        return True
+
+    def central_send(self, data):
+        """Schreibt ``data`` (Text oder Bytes) in den RX-Kanal aller Dienste"""
+        if isinstance(data, str):
+            data = data.encode()
+        for service in self._services():
+            service.receive(data)
+
+    def central_disconnect(self):
+        self.connected = False
+        for service in self._services():
+            service.connected = False
@@ -0,0 +1,6 @@
+"""Nachbildung von ``adafruit_ble.advertising`` für Tests am PC"""
+
+
+class Advertisement:
+    def __init__(self):
+        self.services = ()
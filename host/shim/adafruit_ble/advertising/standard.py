@@ -0,0 +1,9 @@
+"""Nachbildung von ``adafruit_ble.advertising.standard`` für Tests am PC"""
+
+from adafruit_ble.advertising import Advertisement
+
+
+class ProvideServicesAdvertisement(Advertisement):
+    def __init__(self, *services):
+        super().__init__()
+        self.services = services
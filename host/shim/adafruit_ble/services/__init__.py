@@ -0,0 +1,6 @@
+"""Nachbildung von ``adafruit_ble.services`` für Tests am PC"""
+
+
+class Service:
+    def __init__(self):
+        self.connected = False
@@ -0,0 +1,53 @@
+"""Nachbildung von ``adafruit_ble.services.nordic`` für Tests am PC
+
+Jeder Aufruf von ``write()`` wird wie auf dem Board in Notifications zu
+höchstens ``packet_size`` Bytes zerlegt und mit Zeitstempel aufgezeichnet.
+"""
+
+import time
+
+from adafruit_ble.services import Service
+
+
+class UARTService(Service):
+    packet_size = 20  # Nutzdaten pro Notification bei Standard-MTU
+
+    def __init__(self, timeout=1.0, buffer_size=64):
+        super().__init__()
+        self.timeout = timeout
+        self.buffer_size = buffer_size
+        self.notifications = []  # (Zeitstempel, Daten als bytes)
+        self.lost = 0            # Bytes, die nicht mehr in den RX-Puffer passten
+        self._rx = bytearray()
+
+    def receive(self, data):
+        """Daten vom Handy (wird von BLERadio.central_send() aufgerufen)"""
+        space = self.buffer_size - len(self._rx)
+        self._rx += data[:space]
+        self.lost += max(0, len(data) - space)
+
+    @property
+    def in_waiting(self):
+        return len(self._rx)
+
+    def read(self, nbytes=None):
+        count = len(self._rx) if nbytes is None else min(nbytes, len(self._rx))
+        data = bytes(self._rx[:count])
+        del self._rx[:count]
+        return data or None
+
+    def readinto(self, buf, nbytes=None):
+        count = min(len(buf), len(self._rx) if nbytes is None else nbytes, len(self._rx))
+        buf[:count] = self._rx[:count]
+        del self._rx[:count]
+        return count
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+    def write(self, buf):
+        if not self.connected:
+            return
+        data = bytes(buf)
+        for start in range(0, len(data), self.packet_size):
+            self.notifications.append((time.monotonic(), data[start:start + self.packet_size]))
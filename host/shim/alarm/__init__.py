@@ -0,0 +1,60 @@
+"""Nachbildung von ``alarm`` für Tests am PC
+
+``light_sleep_until_alarms()`` lässt die virtuelle Uhr bis zum ersten Alarm
+weiterlaufen: bis zur Zeit eines ``TimeAlarm`` oder bis ein ``PinAlarm``
+seinen Pegel sieht (abgetastet alle ``STEP`` Sekunden über
+``Pin.level_at()``). Jede Schlafphase steht in ``sleeps``; ``asleep(t)``
+sagt, ob das Board zum Zeitpunkt ``t`` schlief (dann laufen auch keine
+Hintergrund-Tasks wie ``keypad``).
+"""
+
+import time as _clock
+
+from alarm import pin, time  # Wie auf dem Board: alarm.pin und alarm.time
+
+STEP = 0.001     # Abtastung der Pins im Schlaf
+LONGEST = 3600   # Ohne Zeit-Alarm höchstens so lange schlafen
+
+sleeps = []      # (Beginn, Dauer, auslösender Alarm)
+wake_alarm = None
+
+
+def asleep(t):
+    """True, wenn ``t`` in einer Light-Sleep-Phase liegt"""
+    for start, duration, _ in reversed(sleeps):
+        if start + duration <= t:
+            return False   # Phasen sind zeitlich sortiert
+        if start <= t:
+            return True
+    return False
+
+
+def light_sleep_until_alarms(*alarms):
+    global wake_alarm
+    if not alarms:
+        return None
+    pins = [a for a in alarms if isinstance(a, pin.PinAlarm)]
+    for a in pins:
+        if a.pin.owner is not None:
+            raise ValueError(f"{a.pin} in use")
+    times = [a.monotonic_time for a in alarms if isinstance(a, time.TimeAlarm)]
+    start = _clock.monotonic()
+    until = min(times) if times else start + LONGEST
+
+    fired = None
+    t = start
+    while fired is None:
+        for a in pins:
+            if a.pin.level_at(t) == a.value:
+                fired = a
+                break
+        if fired is None:
+            if t >= until:
+                fired = next(a for a in alarms if isinstance(a, time.TimeAlarm))
+                break
+            t = min(until, t + STEP)
+    sleeps.append((start, t - start, fired))
+    if t > start:
+        _clock.sleep(t - start)
+    wake_alarm = fired
+    return fired
@@ -0,0 +1,7 @@
+"""Nachbildung von ``alarm.time`` für Tests am PC"""
+
+
+class TimeAlarm:
+    def __init__(self, *, monotonic_time=None, epoch_time=None):
+        self.monotonic_time = monotonic_time
+        self.epoch_time = epoch_time
@@ -0,0 +1,48 @@
+"""Nachbildung von ``board`` für Tests am PC"""
+
+
+class Pin:
+    """GPIO-Pin; ``level`` ist der Pegel, der gerade am Pin anliegt
+
+    Ist ``source`` gesetzt (z.B. ein gescripteter Taster aus ``sim``), wird der
+    Pegel bei jedem Lesen dort abgefragt. ``timeline`` liefert den Pegel zu
+    einem beliebigen Zeitpunkt, damit ``keypad`` im Nachhinein abtasten kann.
+    """
+
+    def __init__(self, name, level=True):
+        self.name = name
+        self.source = None
+        self.timeline = None
+        self.owner = None  # Wer den Pin gerade belegt (z.B. keypad.Keys)
+        self._level = level
+
+    def level_at(self, t):
+        """Pegel zum Zeitpunkt ``t`` (ohne timeline: der aktuelle)"""
+        if self.timeline is not None:
+            return self.timeline(t)
+        return self._level
+
+    @property
+    def level(self):
+        if self.source is not None:
+            return self.source()
+        return self._level
+
+    @level.setter
+    def level(self, value):
+        self._level = value
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+IO17 = Pin("IO17")
+IO18 = Pin("IO18")
+LED = Pin("LED", False)
+
+
+def __getattr__(name):
+    # Alle anderen Pins werden bei Bedarf angelegt
+    pin = Pin(name)
+    globals()[name] = pin
+    return pin
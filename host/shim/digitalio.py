@@ -0,0 +1,31 @@
+"""Nachbildung von ``digitalio`` für Tests am PC"""
+
+
+class Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DigitalInOut:
+    """Liest und schreibt den Pegel des nachgebildeten Pins"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+
+    @property
+    def value(self):
+        return self.pin.level
+
+    @value.setter
+    def value(self, level):
+        self.pin.level = bool(level)
+
+    def deinit(self):
+        pass
@@ -0,0 +1,99 @@
+"""Nachbildung von ``keypad`` für Tests am PC
+
+Auf dem Board tastet ``keypad`` die Pins im Hintergrund ab. Hier wird beim
+Abholen der Events nachgeholt, was seit dem letzten Mal passiert ist: der
+Pegel wird über ``Pin.level_at()`` im Abstand ``interval`` rückwirkend
+gelesen, jede Flanke bekommt den Zeitstempel ihres Abtastzeitpunkts.
+Zeitpunkte im Light Sleep (``alarm.asleep()``) werden übersprungen - wie
+auf dem Board, wo dann auch ``keypad`` stillsteht.
+"""
+
+import time
+
+import alarm
+
+_TICKS_MASK = (1 << 29) - 1
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = 0
+
+    @property
+    def released(self):
+        return not self.pressed
+
+
+class EventQueue:
+    def __init__(self, keys, max_events):
+        self._keys = keys
+        self._max = max_events
+        self._events = []  # (key_number, pressed, timestamp)
+        self.overflowed = False
+
+    def _append(self, event):
+        if len(self._events) >= self._max:
+            self.overflowed = True
+        else:
+            self._events.append(event)
+
+    def get_into(self, event):
+        self._keys._scan()
+        if not self._events:
+            return False
+        event.key_number, event.pressed, event.timestamp = self._events.pop(0)
+        return True
+
+    def get(self):
+        event = Event()
+        return event if self.get_into(event) else None
+
+    def clear(self):
+        self._keys._scan()
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        self._keys._scan()
+        return len(self._events)
+
+
+class Keys:
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02, max_events=64):
+        self.pins = tuple(pins)
+        for pin in self.pins:
+            if pin.owner is not None:
+                raise ValueError(f"{pin} in use")
+            pin.owner = self
+        self.value_when_pressed = value_when_pressed
+        self.interval = interval
+        self.events = EventQueue(self, max_events)
+        self._state = [False] * len(self.pins)
+        self._next = time.monotonic()
+
+    @property
+    def key_count(self):
+        return len(self.pins)
+
+    def _scan(self):
+        now = time.monotonic()
+        while self._next <= now:
+            t = self._next
+            self._next += self.interval
+            if alarm.asleep(t):
+                continue
+            for i, pin in enumerate(self.pins):
+                pressed = pin.level_at(t) == self.value_when_pressed
+                if pressed != self._state[i]:
+                    self._state[i] = pressed
+                    self.events._append((i, pressed, int(t * 1000) & _TICKS_MASK))
+
+    def reset(self):
+        self._state = [False] * len(self.pins)
+
+    def deinit(self):
+        for pin in self.pins:
+            if pin.owner is self:
+                pin.owner = None
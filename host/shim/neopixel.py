@@ -0,0 +1,67 @@
+"""Nachbildung von ``neopixel`` für Tests am PC
+
+Jeder Aufruf von ``show()`` wird mit Zeitstempel und Pixeldaten aufgezeichnet.
+"""
+
+import time
+
+GRB = "GRB"
+RGB = "RGB"
+
+
+class NeoPixel:
+    instances = []  # Alle angelegten Streifen, damit Tools sie finden
+
+    def __init__(self, pin, n, *, bpp=3, brightness=1.0, auto_write=True, pixel_order=None):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.brightness = brightness
+        self.auto_write = auto_write
+        self.buf = bytearray(n * bpp)
+        self.frames = []  # Liste von (Zeitstempel, Pixeldaten als bytes)
+        NeoPixel.instances.append(self)
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, index, value):
+        bpp = self.bpp
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.n)
+            indices = range(start, stop, step)
+            if step == 1 and len(value) == len(indices) * bpp:
+                # Flache Folge von Farbwerten am Stück
+                self.buf[start * bpp:stop * bpp] = value
+            elif len(value) == len(indices) * bpp:
+                # Flache Folge von Farbwerten
+                for k, i in enumerate(indices):
+                    self.buf[i * bpp:(i + 1) * bpp] = bytes(value[k * bpp:(k + 1) * bpp])
+            else:
+                for i, color in zip(indices, value):
+                    self.buf[i * bpp:(i + 1) * bpp] = bytes(color)
+        else:
+            if index < 0:
+                index += self.n
+            self.buf[index * bpp:(index + 1) * bpp] = bytes(value)
+        if self.auto_write:
+            self.show()
+
+    def __getitem__(self, index):
+        bpp = self.bpp
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        return tuple(self.buf[index * bpp:(index + 1) * bpp])
+
+    def fill(self, color):
+        self.buf[:] = bytes(color) * self.n
+        if self.auto_write:
+            self.show()
+
+    def show(self):
+        self.frames.append((time.monotonic(), bytes(self.buf)))
+
+    def deinit(self):
+        pass
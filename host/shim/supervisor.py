@@ -0,0 +1,30 @@
+"""Nachbildung von ``supervisor`` für Tests am PC
+
+Eingaben auf der seriellen Konsole kommen aus ``runtime.serial_input``;
+``sim`` legt dort Zeichen ab und leitet ``sys.stdin`` darauf um.
+"""
+
+import time
+
+
+class Runtime:
+    def __init__(self):
+        self.serial_input = ""
+
+    @property
+    def serial_bytes_available(self):
+        return len(self.serial_input) > 0
+
+    def read(self, count=-1):
+        if count < 0:
+            count = len(self.serial_input)
+        text = self.serial_input[:count]
+        self.serial_input = self.serial_input[count:]
+        return text
+
+
+runtime = Runtime()
+
+
+def ticks_ms():
+    return int(time.monotonic() * 1000) & ((1 << 29) - 1)
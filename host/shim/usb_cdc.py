@@ -0,0 +1,32 @@
+"""Nachbildung von ``usb_cdc`` für Tests am PC
+
+Die Konsole gibt vollständige Zeilen über ``print()`` aus und zählt mit, wie
+viele Bytes insgesamt geschrieben wurden.
+"""
+
+
+class Serial:
+    def __init__(self):
+        self.write_timeout = None
+        self.timeout = 1
+        self.connected = True
+        self.written = 0  # Insgesamt geschriebene Bytes
+        self._line = bytearray()
+
+    @property
+    def out_waiting(self):
+        return 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.written += len(data)
+        self._line.extend(data)
+        while b"\n" in self._line:
+            line, _, rest = bytes(self._line).partition(b"\n")
+            print(line.decode())
+            self._line = bytearray(rest)
+        return len(data)
+
+
+console = Serial()
+data = None
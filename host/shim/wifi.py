@@ -0,0 +1,57 @@
+"""Nachbildung von ``wifi`` für Tests am PC
+
+Die gefundenen Netzwerke werden über ``radio.networks`` vorgegeben, die Dauer
+pro Kanal über ``radio.channel_delay``. Mit ``radio.jitter`` schwankt der
+gemeldete RSSI-Wert zufällig um bis zu so viele dB.
+"""
+
+import random
+import time
+import zlib
+
+
+class Network:
+    def __init__(self, ssid, rssi, channel, bssid=None, authmode=()):
+        self.ssid = ssid
+        self.rssi = rssi
+        self.channel = channel
+        # Ohne Vorgabe eine feste, aus SSID und Kanal abgeleitete BSSID
+        self.bssid = bssid or b"\x02\x00" + zlib.crc32(f"{ssid}/{channel}".encode()).to_bytes(4, "big")
+        self.authmode = authmode
+
+
+class Radio:
+    def __init__(self):
+        self.enabled = True
+        self.networks = []        # Vorgegebene Scan-Ergebnisse
+        self.channel_delay = 0.1  # Sekunden pro gescanntem Kanal
+        self.jitter = 0           # Zufällige Schwankung des RSSI in dB
+        self.random = random.Random(1)
+        self.scans = []           # Aufgezeichnete Scans: (start_channel, stop_channel)
+        self._scanning = False
+
+    def start_scanning_networks(self, *, start_channel=1, stop_channel=11):
+        if self._scanning:
+            raise RuntimeError("Already scanning for wifi networks")
+        self._scanning = True
+        self.scans.append((start_channel, stop_channel))
+        return self._scan(start_channel, stop_channel)
+
+    def _scan(self, start_channel, stop_channel):
+        for channel in range(start_channel, stop_channel + 1):
+            if not self._scanning:
+                return
+            time.sleep(self.channel_delay)
+            for network in self.networks:
+                if network.channel == channel:
+                    if self.jitter:
+                        rssi = network.rssi + self.random.randint(-self.jitter, self.jitter)
+                        yield Network(network.ssid, rssi, channel, network.bssid, network.authmode)
+                    else:
+                        yield network
+
+    def stop_scanning_networks(self):
+        self._scanning = False
+
+
+radio = Radio()
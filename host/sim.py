@@ -0,0 +1,234 @@
+"""Hardware-Simulation mit virtueller Uhr für die Firmware-Skripte
+
+Beispiel::
+
+    run = simulate("code.py", seconds=20, presses=[1.0, 1.2, 1.4])
+    print(run.output)
+
+Die Firmware läuft dabei unverändert: ``time.sleep()`` springt sofort in der
+virtuellen Zeit weiter, der Taster wird nach Fahrplan gedrückt und das
+WLAN-Radio liefert vorgegebene Netzwerke. Ist die Simulationszeit um, löst
+``sleep()`` ein ``KeyboardInterrupt`` aus, wie Strg+C auf dem Board.
+"""
+
+import contextlib
+import io
+import random
+import runpy
+import sys
+import time
+
+from firmware import script_path
+
+import adafruit_ble
+import alarm
+import board
+import neopixel
+import supervisor
+import usb_cdc
+import wifi
+
+READ_COST = 0.000005  # Virtuelle Sekunden, die ein Lesen des Tasters dauert
+
+
+class VirtualClock:
+    """Ersetzt time.monotonic(), time.monotonic_ns() und time.sleep()
+
+    ``marks`` sammelt bei jedem ``sleep()`` die virtuelle Zeit und die echte
+    Rechenzeit seit dem vorigen ``sleep()`` - also die Kosten eines Durchlaufs
+    der Hauptschleife.
+    """
+
+    def __init__(self, until=None):
+        self.now_ns = 0
+        self.until_ns = None if until is None else int(until * 1_000_000_000)
+        self.marks = []  # (virtuelle Zeit in s, Rechenzeit in s)
+        self.hooks = []  # Werden nach jedem Weiterschalten der Zeit aufgerufen
+        self._saved = None
+        self._last = None
+
+    def monotonic(self):
+        return self.now_ns / 1_000_000_000
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def advance(self, seconds):
+        if seconds > 0:
+            self.now_ns += int(seconds * 1_000_000_000)
+            for hook in self.hooks:
+                hook()
+
+    def sleep(self, seconds):
+        real = time.perf_counter()
+        if self._last is not None:
+            self.marks.append((self.monotonic(), real - self._last))
+        self.advance(seconds)
+        if self.until_ns is not None and self.now_ns >= self.until_ns:
+            raise KeyboardInterrupt
+        self._last = time.perf_counter()
+
+    def __enter__(self):
+        self._saved = (time.monotonic, time.monotonic_ns, time.sleep)
+        time.monotonic = self.monotonic
+        time.monotonic_ns = self.monotonic_ns
+        time.sleep = self.sleep
+        self._last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        time.monotonic, time.monotonic_ns, time.sleep = self._saved
+
+
+class Button:
+    """Gescripteter Taster an einem Pin (Pull-up: gedrückt = LOW)"""
+
+    def __init__(self, clock, pin):
+        self.clock = clock
+        self.pin = pin
+        self.presses = []  # (Beginn, Dauer) in virtuellen Sekunden
+        pin.source = self.level
+        pin.timeline = self.level_at
+
+    def press(self, at, duration=0.1):
+        """Drückt den Taster zum Zeitpunkt ``at`` für ``duration`` Sekunden"""
+        self.presses.append((at, duration))
+
+    def level(self):
+        # Jedes Lesen kostet etwas Zeit, so enden auch Warteschleifen
+        # wie ``while not button.value: pass``
+        self.clock.advance(READ_COST)
+        return self.level_at(self.clock.monotonic())
+
+    def level_at(self, t):
+        """Pegel zum Zeitpunkt ``t``, ohne dass Zeit vergeht"""
+        for start, duration in self.presses:
+            if start <= t < start + duration:
+                return False
+        return True
+
+
+def random_networks(count, seed=1):
+    """Erzeugt ``count`` zufällige, aber reproduzierbare Netzwerke"""
+    rng = random.Random(seed)
+    networks = []
+    for i in range(count):
+        bssid = bytes(rng.randrange(256) for _ in range(6))
+        networks.append(wifi.Network(
+            f"Netz-{i}", rng.randint(-95, -30), rng.choice((1, 6, 11, rng.randint(1, 11))), bssid
+        ))
+    return networks
+
+
+class SerialInput:
+    """Tippt zu festen virtuellen Zeitpunkten Text in die serielle Konsole"""
+
+    def __init__(self, clock, schedule):
+        self.clock = clock
+        self.schedule = sorted(schedule)  # (Zeitpunkt, Text)
+
+    def poll(self):
+        now = self.clock.monotonic()
+        while self.schedule and self.schedule[0][0] <= now:
+            supervisor.runtime.serial_input += self.schedule.pop(0)[1]
+
+    def read(self, count=-1):
+        return supervisor.runtime.read(count)
+
+
+class BleCentral:
+    """Handy, das zu festen virtuellen Zeitpunkten über Bluetooth schreibt
+
+    Vor dem ersten Text verbindet es sich, sobald das Board wirbt; ein
+    Eintrag mit ``None`` statt Text trennt die Verbindung.
+    """
+
+    def __init__(self, clock, schedule):
+        self.clock = clock
+        self.schedule = sorted(schedule, key=lambda entry: entry[0])  # (Zeitpunkt, Text)
+
+    def poll(self):
+        if not self.schedule or not adafruit_ble.BLERadio.instances:
+            return
+        radio = adafruit_ble.BLERadio.instances[0]
+        now = self.clock.monotonic()
+        while self.schedule and self.schedule[0][0] <= now:
+            data = self.schedule[0][1]
+            if data is None:
+                radio.central_disconnect()
+            elif not radio.connected and not radio.central_connect():
+                return  # Board wirbt noch nicht: beim nächsten Mal
+            else:
+                radio.central_send(data)
+            self.schedule.pop(0)
+
+
+class Run:
+    """Ergebnis einer Simulation"""
+
+    def __init__(self, namespace, clock, pixels, radio, output, ble=None):
+        self.namespace = namespace  # Globale Variablen des Skripts am Ende
+        self.clock = clock
+        self.pixels = pixels        # Nachgebildeter NeoPixel-Streifen mit .frames
+        self.radio = radio
+        self.output = output        # Alles, was das Skript ausgegeben hat
+        self.ble = ble              # Nachgebildetes Bluetooth (BLERadio), falls benutzt
+
+    def loop_costs(self, start=0.0, stop=None):
+        """Rechenzeiten der Schleifendurchläufe im Zeitfenster [start, stop)"""
+        return [cost for t, cost in self.clock.marks
+                if t >= start and (stop is None or t < stop)]
+
+
+def simulate(name, seconds, presses=(), networks=None, channel_delay=0.1, jitter=0,
+             serial=(), quiet=True, radio=None, ble=()):
+    """Lässt ein Firmware-Skript ``seconds`` virtuelle Sekunden laufen
+
+    ``presses`` sind Zeitpunkte (oder Paare aus Zeitpunkt und Dauer), zu denen
+    der Taster an IO17 gedrückt wird, ``serial`` Paare aus Zeitpunkt und Text,
+    der auf der seriellen Konsole eingegeben wird, ``ble`` Paare aus
+    Zeitpunkt und Text, den ein Handy über Bluetooth schickt (``None``
+    trennt). ``radio`` ersetzt das nachgebildete WLAN-Radio (z.B. beim
+    Nachspielen einer Aufzeichnung).
+    """
+    neopixel.NeoPixel.instances.clear()
+    adafruit_ble.BLERadio.instances.clear()
+    if radio is None:
+        radio = wifi.Radio()
+        radio.channel_delay = channel_delay
+        radio.jitter = jitter
+        radio.networks = list(networks) if networks is not None else random_networks(8)
+    wifi.radio = radio
+    board.IO17.level = True
+    board.IO17.owner = None
+    alarm.sleeps.clear()
+    supervisor.runtime.serial_input = ""
+    usb_cdc.console = usb_cdc.Serial()
+
+    clock = VirtualClock(until=seconds)
+    button = Button(clock, board.IO17)
+    for press in presses:
+        if isinstance(press, tuple):
+            button.press(*press)
+        else:
+            button.press(press)
+
+    stdin = SerialInput(clock, serial)
+    clock.hooks.append(stdin.poll)
+    clock.hooks.append(BleCentral(clock, ble).poll)
+
+    out = io.StringIO()
+    redirect = contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext()
+    saved_stdin = sys.stdin
+    sys.stdin = stdin
+    try:
+        with clock, redirect:
+            namespace = runpy.run_path(script_path(name), run_name="__main__")
+    finally:
+        board.IO17.source = None
+        board.IO17.timeline = None
+        sys.stdin = saved_stdin
+
+    pixels = neopixel.NeoPixel.instances[0] if neopixel.NeoPixel.instances else None
+    ble_radio = adafruit_ble.BLERadio.instances[0] if adafruit_ble.BLERadio.instances else None
+    return Run(namespace, clock, pixels, wifi.radio, out.getvalue(), ble_radio)